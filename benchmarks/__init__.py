@@ -0,0 +1,8 @@
+"""Benchmarks of the processor on seeded synthetic data.
+
+Run them with ``python -m benchmarks``, see ``python -m benchmarks --help``.
+"""
+from ._generator import DataGenerator
+from ._suite import BenchmarkSuite, SCALES
+
+__all__ = ['DataGenerator', 'BenchmarkSuite', 'SCALES']
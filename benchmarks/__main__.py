@@ -0,0 +1,56 @@
+import argparse
+import sys
+
+from ._suite import BASELINE_PATH, SCALES, BenchmarkSuite
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks',
+        description='Benchmark the processor on generated data.'
+    )
+    parser.add_argument('--scales', default='small,medium',
+                        help=f"comma-separated scales among {', '.join(SCALES)}"
+                             " (default: small,medium)")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='runs of each step, the fastest is kept '
+                             '(default: 3)')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='seed of the data generator (default: 0)')
+    parser.add_argument('--baseline', default=BASELINE_PATH,
+                        help='baseline file '
+                             '(default: benchmarks/baseline.json)')
+    parser.add_argument('--save', action='store_true',
+                        help='save the results as the baseline')
+    parser.add_argument('--check', action='store_true',
+                        help='fail if a benchmark is slower than the baseline '
+                             'or over its budget')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='slowdown allowed by --check, as a fraction of '
+                             'the baseline (default: 0.25)')
+    args = parser.parse_args(argv)
+
+    suite = BenchmarkSuite(args.scales.split(','), args.repeat, args.seed)
+    results = suite.run()
+    baseline = BenchmarkSuite.load(args.baseline) if args.check else {}
+    for scale, times in results.items():
+        for name, seconds in times.items():
+            before = baseline.get(scale, {}).get(name)
+            line = f"{scale:<8}{name:<22}{seconds:>10.4f}s"
+            if before is not None:
+                line += f"  baseline {before:.4f}s ({seconds / before:.2f}x)"
+            print(line)
+    if args.save:
+        BenchmarkSuite.save(results, args.baseline)
+    if args.check:
+        regressions = \
+            BenchmarkSuite.compare(results, baseline, args.tolerance) + \
+            BenchmarkSuite.check_budgets(results)
+        for regression in regressions:
+            print(f"regression: {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
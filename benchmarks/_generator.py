@@ -0,0 +1,175 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+__all__ = ["DataGenerator"]
+
+
+class DataGenerator:
+    """
+    Writes a synthetic data directory with the layout the processor expects:
+    DesInventar records in ``records/``, subtype files in
+    ``categorizations/`` and EM-DAT disasters in ``emdat/emdat_cleaned.csv``.
+
+    The contents only depend on the arguments and the seed, so benchmarks run
+    on the same data every time.
+
+    Attributes:
+        EVENT_MIX (dict[str, float]): The default weight of each event type of
+            the records. It mixes the spellings of the subtypes, a subtype
+            listed by two types, types that are not required and missing
+            types.
+        SUBTYPES (dict[str, list[str]]): The subtypes of each type, written to
+            the subtype files.
+        EMDAT_MIX (dict[str, float]): The weight of each EM-DAT disaster type.
+        __countries (int): The number of countries.
+        __rows (int): The number of records of each country.
+        __event_mix (dict[str, float]): The weight of each event type.
+        __years (tuple[int, int]): The first and last year of the records.
+        __invalid_dates (float): The fraction of records with an invalid date.
+        __emdat_rows (int): The number of EM-DAT disasters.
+        __seed (int): The seed of the random generator.
+
+    Args:
+        countries (int): The number of countries.
+        rows (int): The number of records of each country.
+        event_mix (dict[str, float] | None): The weight of each event type,
+            EVENT_MIX if None. An empty type means the type is missing.
+        years (tuple[int, int]): The first and last year of the records, so
+            the same number of records is spread over a longer or shorter
+            period.
+        invalid_dates (float): The fraction of records with a date that does
+            not exist, such as 31/2.
+        emdat_rows (int | None): The number of EM-DAT disasters, rows times
+            countries if None.
+        seed (int): The seed of the random generator.
+    """
+    EVENT_MIX = {
+        'FLOOD': 0.2,
+        'Flash Flood': 0.05,
+        'INUNDATION': 0.05,
+        'STORM': 0.1,
+        'Tornado': 0.05,
+        'HAIL': 0.05,
+        'EARTHQUAKE': 0.1,
+        'LANDSLIDE': 0.1,
+        'ROCKSLIDE': 0.05,
+        'FIRE': 0.1,
+        'DROUGHT': 0.1,
+        '': 0.05,
+    }
+    SUBTYPES = {
+        'EARTHQUAKES': ['earthquake'],
+        'FLOODS': ['flood', 'flash flood', 'inundation'],
+        'LANDSLIDES': ['landslide', 'rockslide', 'flood'],
+        'STORMS': ['storm', 'tornado', 'hail'],
+    }
+    EMDAT_MIX = {
+        'Storm': 0.3,
+        'Flood': 0.3,
+        'Earthquake': 0.2,
+        'Drought': 0.2,
+    }
+
+    def __init__(self, countries=4, rows=1_000,
+                 event_mix: dict[str, float] | None = None,
+                 years=(1970, 2020), invalid_dates=0.01,
+                 emdat_rows: int | None = None, seed=0):
+        self.__countries = countries
+        self.__rows = rows
+        self.__event_mix = event_mix or DataGenerator.EVENT_MIX
+        self.__years = years
+        self.__invalid_dates = invalid_dates
+        self.__emdat_rows = rows * countries if emdat_rows is None \
+            else emdat_rows
+        self.__seed = seed
+
+    def generate(self, path: str):
+        """
+        Writes the data directory. Existing files with the same names are
+        replaced.
+
+        Args:
+            path (str): The path of the data directory, created if needed.
+        """
+        rng = np.random.default_rng(self.__seed)
+        self.__write_subtypes(f"{path}/categorizations")
+        os.makedirs(f"{path}/records", exist_ok=True)
+        for country in range(self.__countries):
+            self.__records(rng).to_csv(
+                f"{path}/records/{DataGenerator.country_name(country)}.csv",
+                index=False
+            )
+        os.makedirs(f"{path}/emdat", exist_ok=True)
+        self.__emdat(rng).to_csv(f"{path}/emdat/emdat_cleaned.csv",
+                                 index=False)
+
+    @staticmethod
+    def country_name(country: int) -> str:
+        """Returns the name of the country with the given number."""
+        return f"country{country:03d}"
+
+    @staticmethod
+    def __write_subtypes(path):
+        os.makedirs(path, exist_ok=True)
+        for event_type, subtypes in DataGenerator.SUBTYPES.items():
+            with open(f"{path}/{event_type}.txt", 'w') as file:
+                file.writelines(f"{subtype}.csv\n" for subtype in subtypes)
+
+    def __records(self, rng: np.random.Generator) -> pd.DataFrame:
+        rows = self.__rows
+        first_day = pd.Timestamp(self.__years[0], 1, 1)
+        last_day = pd.Timestamp(self.__years[1], 12, 31)
+        days = rng.integers(0, (last_day - first_day).days + 1, rows)
+        dates = first_day + pd.to_timedelta(days, unit='D')
+        date_strings = pd.Series(
+            dates.day.astype(str) + '/' + dates.month.astype(str) + '/' +
+            dates.year.astype(str)
+        )
+        invalid = rng.random(rows) < self.__invalid_dates
+        date_strings[invalid] = '31/2/' + dates.year[invalid].astype(str)
+        losses = rng.random(rows) * 1000
+        losses[rng.random(rows) < 0.1] = np.nan
+        return pd.DataFrame({
+            'serial': np.arange(rows),
+            'level0': 'L0',
+            'name0': 'N0',
+            'event': DataGenerator.__choice(rng, self.__event_mix, rows),
+            'location': 'somewhere',
+            'date': date_strings,
+            'latitude': rng.random(rows) * 180 - 90,
+            'longitude': rng.random(rows) * 360 - 180,
+            'deaths': rng.poisson(1, rows),
+            'injured': rng.poisson(3, rows),
+            'missing': rng.poisson(0.2, rows),
+            'houses_destroyed': rng.poisson(2, rows),
+            'losses_in_dollar': losses,
+        })
+
+    def __emdat(self, rng: np.random.Generator) -> pd.DataFrame:
+        rows = self.__emdat_rows
+        months = rng.integers(1, 13, rows).astype(float)
+        months[rng.random(rows) < 0.1] = np.nan
+        days = rng.integers(1, 29, rows).astype(float)
+        days[rng.random(rows) < 0.2] = np.nan
+        return pd.DataFrame({
+            'Dis No': np.arange(rows),
+            'Country': [
+                f"Country{country}"
+                for country in rng.integers(0, self.__countries, rows)
+            ],
+            'Disaster Type': DataGenerator.__choice(
+                rng, DataGenerator.EMDAT_MIX, rows
+            ),
+            'Start Year': rng.integers(self.__years[0], self.__years[1] + 1,
+                                       rows),
+            'Start Month': months,
+            'Start Day': days,
+            'Total Deaths': rng.poisson(20, rows),
+        })
+
+    @staticmethod
+    def __choice(rng: np.random.Generator, mix: dict[str, float], rows):
+        weights = np.array(list(mix.values()), dtype=float)
+        return rng.choice(list(mix), size=rows, p=weights / weights.sum())
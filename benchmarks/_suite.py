@@ -0,0 +1,298 @@
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date
+
+import processor
+from processor._apps import Combiner, EventTypeAdapter, Slicer
+from processor._apps._combiner import EventSplitter
+from processor._emdat._splitter import EMDATSplitter
+from processor._file_getters import SubtypeFileGetter
+from processor._models import DataCard, SCHEMAS
+from processor._utils import Directory
+
+from ._generator import DataGenerator
+
+__all__ = ["BenchmarkSuite", "SCALES", "BASELINE_PATH"]
+
+SCALES = {
+    'small': {'countries': 4, 'rows': 2_000, 'output_files': 1_000},
+    'medium': {'countries': 8, 'rows': 20_000, 'output_files': 10_000},
+    'large': {'countries': 16, 'rows': 100_000, 'output_files': 50_000},
+}
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+class BenchmarkSuite:
+    """
+    Times the main steps of the processor on generated data directories.
+
+    Each benchmark prepares its inputs without being timed, then times one
+    step over every country of the data directory. A step is run several
+    times and the fastest run is kept, which is the least noisy estimate of
+    its cost.
+
+    The splitter benchmarks time EventSplitter alone on adversarial sequences
+    of as many datacards as there are records: alternating trigger types on
+    consecutive days, so every datacard is a fatal failure, events broken up
+    by runs of unused types, and every datacard on the same day, so all of
+    them are one event.
+
+    The time to import the processor in a new interpreter is also measured,
+    under the 'startup' key of the results, and has an absolute budget since
+    short-lived processes pay it on every run.
+
+    Attributes:
+        BENCHMARKS (list[str]): The benchmarks, in the order they are run.
+        IMPORT_BUDGET (float): The longest time, in seconds, importing the
+            processor may take.
+        _VERSION (int): The version of the results format.
+        _MIN_REGRESSION (float): The smallest slowdown, in seconds, reported
+            as a regression, so noise on very short steps is ignored.
+        _FILES_PER_FOLDER (int): The number of files in each folder of the
+            output tree scanned by the directory benchmark.
+        __scales (list[str]): The scales to run, keys of SCALES.
+        __repeat (int): The number of times each step is run.
+        __seed (int): The seed of the data generator.
+
+    Args:
+        scales (list[str]): The scales to run, keys of SCALES.
+        repeat (int): The number of times each step is run.
+        seed (int): The seed of the data generator.
+
+    Raises:
+        ValueError: If a scale is unknown.
+    """
+    BENCHMARKS = ['combiner', 'splitter_alternating', 'splitter_unused',
+                  'splitter_dense', 'slicer', 'emdat_splitter', 'directory']
+    IMPORT_BUDGET = 0.1
+    _VERSION = 1
+    _MIN_REGRESSION = 0.005
+    _FILES_PER_FOLDER = 100
+
+    def __init__(self, scales: list[str], repeat=3, seed=0):
+        for scale in scales:
+            if scale not in SCALES:
+                raise ValueError(f'Unknown scale: {scale}')
+        self.__scales = scales
+        self.__repeat = repeat
+        self.__seed = seed
+
+    def run(self) -> dict[str, dict[str, float]]:
+        """
+        Runs every benchmark at every scale.
+
+        Returns:
+            dict[str, dict[str, float]]: The time of each benchmark in
+                seconds, by scale, and the import time under 'startup'.
+        """
+        results = {'startup': {'import': self.__time_import()}}
+        for scale in self.__scales:
+            settings = dict(SCALES[scale])
+            output_files = settings.pop('output_files')
+            with tempfile.TemporaryDirectory() as path:
+                DataGenerator(**settings, seed=self.__seed).generate(path)
+                BenchmarkSuite.__write_output_tree(f"{path}/outputs",
+                                                   output_files)
+                results[scale] = {
+                    name: self.__time(getattr(self, f"_{name}")(path))
+                    for name in BenchmarkSuite.BENCHMARKS
+                }
+        return results
+
+    @staticmethod
+    def __write_output_tree(path, files):
+        """Writes empty files in folders like the ones of the sliced data."""
+        for i in range(files):
+            folder = f"{path}/{i // BenchmarkSuite._FILES_PER_FOLDER}"
+            if i % BenchmarkSuite._FILES_PER_FOLDER == 0:
+                os.makedirs(folder)
+            open(f"{folder}/{i}.csv", 'w').close()
+
+    def __time(self, step) -> float:
+        best = float('inf')
+        for _ in range(self.__repeat):
+            start = time.perf_counter()
+            step()
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    def __time_import(self) -> float:
+        """Returns the fastest time to import the processor in a new
+        interpreter, without the time to start the interpreter."""
+        code = ('import time; start = time.perf_counter(); import processor; '
+                'print(time.perf_counter() - start)')
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        return min(
+            float(subprocess.run([sys.executable, '-c', code], cwd=root,
+                                 check=True, capture_output=True,
+                                 text=True).stdout)
+            for _ in range(self.__repeat)
+        )
+
+    @staticmethod
+    def _combiner(path):
+        data_folder = Directory(path)
+        type_adapter = EventTypeAdapter(
+            SubtypeFileGetter(data_folder).subtypes
+        )
+        files = data_folder.find_directory('records').get_files()
+        return lambda: [Combiner(file, type_adapter) for file in files]
+
+    @staticmethod
+    def _splitter_alternating(path):
+        return BenchmarkSuite.__splitter(path, ['FLOOD', 'STORM'], 1)
+
+    @staticmethod
+    def _splitter_unused(path):
+        return BenchmarkSuite.__splitter(
+            path, ['FLOOD', 'FIRE', 'DROUGHT', 'Flash Flood', 'LANDSLIDE'], 1
+        )
+
+    @staticmethod
+    def _splitter_dense(path):
+        return BenchmarkSuite.__splitter(path, ['FLOOD', 'INUNDATION'], 0)
+
+    @staticmethod
+    def __splitter(path, events: list[str], days: int):
+        """
+        Prepares the splitting of datacards whose types cycle through events,
+        each one the given number of days after the previous one.
+        """
+        data_folder = Directory(path)
+        type_adapter = EventTypeAdapter(
+            SubtypeFileGetter(data_folder).subtypes
+        )
+        rows = 0
+        for file in data_folder.find_directory('records').get_files():
+            with open(file.get_filepath()) as records:
+                rows += sum(1 for _ in records) - 1
+        start = date(1990, 1, 1).toordinal()
+        datacards = []
+        for i in range(rows):
+            day = date.fromordinal(start + i * days)
+            datacards.append(DataCard(
+                events[i % len(events)],
+                f"{day.day}/{day.month}/{day.year}", ('deaths',), (i,),
+                day.toordinal()
+            ))
+        return lambda: list(EventSplitter(type_adapter).split(datacards))
+
+    @staticmethod
+    def _slicer(path):
+        processor.set_data_dir(path)
+        processor.process({
+            'desinventar': {'merge': True, 'slice': False},
+            'emdat': {'process': False},
+        })
+        data_folder = Directory(path)
+        files = data_folder.find_directory('events').get_files()
+        data_folder.create_subdirectory('sliced_data_sheets')
+        output_folder = data_folder.find_directory('sliced_data_sheets')
+        return lambda: [Slicer(file, output_folder) for file in files]
+
+    @staticmethod
+    def _emdat_splitter(path):
+        data = SCHEMAS['emdat'].read(f"{path}/emdat/emdat_cleaned.csv")
+        return lambda: EMDATSplitter(data)
+
+    @staticmethod
+    def _directory(path):
+        def scan(directory: Directory):
+            return len(directory.get_files()) + sum(
+                scan(subdirectory)
+                for subdirectory in directory.get_directories()
+            )
+
+        return lambda: scan(Directory(path))
+
+    @staticmethod
+    def save(results: dict, path=BASELINE_PATH):
+        """
+        Writes results to a baseline file.
+
+        Args:
+            results (dict): The results of run.
+            path (str): The path of the baseline file.
+        """
+        contents = {
+            'version': BenchmarkSuite._VERSION,
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'results': results,
+        }
+        with open(path, 'w') as file:
+            json.dump(contents, file, indent=1, sort_keys=True)
+            file.write('\n')
+
+    @staticmethod
+    def load(path=BASELINE_PATH) -> dict:
+        """
+        Reads the results of a baseline file.
+
+        Args:
+            path (str): The path of the baseline file.
+
+        Returns:
+            dict: The results saved in the file.
+
+        Raises:
+            ValueError: If the file has another version of the format.
+        """
+        with open(path) as file:
+            contents = json.load(file)
+        if contents.get('version') != BenchmarkSuite._VERSION:
+            raise ValueError(f'Unsupported baseline version in {path}')
+        return contents['results']
+
+    @staticmethod
+    def check_budgets(results: dict) -> list[str]:
+        """
+        Finds the measurements over their absolute budget.
+
+        Args:
+            results (dict): The results of run.
+
+        Returns:
+            list[str]: A description of each measurement over budget, empty
+                if there is none.
+        """
+        seconds = results.get('startup', {}).get('import')
+        if seconds is not None and seconds > BenchmarkSuite.IMPORT_BUDGET:
+            return [f"startup/import: {seconds:.4f}s, "
+                    f"budget {BenchmarkSuite.IMPORT_BUDGET:.4f}s"]
+        return []
+
+    @staticmethod
+    def compare(results: dict, baseline: dict, tolerance=0.25) -> list[str]:
+        """
+        Finds the benchmarks slower than in the baseline.
+
+        Args:
+            results (dict): The results of run.
+            baseline (dict): The results of a baseline file.
+            tolerance (float): The slowdown allowed, as a fraction of the
+                baseline time.
+
+        Returns:
+            list[str]: A description of each regression, empty if there is
+                none. Benchmarks missing from the baseline are not compared.
+        """
+        regressions = []
+        for scale, times in results.items():
+            for name, seconds in times.items():
+                before = baseline.get(scale, {}).get(name)
+                if before is None:
+                    continue
+                if seconds > before * (1 + tolerance) and \
+                        seconds - before > BenchmarkSuite._MIN_REGRESSION:
+                    regressions.append(
+                        f"{scale}/{name}: {seconds:.4f}s, "
+                        f"baseline {before:.4f}s"
+                    )
+        return regressions
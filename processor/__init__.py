@@ -1,2 +1,2 @@
-from ._main import set_data_dir, process
-__all__ = ['set_data_dir', 'process']
+from ._main import set_data_dir, process, query
+__all__ = ['set_data_dir', 'process', 'query']
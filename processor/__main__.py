@@ -0,0 +1,118 @@
+import argparse
+import json
+import sys
+
+from ._main import set_data_dir, process
+from ._controllers._merge_controller import ENGINES
+
+STAGES = ['merge', 'slice', 'return_periods', 'emdat']
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m processor',
+        description='Process the DesInventar and EM-DAT data in a data '
+                    'directory.'
+    )
+    parser.add_argument('data_dir', help='the data directory')
+    parser.add_argument('--stages',
+                        help='comma-separated stages to run among '
+                             f"{', '.join(STAGES)} (default: all, but "
+                             'return_periods with --slice-fractions)')
+    parser.add_argument('--countries',
+                        help='comma-separated names or glob patterns of the '
+                             'DesInventar countries to merge and slice, e.g. '
+                             "'Nepal,S*' (default: all)")
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='processes merging and slicing countries, 0 for '
+                             'every core (default: 1)')
+    parser.add_argument('--no-slice', action='store_true',
+                        help='keep the first 5%% of the events, writing them '
+                             'to unsliced_data_sheets')
+    parser.add_argument('--slice-fractions', metavar='FRACTIONS',
+                        help='comma-separated fractions of the first events '
+                             'to remove, slicing each country once per '
+                             "fraction into sliced_sweep, e.g. '0,0.05,0.1'")
+    parser.add_argument('--durations', metavar='JSON', type=json.loads,
+                        help='primary and secondary durations in days of '
+                             'some event types, e.g. '
+                             '\'{"FLOODS": [3, 4]}\'')
+    parser.add_argument('--sweep', metavar='PATH',
+                        help='a JSON file with a list of durations like '
+                             '--durations, merging each configuration into '
+                             'merge_sweep from one parse of each country; '
+                             'only the sweep runs unless --stages is given')
+    parser.add_argument('--engine', choices=ENGINES, default='default',
+                        help='merge engine (default: default)')
+    parser.add_argument('--fused', action='store_true',
+                        help='slice the events of each country as soon as '
+                             'they are merged')
+    parser.add_argument('--incremental', action='store_true',
+                        help='skip the work that is up to date in the '
+                             'manifest')
+    parser.add_argument('--parquet', action='store_true',
+                        help='also write the outputs to Parquet datasets')
+    parser.add_argument('--cache-dir', metavar='PATH',
+                        help='cache the parsed records in this folder, so '
+                             'unchanged records are not parsed again')
+    parser.add_argument('--report', metavar='PATH',
+                        help='write the metrics of the run to a JSON file')
+    args = parser.parse_args(argv)
+
+    if args.stages is not None:
+        stages = args.stages.split(',')
+    elif args.sweep:
+        stages = []
+    elif args.slice_fractions:
+        # return periods are computed from sliced_data_sheets only
+        stages = [stage for stage in STAGES if stage != 'return_periods']
+    else:
+        stages = STAGES
+    for stage in stages:
+        if stage not in STAGES:
+            parser.error(f'unknown stage: {stage}')
+    option = {
+        'desinventar': {
+            'merge': 'merge' in stages,
+            'slice': 'slice' in stages,
+            'return_periods': 'return_periods' in stages,
+            'engine': args.engine,
+            'fused': args.fused,
+            'unsliced': args.no_slice,
+            'slice_fractions':
+                [float(fraction)
+                 for fraction in args.slice_fractions.split(',')]
+                if args.slice_fractions else None,
+            'cache_dir': args.cache_dir,
+            'durations': args.durations,
+            'sweep': load_sweep(args.sweep) if args.sweep else None,
+        },
+        'emdat': {
+            'process': 'emdat' in stages,
+        },
+    }
+    countries = args.countries.split(',') if args.countries else None
+    set_data_dir(args.data_dir)
+    try:
+        report = process(option, jobs=args.jobs or None,
+                         incremental=args.incremental, parquet=args.parquet,
+                         report=args.report or True, countries=countries)
+    except (ValueError, FileNotFoundError) as error:
+        print(f'{parser.prog}: error: {error}', file=sys.stderr)
+        return 1
+    for stage, metrics in report['stages'].items():
+        line = f"{stage:<16}{metrics['wall']:>8.2f}s"
+        if stage in ('merge', 'slice'):
+            line += f"  countries: {len(metrics['countries'])}"
+        print(line)
+    return 0
+
+
+def load_sweep(path):
+    """Reads the configurations of a sweep from a JSON file."""
+    with open(path) as file:
+        return json.load(file)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
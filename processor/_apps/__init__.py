@@ -1,7 +1,19 @@
 from ._slicer import Slicer
-from ._combiner import Combiner
+from ._combiner import Combiner, EventTypeAdapter
+from ._columnar_combiner import ColumnarCombiner
+from ._streaming_combiner import StreamingCombiner
+from ._record_cache import RecordCache, SortedRecords
+from ._event_index import EventIndex
+from ._return_periods import ReturnPeriods
 
 __all__ = [
     "Slicer",
     "Combiner",
+    "EventTypeAdapter",
+    "ColumnarCombiner",
+    "StreamingCombiner",
+    "RecordCache",
+    "SortedRecords",
+    "EventIndex",
+    "ReturnPeriods",
 ]
@@ -0,0 +1,322 @@
+import numpy as np
+import pandas as pd
+
+from .._models import DataCard, EventBuilder, EventAggregator, \
+    EXCLUDED_KEYS, SCHEMAS
+from ._combiner import EventTypeAdapter
+from ._record_cache import SortedRecords
+
+__all__ = ["ColumnarCombiner"]
+
+_UNMATCHED_TYPE = -2
+
+
+class ColumnarCombiner:
+    """
+    ColumnarCombiner class combines records into events like Combiner does,
+    but keeps the records as columns instead of one DataCard per row
+
+    Dates are parsed once into datetime64, root types are stored as integer
+    codes and interval checks are done with searchsorted on the date-sorted
+    records, so the events produced are the same as the ones produced by
+    Combiner and EventSplitter.
+    """
+    def __init__(self, file, type_adapter: EventTypeAdapter,
+                 records: pd.DataFrame | SortedRecords | None = None,
+                 durations: dict | None = None):
+        """
+        Initialise combiner with file and type adapter
+
+        Args:
+            file (File): File object
+            type_adapter (EventTypeAdapter): Adapter for event types and
+                subtypes, shared by every combiner of a run
+            records (pd.DataFrame | SortedRecords | None): Records of the
+                file if they are already read, read from the file if None.
+                SortedRecords are not filtered by date and sorted again
+            durations (dict | None): Primary and secondary durations of some
+                event types, overriding EventBuilder.DURATIONS
+
+        Attributes:
+            self.__type_adapter (EventTypeAdapter): Adapter for event types and
+                subtypes from subtype files to check if event is required
+            self.__type_names (list[str]): Root type name of each type code
+            self.__dates (np.ndarray): Sorted dates of the required records
+            self.__types (np.ndarray): Root type code of each required record
+            self.__raw_types (np.ndarray): Event type of each required record
+                as written in the file
+            self.__triggers (np.ndarray): Indices of trigger records
+            self.__other_triggers (dict[int, np.ndarray]): For each type code,
+                the index of the next trigger record of another root type at
+                or after each position
+            self.__interval_cache (dict[tuple, tuple]): For each pair of
+                primary and total durations, the primary interval end and
+                event end of an event started at each record
+            self.__events (pd.DataFrame): Events combined from records
+            self.__counters (dict[str, int | None]): Number of records read,
+                records with an invalid date and fatal failures met. Unused
+                records are dropped before splitting, so they are not counted
+            self.__durations (dict): Durations of every event type
+        """
+        self.__type_adapter = type_adapter
+        self.__durations = EventBuilder.durations(durations)
+        self.__type_names: list[str] = []
+        self.__other_triggers: dict[int, np.ndarray] = {}
+        self.__interval_cache: dict[tuple, tuple] = {}
+        self.__counters = {'rows_read': 0, 'invalid_dates': 0,
+                           'fatal_failures': 0, 'unused_events': None}
+        if records is None:
+            records = SCHEMAS['records'].read(file.get_filepath(), 'merge')
+        if isinstance(records, SortedRecords):
+            dates = (records.ordinals - DataCard.EPOCH_ORDINAL) \
+                .astype('datetime64[D]')
+            filtered = self.__filter_records(records.records, dates)
+            self.__counters['rows_read'] = records.rows_read
+            self.__counters['invalid_dates'] = records.invalid_dates
+        else:
+            filtered = self.__filter_records(records)
+        self.__events = self.__combine(filtered)
+
+    @property
+    def events(self) -> pd.DataFrame:
+        """
+        Get events as a DataFrame with one row per event
+        """
+        return self.__events
+
+    @property
+    def counters(self) -> dict:
+        """
+        Get number of records read, records with an invalid date and fatal
+        failures met while splitting
+        """
+        return self.__counters
+
+    def __filter_records(self, df: pd.DataFrame,
+                         dates: np.ndarray | None = None) -> pd.DataFrame:
+        """
+        Remove records with invalid dates or unrequired types and sort the rest
+        by date
+
+        Args:
+            df (pd.DataFrame): Records read from file
+            dates (np.ndarray | None): Dates of the records if they are all
+                valid and already sorted, parsed from the records if None
+
+        Returns:
+            pd.DataFrame: Required records sorted by date
+        """
+        presorted = dates is not None
+        if presorted:
+            valid = np.ones(len(df), dtype=bool)
+        else:
+            dates, valid = DataCard.parse_dates(df['date'])
+        codes, uniques = pd.factorize(df['event'])
+        required = np.array(
+            [self.__type_adapter.in_required_types(u) for u in uniques] +
+            [False],
+            dtype=bool
+        )
+        trigger = np.array(
+            [self.__type_adapter.in_trigger_types(u) for u in uniques] +
+            [False],
+            dtype=bool
+        )
+        types = np.array(
+            [self.__type_code(self.__type_adapter.root_type(u))
+             for u in uniques] + [-1],
+            dtype=np.int64
+        )
+        self.__counters['rows_read'] = len(df)
+        self.__counters['invalid_dates'] = int(len(df) - valid.sum())
+        keep = valid & required[codes]
+        # stable sort keeps the file order of records on the same date
+        order = np.flatnonzero(keep)
+        if not presorted:
+            order = order[np.argsort(dates[order], kind='stable')]
+        self.__dates = dates[order]
+        self.__types = types[codes[order]]
+        self.__raw_types = df['event'].to_numpy()[order]
+        self.__triggers = np.flatnonzero(trigger[codes[order]])
+        return df.iloc[order]
+
+    def __type_code(self, type_name):
+        """
+        Get integer code of a root type name
+
+        Args:
+            type_name (str | None): Root type name
+
+        Returns:
+            int: Code of the root type, -1 if type_name is None
+        """
+        if type_name is None:
+            return -1
+        if type_name not in self.__type_names:
+            self.__type_names.append(type_name)
+        return self.__type_names.index(type_name)
+
+    def __next_other_trigger(self, type_code, start):
+        """
+        Find the first trigger record at or after start whose root type is
+        different from type_code
+
+        Args:
+            type_code (int): Code of the current event type
+            start (int): Index to search from
+
+        Returns:
+            int: Index of the trigger record, or the number of records if there
+                is none
+        """
+        if type_code not in self.__other_triggers:
+            candidates = (
+                self.__triggers if type_code == _UNMATCHED_TYPE
+                else self.__triggers[self.__types[self.__triggers] != type_code]
+            )
+            candidates = np.append(candidates, len(self.__dates))
+            positions = np.arange(len(self.__dates) + 1)
+            self.__other_triggers[type_code] = \
+                candidates[np.searchsorted(candidates, positions)]
+        return self.__other_triggers[type_code][start]
+
+    def __interval_ends(self, index, event_type):
+        """
+        Get the end of the primary interval and the end of the whole event
+        started by the record at index
+
+        Args:
+            index (int): Index of the record starting the event
+            event_type (str): Type of the event
+
+        Returns:
+            tuple[int, int]: Index of the first record after the primary
+                interval and of the first record after both intervals
+        """
+        primary = EventBuilder.primary_duration(event_type, self.__durations)
+        secondary = EventBuilder.secondary_duration(event_type,
+                                                    self.__durations)
+        durations = (primary, max(primary, secondary))
+        if durations not in self.__interval_cache:
+            self.__interval_cache[durations] = tuple(
+                np.searchsorted(
+                    self.__dates,
+                    self.__dates + np.timedelta64(days, 'D'),
+                    side='right'
+                )
+                for days in durations
+            )
+        primary_ends, ends = self.__interval_cache[durations]
+        return primary_ends[index], ends[index]
+
+    def __split(self, trigger):
+        """
+        Split the event started by trigger, as EventSplitter does
+
+        Args:
+            trigger (int): Index of the trigger record
+
+        Returns:
+            tuple[int, bool]: Index of the first record after the event, and
+                whether the event ended with a fatal failure
+        """
+        type_code = self.__types[trigger]
+        primary_end, end = \
+            self.__interval_ends(trigger, self.__type_names[type_code])
+        other = self.__next_other_trigger(type_code, trigger + 1)
+        if other < primary_end:
+            return self.__skip_fatal_failure(other), True
+        return min(other, end), False
+
+    def __skip_fatal_failure(self, trigger):
+        """
+        Simulate normal parsing from trigger and stop when back to normal, as
+        EventSplitter does
+
+        Args:
+            trigger (int): Index of the record causing the fatal failure
+
+        Returns:
+            int: Index of the first record after the failure
+        """
+        type_code = self.__types[trigger]
+        event_type = self.__type_names[type_code]
+        while True:
+            primary_end, end = self.__interval_ends(trigger, event_type)
+            other = self.__next_other_trigger(type_code, trigger + 1)
+            if other >= primary_end:
+                return min(other, end)
+            # EventSplitter restarts with the raw type, not the root type
+            trigger = other
+            event_type = self.__raw_types[other]
+            type_code = (
+                self.__type_names.index(event_type)
+                if event_type in self.__type_names else _UNMATCHED_TYPE
+            )
+
+    def __combine(self, records: pd.DataFrame) -> pd.DataFrame:
+        """
+        Combine the sorted required records into events
+
+        Args:
+            records (pd.DataFrame): Required records sorted by date
+
+        Returns:
+            pd.DataFrame: Events combined from records
+        """
+        count = len(self.__dates)
+        starts, ends = [], []
+        position = 0
+        while True:
+            i = np.searchsorted(self.__triggers, position)
+            if i == len(self.__triggers):
+                break
+            trigger = self.__triggers[i]
+            end, fatal = self.__split(trigger)
+            self.__counters['fatal_failures'] += fatal
+            if end >= count:
+                # an event is only built when a later record closes it
+                break
+            if not fatal:
+                starts.append(trigger)
+                ends.append(end)
+            position = end
+        if not starts:
+            # noinspection PyTypeChecker
+            return pd.DataFrame.from_dict([])
+        return self.__aggregate(records, np.array(starts), np.array(ends))
+
+    def __aggregate(self, records: pd.DataFrame, starts: np.ndarray,
+                    ends: np.ndarray) -> pd.DataFrame:
+        """
+        Combine the records of each event with EventAggregator
+
+        Args:
+            records (pd.DataFrame): Required records sorted by date
+            starts (np.ndarray): Index of the first record of each event
+            ends (np.ndarray): Index after the last record of each event
+
+        Returns:
+            pd.DataFrame: Events combined from records
+        """
+        lengths = ends - starts
+        event_ids = np.repeat(np.arange(len(starts)), lengths)
+        # index of every record of every event, in event order
+        rows = np.arange(len(event_ids)) - \
+            np.repeat(np.cumsum(lengths) - lengths - starts, lengths)
+        columns = [c for c in records.columns if c not in EXCLUDED_KEYS]
+        df = EventAggregator().aggregate(
+            records[columns].iloc[rows].reset_index(drop=True), event_ids
+        )
+        event_types = [self.__type_names[t] for t in self.__types[starts]]
+        start_dates = self.__dates[starts]
+        df['event'] = event_types
+        df['start_date'] = start_dates.astype(object)
+        for column, duration in (
+                ('primary_end', EventBuilder.primary_duration),
+                ('secondary_end', EventBuilder.secondary_duration)):
+            days = np.array([duration(t, self.__durations)
+                             for t in event_types])
+            df[column] = \
+                (start_dates + days.astype('timedelta64[D]')).astype(object)
+        return df
@@ -1,58 +1,69 @@
-from collections import deque
 import pandas as pd
 
-from .._models import DataCard, EventBuilder, Event
+from .._models import DataCard, EventBuilder, Event, EXCLUDED_KEYS, SCHEMAS
+from ._record_cache import SortedRecords
 
-__all__ = ["Combiner"]
+__all__ = ["Combiner", "EventTypeAdapter"]
 
 
 class Combiner:
     """
     Combiner class is used to combine datacards into events
     """
-    def __init__(self, file, subtypes: dict):
+    def __init__(self, file, type_adapter: "EventTypeAdapter",
+                 records: pd.DataFrame | SortedRecords | None = None,
+                 durations: dict | None = None):
         """
-        Initialise combiner with file and subtypes
+        Initialise combiner with file and type adapter
 
         Args:
             file (File): File object
-            subtypes (dict): Dictionary of event types and subtype files
+            type_adapter (EventTypeAdapter): Adapter for event types and
+                subtypes, shared by every Combiner of a run
+            records (pd.DataFrame | SortedRecords | None): Records of the
+                file if they are already read, read from the file if None.
+                SortedRecords are not filtered and sorted again
+            durations (dict | None): Primary and secondary durations of some
+                event types, overriding EventBuilder.DURATIONS
 
         Attributes:
-            self.__filtered_datacards (deque[DataCard]): Filtered datacards from
-                file by date and time with invalid datacards removed
+            self.__filtered_datacards (list[DataCard]): Filtered datacards from
+                file sorted by date, with invalid datacards removed
             self.__events (list[Event]): List of events combined from datacards
             self.__type_adapter (EventTypeAdapter): Adapter for event types and
                 subtypes from subtype files to check if event is required
+            self.__counters (dict[str, int]): Number of records read, records
+                with an invalid date, fatal failures and unused events met
+            self.__durations (dict): Durations of every event type
         """
-        self.__filtered_datacards: deque[DataCard] | None = None
+        self.__filtered_datacards: list[DataCard] | None = None
         self.__events: list[Event] = []
-        self.__type_adapter = EventTypeAdapter(subtypes)
-        df = pd.read_csv(file.get_filepath())
-        data_cards = list(
-            map(
-                lambda record: DataCard(record),
-                df.to_dict('index').values()
+        self.__type_adapter = type_adapter
+        self.__counters = {'rows_read': 0, 'invalid_dates': 0,
+                           'fatal_failures': 0, 'unused_events': 0}
+        self.__durations = EventBuilder.durations(durations)
+        if records is None:
+            records = SCHEMAS['records'].read(file.get_filepath(), 'merge')
+        if isinstance(records, SortedRecords):
+            self.__counters['rows_read'] = records.rows_read
+            self.__counters['invalid_dates'] = records.invalid_dates
+            self.__filtered_datacards = DataCard.from_dataframe(
+                records.records, EXCLUDED_KEYS, records.ordinals
             )
-        )
-        self.__filter_datacards(data_cards)
+        else:
+            data_cards = DataCard.from_dataframe(records, EXCLUDED_KEYS)
+            self.__counters['rows_read'] = len(data_cards)
+            self.__filter_datacards(data_cards)
         self.__start_processing()
 
     def __start_processing(self):
         """
         Start processing datacards to combine them into events
         """
-        while len(self.__filtered_datacards) > 0:
-            datacard = self.__filtered_datacards.popleft()
-            if not self.__type_adapter.in_trigger_types(datacard.event):
-                continue
-            splitter = EventSplitter(datacard, self.__filtered_datacards,
-                                     self.__type_adapter)
-            event, rest_datacards = splitter.get_results()
-            self.__filtered_datacards = rest_datacards
-            if event is None:
-                continue
-            self.__events.append(event)
+        splitter = EventSplitter(self.__type_adapter, self.__durations)
+        self.__events = list(splitter.split(self.__filtered_datacards))
+        self.__counters['fatal_failures'] = splitter.fatal_failures
+        self.__counters['unused_events'] = splitter.unused_events
 
     @property
     def events(self):
@@ -61,6 +72,14 @@ class Combiner:
         """
         return self.__events
 
+    @property
+    def counters(self):
+        """
+        Get number of records read, records with an invalid date, fatal
+        failures and unused events met while splitting
+        """
+        return self.__counters
+
     def __filter_datacards(self, data_cards):
         """
         Filter datacards by date and time with invalid datacards removed
@@ -74,8 +93,10 @@ class Combiner:
                 data_cards
             )
         )
+        self.__counters['invalid_dates'] = \
+            len(data_cards) - len(filtered_datacards)
         self.__filtered_datacards = \
-            deque(Combiner.__sort_datacards_by_date(filtered_datacards))
+            Combiner.__sort_datacards_by_date(filtered_datacards)
 
     @staticmethod
     def __sort_datacards_by_date(filtered_datacards):
@@ -93,14 +114,20 @@ class Combiner:
         """
         assert all(datacard.is_date_valid() for datacard in filtered_datacards)
         return sorted(filtered_datacards,
-                      key=lambda datacard: datacard.get_date())
+                      key=lambda datacard: datacard.ordinal)
 
 
 class EventTypeAdapter:
     """
     Adapter for event types and subtypes from subtype files to check if event
     is required
+
+    The subtype files are read once and compiled into a single dictionary from
+    normalised subtype to its root type and trigger flag, so an adapter can be
+    built once per run and shared by every Combiner.
     """
+    _NON_TRIGGER_TYPES = ["LANDSLIDES"]
+
     def __init__(self, subtypes: dict):
         """
         Initialise adapter with subtypes
@@ -115,7 +142,12 @@ class EventTypeAdapter:
             FLOODS (list[str]): List of flood subtypes
             EARTHQUAKES (list[str]): List of earthquake subtypes
             STORMS (list[str]): List of storm subtypes
+
+        Attributes:
+            self.__index (dict[str, tuple[str, bool]]): Root type and trigger
+                flag of each normalised subtype
         """
+        index: dict[str, tuple[str, bool]] = {}
         for event, subtype_file in subtypes.items():
             contents = list(
                 map(
@@ -124,6 +156,30 @@ class EventTypeAdapter:
                 )
             )
             self.__setattr__(event, contents)
+            is_trigger = event not in EventTypeAdapter._NON_TRIGGER_TYPES
+            for subtype in contents:
+                # the first type listing a subtype is its root type, and a
+                # subtype is a trigger if any trigger type lists it
+                root, trigger = index.get(subtype, (event, False))
+                index[subtype] = (root, trigger or is_trigger)
+        self.__index = index
+
+    def __lookup(self, item):
+        """
+        Get root type and trigger flag of event
+
+        Args:
+            item (str): Event type to look up
+
+        Returns:
+            tuple[str | None, bool]: Root type and trigger flag of event, or
+                (None, False) if event is not required
+        """
+        return (
+            self.__index.get(item.upper(), (None, False))
+            if isinstance(item, str)
+            else (None, False)
+        )
 
     def in_required_types(self, item):
         """
@@ -140,14 +196,7 @@ class EventTypeAdapter:
         Required Types:
             LANDSLIDES, FLOODS, EARTHQUAKES, STORMS
         """
-        return (
-            any(
-                item.upper() in subtypes
-                for event, subtypes in self.__dict__.items()
-            )
-            if isinstance(item, str)
-            else False
-        )
+        return self.__lookup(item)[0] is not None
 
     def in_trigger_types(self, item):
         """
@@ -164,15 +213,7 @@ class EventTypeAdapter:
         Trigger Types:
             FLOODS, EARTHQUAKES, STORMS
         """
-        return (
-            any(
-                item.upper() in subtypes
-                for event, subtypes in self.__dict__.items()
-                if event != "LANDSLIDES"
-            )
-            if isinstance(item, str)
-            else False
-        )
+        return self.__lookup(item)[1]
 
     def root_type(self, item):
         """
@@ -185,123 +226,157 @@ class EventTypeAdapter:
             str: Root type of event
 
         Example:
-            >>> subtypes = {
-            ...     "LANDSLIDES": ["LANDSLIDE", "LANDSLIDES, ROCKSLIDE"],
-            ...     "FLOODS": ["FLASH FLOOD", "FLOOD, flashflood"],
-            ...     "EARTHQUAKES": ["EARTHQUAKE"],
-            ...     "STORMS": ["TORNADO", "STORM"],
-            ... }
+            >>> subtypes = SubtypeFileGetter(data_folder).subtypes
             >>> type_adapter = EventTypeAdapter(subtypes)
             >>> type_adapter.root_type("Flash Flood")
             FLOODS
         """
-        return (
-            next(
-                (
-                    event
-                    for event, subtypes in self.__dict__.items()
-                    if item.upper() in subtypes
-                ),
-                None,
-            )
-            if isinstance(item, str)
-            else None
-        )
+        return self.__lookup(item)[0]
 
 
 class EventSplitter:
     """
-    Split datacards into different events
+    Split datacards sorted by date into events, in one forward sweep
+
+    The splitter is a state machine reading each datacard in order:
+
+        * Between events, datacards are skipped until a trigger, which starts
+          an event of its root type.
+        * In an event, a datacard of a required type within the primary or
+          secondary interval is added to the event. The first datacard after
+          both intervals, or of another trigger type, closes the event and is
+          read again between events.
+        * A trigger of another type within the primary interval is a fatal
+          failure: the event is dropped, and the datacards are dropped until
+          a datacard after the intervals of the last trigger, or of another
+          trigger type than it, which is read again between events. Each
+          trigger of another type within the primary interval of the last one
+          starts new intervals, typed with the event type of the datacard as
+          written in the file instead of its root type.
+        * In an event or a fatal failure, each run of datacards of types that
+          are not required is counted as one unused event and skipped.
+        * An event still open when the datacards run out is dropped.
+
+    A datacard is read at most twice, once in an event or a fatal failure and
+    once again between events, so splitting n datacards takes O(n) time. The
+    datacards are not held by the splitter, so they can be streamed.
     """
-    def __init__(self, trigger: DataCard, rest_datacards: deque[DataCard],
-                 type_adapter: EventTypeAdapter):
+    _BETWEEN_EVENTS = 0
+    _IN_EVENT = 1
+    _IN_FATAL_FAILURE = 2
+
+    def __init__(self, type_adapter: EventTypeAdapter,
+                 durations: dict | None = None):
         """
-        Initialise splitter with trigger datacard and rest of datacards
+        Initialise splitter with type adapter and durations
 
         Args:
-            trigger (DataCard): Trigger datacard
-            rest_datacards (deque[DataCard]): Rest of datacards
             type_adapter (EventTypeAdapter): Adapter for event types and
                 subtypes from subtype files to check if event is required
+            durations (dict | None): Durations of every event type, as
+                returned by EventBuilder.durations, the default ones if None
 
         Attributes:
-            type_adapter (EventTypeAdapter): Adapter for event types and
-                subtypes from subtype files to check if event is required
-            self.event_type (str): Event type of trigger datacard
-            self.builder (EventBuilder): Event builder
-            self.event (Event | None): Event to be returned
-            rest_datacards (deque[DataCard]): Rest of datacards
+            self.fatal_failures (int): Number of fatal failures met
+            self.unused_events (int): Number of times unused events were met
+            self.__type_adapter (EventTypeAdapter): Adapter for event types
+                and subtypes
+            self.__durations (dict | None): Durations of every event type
+            self.__types (dict[str, tuple[str | None, bool]]): Root type and
+                trigger flag of each event type met, the root type being None
+                if the type is not required
         """
-        self.type_adapter = type_adapter
-        assert self.type_adapter.in_trigger_types(trigger.event)
-        self.event_type = self.type_adapter.root_type(trigger.event)
-        self.builder = EventBuilder(trigger, self.event_type)
-        self.event: Event | None = None
-        self.rest_datacards = rest_datacards
-        self.start_split()
-
-    def start_split(self):
+        self.fatal_failures = 0
+        self.unused_events = 0
+        self.__type_adapter = type_adapter
+        self.__durations = durations
+        self.__types: dict[str, tuple[str | None, bool]] = {}
+
+    def split(self, datacards):
         """
-        Start splitting datacards into events
+        Split datacards into events
+
+        Args:
+            datacards (Iterable[DataCard]): Datacards with a valid date, sorted
+                by date, read once
+
+        Yields:
+            Event: Each event, when it is closed
         """
-        while len(self.rest_datacards) > 0:
-            datacard = self.rest_datacards.popleft()
-            current_event_type = self.type_adapter.root_type(datacard.event)
-            meet_another_trigger = current_event_type != self.event_type and \
-                self.type_adapter.in_trigger_types(datacard.event)
-            in_primary_interval = self.builder.in_primary_interval(datacard)
-            if not self.type_adapter.in_required_types(datacard.event):
-                self.__parse_unused_event()
-                continue
-            if meet_another_trigger and in_primary_interval:
-                self.__parse_fatal_failure(datacard)
-                break
-            if meet_another_trigger or \
-                    (not in_primary_interval and
-                     not self.builder.in_secondary_interval(datacard)):
-                self.rest_datacards.appendleft(datacard)
-                self.event = self.builder.build()
-                break
-            self.builder.add(datacard)
-
-    def get_results(self):
+        state = EventSplitter._BETWEEN_EVENTS
+        builder: EventBuilder | None = None
+        event_type = None
+        primary_end = end = 0
+        in_unused_run = False
+        for datacard in datacards:
+            root, trigger = self.__lookup(datacard.event)
+            if state != EventSplitter._BETWEEN_EVENTS:
+                if root is None:
+                    if not in_unused_run:
+                        self.unused_events += 1
+                        in_unused_run = True
+                    continue
+                in_unused_run = False
+                another_trigger = trigger and root != event_type
+                in_primary_interval = datacard.ordinal <= primary_end
+                if another_trigger and in_primary_interval:
+                    if state == EventSplitter._IN_EVENT:
+                        self.fatal_failures += 1
+                        event_type = root
+                        state = EventSplitter._IN_FATAL_FAILURE
+                    else:
+                        event_type = datacard.event
+                    builder = None
+                    primary_end, end = self.__interval_ends(datacard,
+                                                            event_type)
+                    continue
+                if not another_trigger and datacard.ordinal <= end:
+                    if builder is not None:
+                        builder.add(datacard)
+                    continue
+                if builder is not None:
+                    yield builder.build()
+                    builder = None
+                state = EventSplitter._BETWEEN_EVENTS
+            if trigger:
+                event_type = root
+                builder = EventBuilder(datacard, root, self.__durations)
+                primary_end, end = self.__interval_ends(datacard, root)
+                state = EventSplitter._IN_EVENT
+
+    def __lookup(self, event):
         """
-        Get results of splitting
+        Get root type and trigger flag of an event type, looked up once
+
+        Args:
+            event (str): Event type as written in the file
 
         Returns:
-            tuple[Event | None, deque[DataCard]]: Event and rest of datacards
+            tuple[str | None, bool]: Root type, None if the type is not
+                required, and trigger flag
+        """
+        found = self.__types.get(event)
+        if found is None:
+            found = (self.__type_adapter.root_type(event),
+                     self.__type_adapter.in_trigger_types(event))
+            self.__types[event] = found
+        return found
+
+    def __interval_ends(self, trigger: DataCard, event_type: str):
         """
-        return self.event, self.rest_datacards
+        Get the last day of the primary interval and of both intervals of an
+        event started by trigger
 
-    def __parse_unused_event(self):
-        while len(self.rest_datacards) > 0:
-            datacard = self.rest_datacards.popleft()
-            if not self.type_adapter.in_required_types(datacard.event):
-                continue
-            self.rest_datacards.appendleft(datacard)
-            break
+        Args:
+            trigger (DataCard): Datacard starting the intervals
+            event_type (str): Type whose durations are used
 
-    def __parse_fatal_failure(self, trigger):
-        """
-        Simulate normal parsing and stop when back to normal
+        Returns:
+            tuple[int, int]: Ordinals of the last day of the primary interval
+                and of the longer of the two intervals
         """
-        self.event_type = self.type_adapter.root_type(trigger.event)
-        self.builder = EventBuilder(trigger, self.event_type)
-        while len(self.rest_datacards) > 0:
-            datacard = self.rest_datacards.popleft()
-            current_event_type = self.type_adapter.root_type(datacard.event)
-            meet_another_trigger = current_event_type != self.event_type and \
-                self.type_adapter.in_trigger_types(datacard.event)
-            in_primary_interval = self.builder.in_primary_interval(datacard)
-            if not self.type_adapter.in_required_types(datacard.event):
-                self.__parse_unused_event()
-                continue
-            if meet_another_trigger and in_primary_interval:
-                self.builder = EventBuilder(datacard, datacard.event)
-                self.event_type = datacard.event
-                continue
-            if meet_another_trigger or \
-                    (not in_primary_interval and
-                     not self.builder.in_secondary_interval(datacard)):
-                self.rest_datacards.appendleft(datacard)
-                break
+        primary = EventBuilder.primary_duration(event_type, self.__durations)
+        secondary = EventBuilder.secondary_duration(event_type,
+                                                    self.__durations)
+        return trigger.ordinal + primary, \
+            trigger.ordinal + max(primary, secondary)
@@ -0,0 +1,331 @@
+import glob
+import io
+import os
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+from .._models import DataCard, SCHEMAS
+
+__all__ = ["EventIndex"]
+
+
+class EventIndex:
+    """
+    Sidecar indexes of the events and of the split EM-DAT data, to find the
+    disasters of one type in a country between two dates without parsing
+    whole files.
+
+    The index of a country is a NumPy archive in
+    ``index/<dataset>/<country>.npz``. For each event type, it holds the start
+    day of each row, sorted, with the byte offset and length of the row in
+    its CSV file. A query is a binary search on the start days followed by
+    one read of the part of the file holding the rows found, and only those
+    rows are parsed.
+
+    Indexes are built lazily: the first query on a country builds its index.
+    An index records the size and modification time of its CSV files, and a
+    query on an index that is out of date builds it again first.
+
+    Dates are parsed into day numbers with NumPy rather than into pandas
+    timestamps, so every date of the years 1 to 9999 is indexed and can
+    bound a query.
+
+    Attributes:
+        _FOLDER_NAME (str): The name of the folder of the indexes.
+        _VERSION (int): The version of the format of the indexes.
+        DATASETS (dict[str, dict]): For each dataset, the folder of its files
+            in the data directory, its schema, the column holding the event
+            type and the columns holding the start date.
+        __root (str): The path of the data directory.
+
+    Args:
+        data_path (str): The path of the data directory.
+    """
+    _FOLDER_NAME = "index"
+    _VERSION = 2
+    DATASETS = {
+        # one file of events per country, events/<country>.csv
+        'events': {
+            'folder': 'events',
+            'schema': 'events',
+            'type_column': 'event',
+            'date_columns': ['start_date'],
+        },
+        # one file per country and disaster type, emdat/<country>/<type>.csv
+        'emdat': {
+            'folder': 'emdat',
+            'schema': 'emdat',
+            'type_column': 'Disaster Type',
+            'date_columns': ['Start Year', 'Start Month', 'Start Day'],
+        },
+    }
+
+    def __init__(self, data_path: str):
+        self.__root = data_path
+
+    def path(self, dataset: str, country: str) -> str:
+        """
+        Returns the path of the index of a country.
+
+        Args:
+            dataset (str): The dataset, a key of DATASETS.
+            country (str): The name of the country.
+
+        Returns:
+            str: The path of the index file.
+        """
+        return f"{self.__root}/{EventIndex._FOLDER_NAME}/{dataset}/" \
+               f"{country}.npz"
+
+    def build(self, dataset: str, country: str,
+              sources: list[str] | None = None) -> str:
+        """
+        Indexes the CSV files of a country. They must be completely written.
+
+        Args:
+            dataset (str): The dataset, a key of DATASETS.
+            country (str): The name of the country.
+            sources (list[str] | None): The CSV files of the country, found
+                in the folder of the dataset if None.
+
+        Returns:
+            str: The path of the index file.
+
+        Raises:
+            ValueError: If the dataset is unknown.
+        """
+        if dataset not in EventIndex.DATASETS:
+            raise ValueError(f'Unknown dataset: {dataset}')
+        if sources is None:
+            sources = self.__sources(dataset, country)
+        arrays = {
+            'version': np.array(EventIndex._VERSION),
+            'sources': np.array(
+                [os.path.relpath(source, self.__root) for source in sources],
+                dtype=str
+            ),
+            'sizes': np.zeros(len(sources), dtype=np.int64),
+            'mtimes': np.zeros(len(sources), dtype=np.int64),
+            'header_lengths': np.zeros(len(sources), dtype=np.int64),
+        }
+        types = []
+        for i, source in enumerate(sources):
+            stat = os.stat(source)
+            arrays['sizes'][i] = stat.st_size
+            arrays['mtimes'][i] = stat.st_mtime_ns
+            with open(source, 'rb') as file:
+                data = file.read()
+            starts, ends = EventIndex.__row_spans(data)
+            if len(starts) == 0:
+                continue
+            arrays['header_lengths'][i] = ends[0]
+            keys = EventIndex.__read_keys(dataset, data)
+            if len(keys) != len(starts) - 1:
+                raise ValueError(f'Unexpected rows in {source}')
+            days = EventIndex.__start_days(dataset, keys)
+            for event_type, rows in keys.groupby(
+                    EventIndex.DATASETS[dataset]['type_column'],
+                    sort=False).indices.items():
+                rows = rows[np.argsort(days[rows], kind='stable')]
+                j = len(types)
+                types.append(event_type)
+                arrays[f'source_{j}'] = np.array(i)
+                arrays[f'days_{j}'] = days[rows]
+                arrays[f'offsets_{j}'] = starts[rows + 1]
+                arrays[f'lengths_{j}'] = ends[rows + 1] - starts[rows + 1]
+        arrays['types'] = np.array(types, dtype=str)
+        path = self.path(dataset, country)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary_path = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(temporary_path, **arrays)
+        os.replace(temporary_path, path)
+        return path
+
+    def query(self, dataset: str, country: str, event_type: str,
+              start=None, end=None) -> pd.DataFrame:
+        """
+        Returns the rows of one type of a country starting between two dates.
+
+        Args:
+            dataset (str): The dataset, a key of DATASETS.
+            country (str): The name of the country.
+            event_type (str): The event type, e.g. 'FLOODS' for events or
+                'Flood' for EM-DAT.
+            start: The first start date, included, as an ISO string such as
+                '2000-01-01', a date or a datetime. No lower bound if None.
+            end: The last start date, included, like start. No upper bound
+                if None.
+
+        Returns:
+            pd.DataFrame: The rows in start date order, rows starting on the
+                same day in file order, with the types pandas infers for
+                them. Empty if there are none.
+
+        Raises:
+            ValueError: If the dataset is unknown, a bound is not a date or
+                the country has no files in it.
+        """
+        if dataset not in EventIndex.DATASETS:
+            raise ValueError(f'Unknown dataset: {dataset}')
+        schema = SCHEMAS[EventIndex.DATASETS[dataset]['schema']]
+        with self.__load(dataset, country) as index:
+            matches = np.flatnonzero(index['types'] == event_type)
+            if len(matches) == 0:
+                return pd.DataFrame()
+            j = matches[0]
+            days = index[f'days_{j}']
+            first = 0 if start is None \
+                else np.searchsorted(days, EventIndex.__day(start), 'left')
+            last = len(days) if end is None \
+                else np.searchsorted(days, EventIndex.__day(end), 'right')
+            source = int(index[f'source_{j}'])
+            path = f"{self.__root}/{index['sources'][source]}"
+            header_length = int(index['header_lengths'][source])
+            offsets = index[f'offsets_{j}'][first:last]
+            lengths = index[f'lengths_{j}'][first:last]
+            with open(path, 'rb') as file:
+                header = file.read(header_length)
+                if len(offsets) == 0:
+                    return EventIndex.__uncategorize(schema.read_bytes(header))
+                span_start = int(offsets.min())
+                file.seek(span_start)
+                span = file.read(int((offsets + lengths).max()) - span_start)
+            rows = b''.join(
+                span[offset:offset + length]
+                for offset, length in zip((offsets - span_start).tolist(),
+                                          lengths.tolist())
+            )
+            return EventIndex.__uncategorize(schema.read_bytes(header + rows))
+
+    @staticmethod
+    def __uncategorize(df: pd.DataFrame) -> pd.DataFrame:
+        """Turns the categorical columns of the schema back into strings, as
+        a plain read of the CSV files returns them."""
+        columns = df.select_dtypes('category').columns
+        return df.astype({column: object for column in columns})
+
+    def __load(self, dataset, country):
+        """Loads the index of a country, building it first if it is missing
+        or out of date."""
+        path = self.path(dataset, country)
+        if os.path.exists(path):
+            index = np.load(path)
+            if self.__is_valid(index):
+                return index
+            index.close()
+        self.build(dataset, country)
+        return np.load(path)
+
+    def __is_valid(self, index) -> bool:
+        if int(index['version']) != EventIndex._VERSION:
+            return False
+        for source, size, mtime in zip(index['sources'], index['sizes'],
+                                       index['mtimes']):
+            path = f"{self.__root}/{source}"
+            if not os.path.exists(path):
+                return False
+            stat = os.stat(path)
+            if stat.st_size != size or stat.st_mtime_ns != mtime:
+                return False
+        return True
+
+    def __sources(self, dataset, country):
+        """Returns the CSV files of a country in the folder of a dataset."""
+        folder = f"{self.__root}/{EventIndex.DATASETS[dataset]['folder']}"
+        sources = [f"{folder}/{country}.csv"] if dataset == 'events' \
+            else sorted(glob.glob(f"{glob.escape(folder)}/"
+                                  f"{glob.escape(country)}/*.csv"))
+        sources = [source for source in sources if os.path.isfile(source)]
+        if not sources:
+            raise ValueError(f'No {dataset} files for {country}')
+        return sources
+
+    @staticmethod
+    def __row_spans(data: bytes):
+        """
+        Finds the rows of CSV contents. A newline inside a quoted value does
+        not end a row: it is preceded by an odd number of quotes.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The offset of the first byte of
+                each row, the header included, and of the byte after its end.
+        """
+        buffer = np.frombuffer(data, dtype=np.uint8)
+        newlines = np.flatnonzero(buffer == ord('\n'))
+        if b'"' in data:
+            quotes = np.cumsum(buffer == ord('"'))
+            newlines = newlines[quotes[newlines] % 2 == 0]
+        ends = newlines + 1
+        if len(data) > (ends[-1] if len(ends) else 0):
+            ends = np.append(ends, len(data))
+        # a file without columns only holds a newline
+        if len(ends) and data[:ends[0]].strip() == b'':
+            return np.array([], dtype=np.int64), np.array([], dtype=np.int64)
+        starts = np.concatenate([[0], ends[:-1]]).astype(np.int64)
+        return starts, ends.astype(np.int64)
+
+    @staticmethod
+    def __read_keys(dataset, data) -> pd.DataFrame:
+        """Reads the type and start date columns of CSV contents."""
+        spec = EventIndex.DATASETS[dataset]
+        return pd.read_csv(io.BytesIO(data), dtype=str, keep_default_na=False,
+                           skip_blank_lines=False,
+                           usecols=[spec['type_column']] +
+                           spec['date_columns'])
+
+    @staticmethod
+    def __start_days(dataset, keys: pd.DataFrame) -> np.ndarray:
+        """Returns the start day of each row, in days since 1970-01-01."""
+        columns = EventIndex.DATASETS[dataset]['date_columns']
+        if len(columns) == 1:
+            parts = keys[columns[0]].str.extract(
+                r'^\s*(\d{1,4})-(\d{1,2})-(\d{1,2})(?:[ T].*)?\s*$'
+            )
+            year, month, day = (
+                pd.to_numeric(parts[i], errors='coerce').to_numpy(dtype=float)
+                for i in range(3)
+            )
+            days, valid = DataCard.day_numbers(year, month, day)
+        else:
+            year, month, day = (
+                pd.to_numeric(keys[column], errors='coerce')
+                .to_numpy(dtype=float)
+                for column in columns
+            )
+            days, valid = DataCard.day_numbers(year, month, day)
+            # a day or month that is unknown or does not exist is read as the
+            # start of the known period
+            for fallback_month, fallback_day in ((month, 1), (1, 1)):
+                fallback_days, fallback_valid = DataCard.day_numbers(
+                    year, np.broadcast_to(fallback_month, year.shape),
+                    np.ones(year.shape)
+                )
+                days = np.where(valid, days, fallback_days)
+                valid |= fallback_valid
+        # rows without a start date come first, before any start date
+        return np.where(valid, days, np.iinfo(np.int64).min)
+
+    @staticmethod
+    def __day(value) -> int:
+        """
+        Returns a date as a number of days since 1970-01-01.
+
+        Raises:
+            ValueError: If the value is not a date.
+        """
+        if isinstance(value, np.datetime64):
+            return int(value.astype('datetime64[D]').astype(np.int64))
+        if isinstance(value, str):
+            try:
+                value = date.fromisoformat(value.strip())
+            except ValueError:
+                try:
+                    value = datetime.fromisoformat(value.strip())
+                except ValueError:
+                    raise ValueError(f'Invalid date: {value}') from None
+        if not isinstance(value, date):
+            raise ValueError(f'Invalid date: {value}')
+        # a datetime is a date, its ordinal is the one of its day
+        return value.toordinal() - DataCard.EPOCH_ORDINAL
@@ -0,0 +1,185 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from .._models import DataCard, SCHEMAS
+from .._utils import File, Manifest
+
+__all__ = ["RecordCache", "SortedRecords"]
+
+
+class SortedRecords:
+    """
+    The records of a country whose date is valid, sorted by date, as the
+    combiners use them.
+
+    Attributes:
+        records (pd.DataFrame): The records, by date and in file order on the
+            same date.
+        ordinals (np.ndarray): The proleptic Gregorian ordinal of the date of
+            each record.
+        rows_read (int): The number of records in the file.
+        invalid_dates (int): The number of records with an invalid date, which
+            are not kept.
+    """
+    def __init__(self, records: pd.DataFrame, ordinals: np.ndarray,
+                 rows_read: int, invalid_dates: int):
+        self.records = records
+        self.ordinals = ordinals
+        self.rows_read = rows_read
+        self.invalid_dates = invalid_dates
+
+    @staticmethod
+    def from_records(df: pd.DataFrame):
+        """
+        Removes the records with an invalid date and sorts the others.
+
+        Args:
+            df (pd.DataFrame): The records as read from a file.
+
+        Returns:
+            SortedRecords: The records with a valid date, sorted by date.
+        """
+        dates, valid = DataCard.parse_dates(df['date'])
+        # stable sort keeps the file order of records on the same date
+        order = np.flatnonzero(valid)
+        order = order[np.argsort(dates[order], kind='stable')]
+        return SortedRecords(
+            df.iloc[order].reset_index(drop=True),
+            dates[order].astype(np.int64) + DataCard.EPOCH_ORDINAL,
+            len(df), int(len(df) - valid.sum())
+        )
+
+
+class RecordCache:
+    """
+    A folder of binary copies of the records files, already parsed, with the
+    invalid dates removed and sorted by date, so merging the same records
+    again does not parse them.
+
+    Each copy is an Arrow IPC file, read through a memory map, named after its
+    records file. It records the size, modification time and content hash of
+    the records file and the version of the cache and of the records schema,
+    and is rebuilt when the content or a version changes. The hash is only
+    computed when the size is the same but the modification time is not.
+
+    Requires pyarrow, which is an optional dependency.
+
+    Attributes:
+        _VERSION (int): The version of the format of the copies.
+        _METADATA_KEY (bytes): The key of the cache metadata in the schema
+            metadata of a copy.
+        _ORDINAL_COLUMN (str): The column of the copies holding the ordinal
+            of the dates.
+        __path (str): The path of the cache folder.
+
+    Args:
+        path (str): The path of the cache folder, created if needed.
+
+    Raises:
+        ImportError: If pyarrow is not installed.
+    """
+    _VERSION = 1
+    _METADATA_KEY = b'record_cache'
+    _ORDINAL_COLUMN = '__ordinal'
+
+    def __init__(self, path: str):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as error:
+            raise ImportError(
+                'The records cache requires pyarrow, install it with '
+                '`pip install pyarrow`.'
+            ) from error
+        os.makedirs(path, exist_ok=True)
+        self.__path = path
+
+    def read(self, file: File) -> SortedRecords:
+        """
+        Reads the records of a country from the cache, or from its file if
+        the cache has no valid copy of them, in which case a copy is written.
+
+        Args:
+            file (File): The records file of the country.
+
+        Returns:
+            SortedRecords: The records with a valid date, sorted by date.
+        """
+        source = file.get_filepath()
+        entry = f"{self.__path}/{file.get_filename()}.arrow"
+        records = self.__load(source, entry)
+        if records is None:
+            records = SortedRecords.from_records(
+                SCHEMAS['records'].read(source, 'merge')
+            )
+            self.__store(source, entry, records)
+        return records
+
+    @staticmethod
+    def __version():
+        return f"{RecordCache._VERSION}.{SCHEMAS['records'].version}"
+
+    @staticmethod
+    def __load(source, entry) -> SortedRecords | None:
+        """Returns the copy of the records in entry if it is valid for the
+        records in source, None otherwise."""
+        import pyarrow as pa
+
+        if not os.path.exists(entry):
+            return None
+        try:
+            with pa.memory_map(entry) as mapped:
+                reader = pa.ipc.open_file(mapped)
+                metadata = json.loads(
+                    (reader.schema.metadata or {})
+                    .get(RecordCache._METADATA_KEY, b'{}')
+                )
+                if not RecordCache.__is_valid(source, metadata):
+                    return None
+                table = reader.read_all()
+        except (pa.ArrowInvalid, OSError, ValueError):
+            return None
+        ordinals = table.column(RecordCache._ORDINAL_COLUMN).to_numpy()
+        table = table.drop([RecordCache._ORDINAL_COLUMN])
+        return SortedRecords(table.to_pandas(), ordinals,
+                             metadata['rows_read'], metadata['invalid_dates'])
+
+    @staticmethod
+    def __is_valid(source, metadata) -> bool:
+        if metadata.get('version') != RecordCache.__version():
+            return False
+        stat = os.stat(source)
+        if metadata.get('size') != stat.st_size:
+            return False
+        return metadata.get('mtime_ns') == stat.st_mtime_ns or \
+            metadata.get('sha256') == Manifest.hash_file(source)
+
+    @staticmethod
+    def __store(source, entry, records: SortedRecords):
+        """Writes a copy of the records, replacing the previous one at
+        once so concurrent readers never see a partial copy."""
+        import pyarrow as pa
+
+        stat = os.stat(source)
+        table = pa.Table.from_pandas(records.records, preserve_index=False)
+        table = table.append_column(RecordCache._ORDINAL_COLUMN,
+                                    pa.array(records.ordinals, pa.int64()))
+        metadata = {
+            'version': RecordCache.__version(),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sha256': Manifest.hash_file(source),
+            'rows_read': records.rows_read,
+            'invalid_dates': records.invalid_dates,
+        }
+        table = table.replace_schema_metadata({
+            **(table.schema.metadata or {}),
+            RecordCache._METADATA_KEY: json.dumps(metadata).encode(),
+        })
+        temporary_path = f"{entry}.{os.getpid()}.tmp"
+        with pa.OSFile(temporary_path, 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(temporary_path, entry)
@@ -0,0 +1,137 @@
+import numpy as np
+import pandas as pd
+
+from .._models import EventAggregator
+
+__all__ = ["ReturnPeriods"]
+
+
+class ReturnPeriods:
+    """
+    Computes the empirical exceedance curves and return periods of the losses
+    of the sliced events, for every country, event type and loss column.
+
+    The curve of a loss column has one point per distinct value of the loss,
+    from the largest to the smallest. For each value, it gives the number of
+    events whose loss is at least that value, the probability of exceeding
+    it with the Weibull plotting position exceedances / (events + 1), its
+    annual frequency exceedances / years and its return period
+    years / exceedances. The years of a country are the time between the
+    first and the last start date of its sliced events, of any type, and at
+    least _MIN_YEARS: events all starting within a few days would otherwise
+    give frequencies of hundreds of events a year. Events without a value for
+    a loss column are not part of its curve.
+
+    The values of every curve are added first and all the curves are then
+    computed at once, with one sort of all the values.
+
+    Attributes:
+        LOSS_COLUMNS (list[str]): The loss columns used by default, the
+            columns summed by EventAggregator except magnitude2 and
+            duration, which measure the hazard rather than a loss.
+        COLUMNS (list[str]): The columns of the table of the curves.
+        _DAYS_PER_YEAR (float): The mean length of a Gregorian year, in days.
+        _MIN_YEARS (float): The shortest period the events of a country are
+            observed over, in years.
+        __loss_columns (list[str]): The loss columns used.
+        __labels (list[tuple[str, str, str]]): The country, event type and
+            loss column of each curve.
+        __years (list[float]): The years of the country of each curve.
+        __values (list[np.ndarray]): The losses of each curve.
+
+    Args:
+        loss_columns (list[str] | None): The loss columns to compute curves
+            for, LOSS_COLUMNS if None. Columns missing from the events are
+            skipped.
+    """
+    LOSS_COLUMNS = [
+        column for column, aggregation in EventAggregator.SCHEMA.items()
+        if aggregation == 'sum' and column not in ('magnitude2', 'duration')
+    ]
+    COLUMNS = ['country', 'event', 'loss', 'value', 'exceedances', 'events',
+               'years', 'probability', 'frequency', 'return_period']
+    _DAYS_PER_YEAR = 365.2425
+    _MIN_YEARS = 1.0
+
+    def __init__(self, loss_columns: list[str] | None = None):
+        self.__loss_columns = list(loss_columns or ReturnPeriods.LOSS_COLUMNS)
+        self.__labels: list[tuple[str, str, str]] = []
+        self.__years: list[float] = []
+        self.__values: list[np.ndarray] = []
+
+    def add_country(self, country: str,
+                    events: list[tuple[str, pd.DataFrame]]):
+        """
+        Adds the sliced events of a country.
+
+        Args:
+            country (str): The name of the country.
+            events (list[tuple[str, pd.DataFrame]]): The event type and the
+                sliced events of each type, as written by the slice stage.
+        """
+        dates = pd.concat(
+            [pd.to_datetime(df['start_date'], errors='coerce')
+             for _, df in events if 'start_date' in df.columns] or
+            [pd.Series([], dtype='datetime64[ns]')]
+        )
+        years = (dates.max() - dates.min()).days + 1 \
+            if dates.notna().any() else np.nan
+        years /= ReturnPeriods._DAYS_PER_YEAR
+        if years < ReturnPeriods._MIN_YEARS:
+            years = ReturnPeriods._MIN_YEARS
+        for event, df in events:
+            for column in self.__loss_columns:
+                if column not in df.columns:
+                    continue
+                values = pd.to_numeric(df[column], errors='coerce') \
+                    .to_numpy(dtype=np.float64)
+                values = values[~np.isnan(values)]
+                if len(values) == 0:
+                    continue
+                self.__labels.append((country, event, column))
+                self.__years.append(years)
+                self.__values.append(values)
+
+    @property
+    def curves(self) -> int:
+        """Returns the number of curves added."""
+        return len(self.__values)
+
+    def table(self) -> pd.DataFrame:
+        """
+        Computes the curves added.
+
+        Returns:
+            pd.DataFrame: One row per point of each curve, with COLUMNS, by
+                country, event type and loss column in the order they were
+                added, and by decreasing value.
+        """
+        if not self.__values:
+            return pd.DataFrame(columns=ReturnPeriods.COLUMNS)
+        sizes = np.array([len(values) for values in self.__values])
+        curves = np.repeat(np.arange(len(sizes)), sizes)
+        values = np.concatenate(self.__values)
+        # by curve, then by decreasing value
+        order = np.lexsort((-values, curves))
+        curves, values = curves[order], values[order]
+        starts = np.cumsum(sizes) - sizes
+        ranks = np.arange(len(values)) - starts[curves] + 1
+        # the last of equal values is exceeded or equalled by all before it
+        last = np.ones(len(values), dtype=bool)
+        last[:-1] = (curves[1:] != curves[:-1]) | (values[1:] != values[:-1])
+        curves, values, exceedances = curves[last], values[last], ranks[last]
+        events = sizes[curves]
+        years = np.array(self.__years)[curves]
+        labels = np.array(self.__labels, dtype=object)[curves]
+        return pd.DataFrame({
+            'country': labels[:, 0],
+            'event': labels[:, 1],
+            'loss': labels[:, 2],
+            'value': values,
+            'exceedances': exceedances,
+            'events': events,
+            'years': years,
+            'probability': exceedances / (events + 1),
+            'frequency': exceedances / years,
+            'return_period': years / exceedances,
+        })
@@ -1,6 +1,7 @@
 import pandas as pd
 
-from .._utils import Directory, File
+from .._models import SCHEMAS
+from .._utils import AsyncWriter, Directory, File, ParquetStore
 
 __all__ = ["Slicer"]
 
@@ -12,82 +13,227 @@ class Slicer:
     A class that slices a CSV file of disaster data for a specific country into
     separate CSV files for each type of disaster.
 
+    Use Slicer.from_events to slice events that are already in memory, e.g.
+    straight after they are merged, without reading them back from a file.
+
+    Given fractions, the events are read and split once and sliced once per
+    fraction, each variant being written to a subdirectory of the output
+    directory named after its fraction, e.g. ``0.05/Nepal/FLOODS.csv``.
+
     Args:
         country (File): The input CSV file of disaster data.
         output_folder (Directory): The output directory for the sliced CSV files
         _slice (bool): Whether to slice the data by removing the first 5% of
             rows. Default is True.
+        store (ParquetStore | None): If given, the sliced data is also written
+            to a Parquet dataset named after the output directory.
+        writer (AsyncWriter | None): If given, the sliced CSV files are handed
+            to it instead of being written before the constructor returns.
+        fractions (list[float] | None): If given, the fractions of the first
+            rows of each type to remove, one variant per fraction, instead of
+            removing 5% or none according to _slice.
 
     Attributes:
+        FRACTION (float): The fraction of the first rows of each type removed
+            when the data is sliced.
         __country_name (str): The name of the country derived from the input
             file name.
-        __country_path (str): The path to the input file.
+        __country_path (str | None): The path to the input file, None when
+            the events were given in memory.
         __slice (bool): Whether to slice the data by removing the first 5% of
             rows.
         __output_folder (Directory): The output directory for the sliced CSV
             files.
+        __outputs (list[str]): The paths of the sliced CSV files written.
+        __counters (dict[str, int]): The number of events read and of rows
+            written.
+        __store (ParquetStore | None): The Parquet dataset the sliced data is
+            also written to.
+        __writer (AsyncWriter | None): The writer of the sliced CSV files.
+        __fractions (list[float] | None): The fractions of the variants, None
+            if there is one variant in the output directory itself.
 
     Methods:
-        __start: Slices the input data and saves the sliced data as separate CSV
-            files for each type of disaster.
+        __start: Reads the input data and slices it.
+        __slice_and_save: Slices the events and saves the sliced data as
+            separate CSV files for each type of disaster.
         __slice_for_all_events: Slices the input data for all types of disasters
         __slice_for_one_event: Slices the input data for one type of disaster.
         __save_results: Saves the sliced data as separate CSV files for each
             type of disaster.
+
+    Raises:
+        ValueError: If a fraction is not between 0, included, and 1, or is
+            given twice.
     """
-    def __init__(self, country: File, output_folder: Directory, _slice=True):
-        self.__country_name = country.get_filename().split(".")[0]
+    FRACTION = 0.05
+
+    def __init__(self, country: File, output_folder: Directory, _slice=True,
+                 store: ParquetStore | None = None,
+                 writer: AsyncWriter | None = None,
+                 fractions: list[float] | None = None):
+        self.__setup(country.get_filename().split(".")[0], output_folder,
+                     _slice, store, writer, fractions)
         self.__country_path = country.get_filepath()
+        self.__start()
+
+    @classmethod
+    def from_events(cls, country_name: str, events: pd.DataFrame,
+                    output_folder: Directory, _slice=True,
+                    store: ParquetStore | None = None,
+                    writer: AsyncWriter | None = None,
+                    fractions: list[float] | None = None):
+        """
+        Slices the events of a country that are already in memory.
+
+        Args:
+            country_name (str): The name of the country, without extension.
+            events (pd.DataFrame): The events of the country, as written by the
+                merge stage.
+            output_folder (Directory): The output directory for the sliced CSV
+                files.
+            _slice (bool): Whether to slice the data by removing the first 5%
+                of rows. Default is True.
+            store (ParquetStore | None): If given, the sliced data is also
+                written to a Parquet dataset named after the output directory.
+            writer (AsyncWriter | None): If given, the sliced CSV files are
+                handed to it instead of being written before this returns.
+            fractions (list[float] | None): If given, the fractions of the
+                first rows of each type to remove, one variant per fraction.
+
+        Returns:
+            Slicer: The slicer, with the paths of the files written.
+
+        Raises:
+            ValueError: If a fraction is not between 0, included, and 1, or
+                is given twice.
+        """
+        slicer = cls.__new__(cls)
+        slicer.__setup(country_name, output_folder, _slice, store, writer,
+                       fractions)
+        slicer.__country_path = None
+        # a country without events has no columns, like its empty CSV file
+        if len(events.columns) > 0:
+            slicer.__slice_and_save(events)
+        return slicer
+
+    def __setup(self, country_name: str, output_folder: Directory, _slice,
+                store: ParquetStore | None, writer: AsyncWriter | None,
+                fractions: list[float] | None):
+        names = set()
+        for fraction in fractions or []:
+            if not 0 <= fraction < 1:
+                raise ValueError(f'Invalid slice fraction: {fraction}')
+            name = Slicer.fraction_name(fraction)
+            if name in names:
+                raise ValueError(f'Duplicate slice fraction: {fraction}')
+            names.add(name)
+        self.__country_name = country_name
         self.__slice = _slice
         self.__output_folder = output_folder
-        self.__start()
+        self.__outputs: list[str] = []
+        self.__counters = {'events_read': 0, 'rows_written': 0}
+        self.__store = store
+        self.__writer = writer
+        self.__fractions = fractions
+
+    @staticmethod
+    def fraction_name(fraction: float) -> str:
+        """
+        Returns the name of the subdirectory of the variant of a fraction.
+
+        Args:
+            fraction (float): The fraction, e.g. 0.05.
+
+        Returns:
+            str: The shortest form of the fraction that reads back as the
+                same float, e.g. '0.05', so distinct fractions never share a
+                subdirectory.
+        """
+        return repr(float(fraction))
+
+    @property
+    def outputs(self):
+        """Returns the paths of the sliced CSV files written."""
+        return self.__outputs
+
+    @property
+    def counters(self):
+        """Returns the number of events read and of rows written."""
+        return self.__counters
 
     def __start(self):
         """
-        Reads the input data, splits it by type of disaster, slices it for each
-        disaster, and saves the sliced data.
+        Reads the input data and slices it.
         """
         try:
-            df = pd.read_csv(self.__country_path)
+            df = SCHEMAS['events'].read(self.__country_path)
         except pd.errors.EmptyDataError:
             return
+        self.__slice_and_save(df)
+
+    def __slice_and_save(self, df: pd.DataFrame):
+        """
+        Splits the events by type of disaster, slices them for each disaster,
+        and saves the sliced data.
+
+        Args:
+            df (pd.DataFrame): The events of the country.
+        """
+        self.__counters['events_read'] = len(df)
         splitter = Splitter(df)
         split_events = splitter.split_events
-        sliced_events = self.__slice_for_all_events(split_events)
-        self.__save_results(sliced_events)
+        if self.__fractions is None:
+            fraction = Slicer.FRACTION if self.__slice else 0
+            sliced_events = self.__slice_for_all_events(split_events, fraction)
+            self.__save_results(sliced_events, self.__output_folder,
+                                self.__output_folder.get_dirname())
+            return
+        for fraction in self.__fractions:
+            name = Slicer.fraction_name(fraction)
+            self.__output_folder.create_subdirectory(name)
+            sliced_events = self.__slice_for_all_events(split_events, fraction)
+            self.__save_results(
+                sliced_events, self.__output_folder.find_directory(name),
+                f"{self.__output_folder.get_dirname()}/{name}"
+            )
 
-    def __slice_for_all_events(self, split_events):
+    def __slice_for_all_events(self, split_events, fraction: float):
         """
         Slices the input data for all types of disasters.
 
         Args:
             split_events (list): A list of tuples where each tuple contains the
                 type of disaster and the corresponding subset of the input data.
+            fraction (float): The fraction of the first rows to remove.
 
         Returns:
             list: A list of tuples where each tuple contains the type of
                 disaster and the corresponding sliced subset of the input data.
         """
         return [
-            (trigger, self.__slice_for_one_event(df))
+            (trigger, self.__slice_for_one_event(df, fraction))
             for trigger, df in split_events
         ]
 
-    def __slice_for_one_event(self, df: pd.DataFrame):
+    @staticmethod
+    def __slice_for_one_event(df: pd.DataFrame, fraction: float):
         """
         Slices the input data for a single type of disaster.
 
         Args:
             df (pd.DataFrame): The subset of the input data for a single type of
                 disaster.
+            fraction (float): The fraction of the first rows to remove.
 
         Returns:
             pd.DataFrame: The sliced subset of the input data for a single type
                 of disaster.
         """
-        return df.iloc[int(len(df) * 0.05):] if self.__slice else df
+        return df.iloc[int(len(df) * fraction):] if fraction else df
 
-    def __save_results(self, sliced_events):
+    def __save_results(self, sliced_events, output_folder: Directory,
+                       dataset: str):
         """
         Saves the sliced data as separate CSV files for each type of disaster.
 
@@ -95,13 +241,25 @@ class Slicer:
             sliced_events (list): A list of tuples where each tuple contains the
                 type of disaster and the corresponding sliced subset of the
                 input data.
+            output_folder (Directory): The directory of the variant.
+            dataset (str): The Parquet dataset of the variant.
         """
+        output_folder.create_subdirectory(self.__country_name)
+        country_directory = \
+            output_folder.find_directory(self.__country_name)
         for trigger, df in sliced_events:
-            self.__output_folder.create_subdirectory(self.__country_name)
-            country_directory = \
-                self.__output_folder.find_directory(self.__country_name)
+            self.__counters['rows_written'] += len(df)
             filepath = f"{country_directory.get_path()}/{trigger}.csv"
-            df.to_csv(filepath, index=False)
+            if self.__writer is not None:
+                self.__writer.write_csv(df, filepath)
+            else:
+                df.to_csv(filepath, index=False)
+            self.__outputs.append(filepath)
+        if self.__store is not None:
+            with self.__store.open(dataset, self.__country_name,
+                                   'event') as writer:
+                for _, df in sliced_events:
+                    writer.write(df)
 
 
 class Splitter:
@@ -118,10 +276,12 @@ class Splitter:
             is a DataFrame containing information on events of that type.
     """
     def __init__(self, df: pd.DataFrame):
-        self.__split_events = []
-        self.__split_events.extend(
-            (trigger, df[df['event'] == trigger]) for trigger in TRIGGER_EVENTS
-        )
+        # one pass over the events instead of one mask per trigger
+        groups = dict(tuple(df.groupby('event', sort=False, observed=True)))
+        self.__split_events = [
+            (trigger, groups.get(trigger, df.iloc[:0]))
+            for trigger in TRIGGER_EVENTS
+        ]
 
     @property
     def split_events(self):
@@ -0,0 +1,224 @@
+import heapq
+import pickle
+import tempfile
+
+import pandas as pd
+
+from .._models import DataCard, EventAggregator, EventBuilder, \
+    EXCLUDED_KEYS, SCHEMAS
+from ._combiner import EventTypeAdapter, EventSplitter
+
+__all__ = ["StreamingCombiner"]
+
+
+class StreamingCombiner:
+    """
+    StreamingCombiner class combines datacards into events like Combiner does,
+    with a peak memory bounded by the chunk size instead of the file size
+
+    The records are read in chunks. Each chunk is filtered, sorted by date and
+    spilled to a temporary file. The sorted runs are then merged lazily and fed
+    to EventSplitter one datacard at a time, and events are appended to the
+    output file as soon as they are closed.
+    """
+    _BLOCK_SIZE = 1024
+    _BATCH_SIZE = 1024
+
+    def __init__(self, file, type_adapter: EventTypeAdapter, output_path: str,
+                 chunk_size=100_000, spill_folder: str | None = None,
+                 on_batch=None, durations: dict | None = None):
+        """
+        Initialise combiner with file, type adapter and output path
+
+        Args:
+            file (File): File object
+            type_adapter (EventTypeAdapter): Adapter for event types and
+                subtypes, shared by every combiner of a run
+            output_path (str): Path of the CSV file the events are written to
+            chunk_size (int): Number of records read and sorted at once
+            spill_folder (str | None): Folder for the temporary sorted runs,
+                the system temporary folder if None
+            on_batch (Callable[[pd.DataFrame], None] | None): Called with each
+                batch of events written, e.g. to write them to another output
+            durations (dict | None): Primary and secondary durations of some
+                event types, overriding EventBuilder.DURATIONS
+
+        Attributes:
+            self.__type_adapter (EventTypeAdapter): Adapter for event types and
+                subtypes from subtype files to check if event is required
+            self.__aggregator (EventAggregator): Combines the datacards of a
+                batch of events
+            self.__float_columns (list[str]): Loss columns read as floats in at
+                least one chunk, written as floats like a whole-file read does
+            self.__events_count (int): Number of events written
+            self.__on_batch (Callable | None): Called with each batch written
+            self.__counters (dict[str, int | None]): Number of records read,
+                records with an invalid date and fatal failures met. Unused
+                events are dropped before splitting, so they are not counted
+            self.__durations (dict): Durations of every event type
+        """
+        self.__type_adapter = type_adapter
+        self.__durations = EventBuilder.durations(durations)
+        self.__aggregator = EventAggregator()
+        self.__float_columns: list[str] = []
+        self.__events_count = 0
+        self.__counters = {'rows_read': 0, 'invalid_dates': 0,
+                           'fatal_failures': 0, 'unused_events': None}
+        self.__on_batch = on_batch
+        with tempfile.TemporaryDirectory(dir=spill_folder) as spill_path:
+            runs = self.__spill_sorted_runs(file.get_filepath(), chunk_size,
+                                            spill_path)
+            self.__start_processing(StreamingCombiner.__merge_runs(runs),
+                                    output_path)
+
+    @property
+    def events_count(self):
+        """
+        Get number of events written
+        """
+        return self.__events_count
+
+    @property
+    def counters(self):
+        """
+        Get number of records read, records with an invalid date and fatal
+        failures met while splitting
+        """
+        return self.__counters
+
+    def __spill_sorted_runs(self, filepath, chunk_size, spill_path):
+        """
+        Read records in chunks, keep the valid and required datacards of each
+        chunk sorted by date, and write them to a temporary file
+
+        Args:
+            filepath (str): Path of the records file
+            chunk_size (int): Number of records read at once
+            spill_path (str): Folder for the temporary files
+
+        Returns:
+            list[str]: Paths of the sorted runs
+        """
+        runs = []
+        kinds: dict[str, set[str]] = {}
+        row = 0
+        for chunk in SCHEMAS['records'].read_chunks(filepath, chunk_size,
+                                                    'merge'):
+            for column, dtype in chunk.dtypes.items():
+                kinds.setdefault(column, set()).add(dtype.kind)
+            datacards = DataCard.from_dataframe(chunk, EXCLUDED_KEYS)
+            self.__counters['rows_read'] += len(datacards)
+            self.__counters['invalid_dates'] += sum(
+                not datacard.is_date_valid() for datacard in datacards
+            )
+            # the row number keeps the file order of datacards on the same
+            # date, as the stable sort in Combiner does
+            keyed = sorted(
+                (
+                    (datacard.ordinal, row + i, datacard)
+                    for i, datacard in enumerate(datacards)
+                    if datacard.is_date_valid() and
+                    self.__type_adapter.in_required_types(datacard.event)
+                ),
+                key=lambda item: item[:2]
+            )
+            row += len(chunk)
+            run = f"{spill_path}/run{len(runs)}"
+            with open(run, 'wb') as spill:
+                for start in range(0, len(keyed),
+                                   StreamingCombiner._BLOCK_SIZE):
+                    pickle.dump(
+                        keyed[start:start + StreamingCombiner._BLOCK_SIZE],
+                        spill, protocol=pickle.HIGHEST_PROTOCOL
+                    )
+            runs.append(run)
+        self.__float_columns = [
+            column for column, kind in kinds.items()
+            if 'f' in kind and kind <= {'i', 'u', 'f'}
+        ]
+        # undeclared columns are aggregated by their type in the whole file,
+        # not in each batch
+        self.__aggregator = EventAggregator({
+            column: EventAggregator.default_aggregation(
+                'f' if kind <= set('biuf') else 'O'
+            )
+            for column, kind in kinds.items()
+            if column not in EventAggregator.SCHEMA and
+            column not in EXCLUDED_KEYS
+        })
+        return runs
+
+    @staticmethod
+    def __read_run(run):
+        """
+        Read a sorted run back one block at a time
+
+        Args:
+            run (str): Path of the sorted run
+
+        Yields:
+            tuple[int, int, DataCard]: Date ordinal, row number and datacard
+        """
+        with open(run, 'rb') as spill:
+            while True:
+                try:
+                    block = pickle.load(spill)
+                except EOFError:
+                    return
+                yield from block
+
+    @staticmethod
+    def __merge_runs(runs):
+        """
+        Merge the sorted runs into a single stream of datacards sorted by date
+
+        Args:
+            runs (list[str]): Paths of the sorted runs
+
+        Returns:
+            Iterator[DataCard]: Datacards sorted by date
+        """
+        merged = heapq.merge(
+            *(StreamingCombiner.__read_run(run) for run in runs),
+            key=lambda item: item[:2]
+        )
+        return (datacard for _, _, datacard in merged)
+
+    def __start_processing(self, datacards, output_path):
+        """
+        Combine the stream of datacards into events and write them as they
+        are closed
+
+        Args:
+            datacards (Iterator[DataCard]): Datacards sorted by date
+            output_path (str): Path of the CSV file the events are written to
+        """
+        splitter = EventSplitter(self.__type_adapter, self.__durations)
+        batch = []
+        with open(output_path, 'w', newline='') as output:
+            for event in splitter.split(datacards):
+                batch.append(event)
+                if len(batch) == StreamingCombiner._BATCH_SIZE:
+                    self.__write_batch(batch, output)
+                    batch = []
+            if batch or self.__events_count == 0:
+                self.__write_batch(batch, output)
+        self.__counters['fatal_failures'] = splitter.fatal_failures
+
+    def __write_batch(self, batch, output):
+        """
+        Append a batch of events to the output file
+
+        Args:
+            batch (list[Event]): Events
+            output (TextIO): Output file
+        """
+        df = self.__aggregator.aggregate_events(batch)
+        for column in self.__float_columns:
+            if column in df.columns:
+                df[column] = df[column].astype(float)
+        df.to_csv(output, index=False, header=self.__events_count == 0)
+        self.__events_count += len(batch)
+        if self.__on_batch is not None and len(df) > 0:
+            self.__on_batch(df)
+
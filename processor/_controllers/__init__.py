@@ -1,7 +1,9 @@
 from ._slice_controller import slice_controller
 from ._merge_controller import merge_controller
+from ._return_period_controller import return_period_controller
 
 __all__ = [
     "slice_controller",
     "merge_controller",
+    "return_period_controller",
 ]
@@ -1,11 +1,22 @@
+import json
+import os
+from collections import deque
+from contextlib import nullcontext
+
 import pandas as pd
 
-from .._utils import Directory, File
-from .._apps import Combiner
-from .._file_getters import MergeFileGetter, SubtypeFileGetter
+from .._utils import AsyncWriter, Directory, File, Manifest, ParquetStore, \
+    Prefetcher, Report, TaskPool, run_tasks
+from .._apps import Combiner, ColumnarCombiner, EventTypeAdapter, \
+    RecordCache, Slicer, SortedRecords, StreamingCombiner
+from .._models import EventBuilder, EventAggregator, SCHEMAS
+from .._file_getters import MergeFileGetter, SlicingFileGetter, \
+    SubtypeFileGetter
 
 __all__ = ['merge_controller']
 
+ENGINES = ['default', 'columnar', 'streaming']
+
 
 class MergeController:
     """A controller for merging data files from different countries.
@@ -13,53 +24,509 @@ class MergeController:
     Attributes:
         __output_folder (Directory | None): The output folder for merged files.
         __countries (list[Directory] | None): The countries to be merged.
-        __subtypes (dict | None): The subtypes of events to be merged.
+        __type_adapter (EventTypeAdapter | None): The subtype lookup built
+            once per run and shared by every country.
+        __engine (str): The merge engine, one of ENGINES.
+        __chunk_size (int): The number of records the streaming engine reads
+            at once.
+        __jobs (int | None): The number of processes merging countries.
+        __subtypes (dict | None): The subtype files, by event type.
+        __manifest (Manifest | None): The manifest used to skip countries
+            whose inputs have not changed.
+        __store (ParquetStore | None): The Parquet dataset the events are
+            also written to.
+        __sliced_folder (Directory | None): The folder the events are sliced
+            into as soon as they are merged, None if they are not.
+        __slice (bool): Whether the first 5% of the events of each type are
+            removed when they are sliced.
+        __write_events (bool): Whether the events are written to CSV files.
+        __writer (AsyncWriter | None): The writer of the events and sliced
+            files.
+        __report (Report | None): The report the metrics of each country are
+            added to.
+        __prefetcher (Prefetcher | None): The reader of the next records
+            while a country is merged.
+        __cache (RecordCache | None): The cache of the parsed records.
+        __fractions (list[float] | None): The fractions of the variants the
+            events are sliced into, None for one variant.
+        __durations (dict | None): The durations overriding the default
+            durations of some event types.
+        _SWEEP_AHEAD (int): The number of countries of a sweep whose
+            configurations are submitted to the pool before the results of
+            the first of them are collected, so the processes do not wait
+            for the slowest configuration of a country.
     """
+    _STAGE = "merge"
+    _SWEEP_STAGE = "merge_sweep"
+    _SWEEP_FOLDER_NAME = "merge_sweep"
+    _SWEEP_FILE_NAME = "configurations.json"
+    _SWEEP_AHEAD = 2
+
     def __init__(self):
         self.__output_folder: Directory | None = None
         self.__countries: list[Directory] | None = None
+        self.__type_adapter: EventTypeAdapter | None = None
+        self.__engine: str = 'default'
+        self.__chunk_size: int = 100_000
+        self.__jobs: int | None = 1
         self.__subtypes: dict | None = None
+        self.__manifest: Manifest | None = None
+        self.__store: ParquetStore | None = None
+        self.__sliced_folder: Directory | None = None
+        self.__slice: bool = True
+        self.__write_events: bool = True
+        self.__writer: AsyncWriter | None = None
+        self.__report: Report | None = None
+        self.__prefetcher: Prefetcher | None = None
+        self.__cache: RecordCache | None = None
+        self.__fractions: list[float] | None = None
+        self.__durations: dict | None = None
 
-    def start_merging(self, data_folder: Directory):
+    def start_merging(self, data_folder: Directory, engine='default', jobs=1,
+                      manifest: Manifest | None = None, chunk_size=100_000,
+                      store: ParquetStore | None = None, fuse_slice=False,
+                      write_events=True, writer: AsyncWriter | None = None,
+                      report: Report | None = None,
+                      countries: list[str] | None = None, _slice=True,
+                      prefetcher: Prefetcher | None = None,
+                      cache: RecordCache | None = None,
+                      fractions: list[float] | None = None,
+                      durations: dict | None = None):
         """Starts merging the files in the given folder.
 
         Args:
             data_folder (Directory): The folder containing the data files.
+            engine (str): 'default' to merge with Combiner, 'columnar' to
+                merge with ColumnarCombiner, or 'streaming' to merge with
+                StreamingCombiner. All of them give the same events.
+            jobs (int | None): The number of processes merging countries in
+                parallel. 1 merges them one by one, None uses every core.
+            manifest (Manifest | None): If given, countries whose records,
+                categorisations and parameters are unchanged are skipped, and
+                the merged countries are recorded in it.
+            chunk_size (int): The number of records the streaming engine reads
+                and sorts at once, which bounds its memory use.
+            store (ParquetStore | None): If given, the events are also written
+                to the events Parquet dataset.
+            fuse_slice (bool): Whether to slice the events of each country as
+                soon as they are merged, from memory, instead of in a separate
+                slice stage reading the events files back.
+            write_events (bool): Whether to write the events to CSV files.
+                Only used with fuse_slice, since the slice stage reads them.
+            writer (AsyncWriter | None): If given, the events and sliced files
+                are written in the background by it, except the events of the
+                streaming engine which are written while they are combined.
+                They are all written when this returns either way.
+            report (Report | None): If given, each country merged is measured
+                and its metrics and counters are added to it.
+            countries (list[str] | None): Glob patterns of the countries to
+                merge, matched against the record file names without
+                extension. Every country is merged if None.
+            _slice (bool): Whether fused slicing removes the first 5% of the
+                events of each type, like SliceController.start_slice.
+            prefetcher (Prefetcher | None): If given and countries are merged
+                one by one, the records of the next countries are read by it
+                while a country is merged. The streaming engine reads its
+                records in chunks, so it does not use it.
+            cache (RecordCache | None): If given, the records are read from
+                their parsed and sorted copies in it, which are written when
+                missing or out of date. Not used by the streaming engine.
+            fractions (list[float] | None): If given, fused slicing slices the
+                events with each fraction, like SliceController.start_slice.
+            durations (dict | None): The primary and secondary durations in
+                days of some event types, overriding EventBuilder.DURATIONS,
+                e.g. {'FLOODS': (3, 4)}.
+
+        Raises:
+            ValueError: If the engine is unknown or a duration is invalid.
         """
-        merge_file_getter = MergeFileGetter(data_folder)
+        if engine not in ENGINES:
+            raise ValueError(f'Unknown merge engine: {engine}')
+        self.__durations = EventBuilder.durations(durations)
+        self.__engine = engine
+        self.__chunk_size = chunk_size
+        self.__jobs = jobs
+        self.__manifest = manifest
+        self.__store = store
+        self.__write_events = write_events or not fuse_slice
+        self.__writer = writer
+        self.__report = report
+        self.__prefetcher = prefetcher if engine != 'streaming' else None
+        self.__cache = cache if engine != 'streaming' else None
+        self.__slice = _slice
+        self.__fractions = fractions
+        merge_file_getter = MergeFileGetter(data_folder, countries)
         subtype_file_getter = SubtypeFileGetter(data_folder)
         self.__output_folder = merge_file_getter.output_folder
         self.__countries = merge_file_getter.countries
         self.__subtypes = subtype_file_getter.subtypes
+        self.__type_adapter = EventTypeAdapter(self.__subtypes)
+        self.__sliced_folder = \
+            SlicingFileGetter(data_folder, _slice,
+                              sweep=fractions is not None).sliced_folder \
+            if fuse_slice else None
         self.__merge_for_all_countries()
 
     def __merge_for_all_countries(self):
-        for country in self.__countries:
-            self.__merge_for_one_country(country)
+        merger = _CountryMerger(self.__output_folder.get_path(),
+                                self.__type_adapter, self.__engine,
+                                self.__chunk_size, self.__store,
+                                self.__sliced_folder, self.__write_events,
+                                self.__writer, self.__slice, self.__cache,
+                                self.__fractions, self.__durations)
+        if self.__report is not None:
+            merger = self.__report.measure(merger, MergeController._STAGE)
+        if self.__manifest is None:
+            self.__run(merger, self.__countries)
+            return
+        params = self.__params()
+        inputs = {
+            country.get_filename(): self.__manifest.fingerprint(
+                [country.get_filepath()] +
+                [subtype.get_filepath() for subtype in self.__subtypes.values()]
+            )
+            for country in self.__countries
+        }
+        countries = [
+            country for country in self.__countries
+            if not self.__manifest.is_up_to_date(
+                MergeController._STAGE, country.get_filename(),
+                inputs[country.get_filename()], params
+            )
+        ]
+        outputs = self.__run(merger, countries)
+        for country, country_outputs in zip(countries, outputs):
+            self.__manifest.record(
+                MergeController._STAGE, country.get_filename(),
+                inputs[country.get_filename()], params, country_outputs
+            )
+
+    def __run(self, merger, countries):
+        """Merges the given countries and adds their metrics to the report.
+
+        Returns:
+            list[list[str]]: The paths of the files written for each country.
+        """
+        results = run_tasks(merger, countries, self.__jobs, self.__writer,
+                            self.__prefetcher)
+        if self.__report is not None:
+            for country, (_, metrics) in zip(countries, results):
+                self.__report.add_country(MergeController._STAGE,
+                                          country.get_filename(), metrics)
+        return [outputs for outputs, _ in results]
+
+    def start_sweep(self, data_folder: Directory, configurations: list[dict],
+                    engine='default', jobs=1,
+                    writer: AsyncWriter | None = None,
+                    report: Report | None = None,
+                    countries: list[str] | None = None,
+                    prefetcher: Prefetcher | None = None,
+                    cache: RecordCache | None = None):
+        """Merges the records with several configurations of the durations,
+        to compare them.
+
+        The records of each country are read, filtered and sorted by date
+        once, and every configuration is merged from them. When jobs is not
+        1, the configurations of every country are merged in one pool of
+        processes, the configurations of the next country starting while
+        the last ones of the previous country are merged. The events of
+        configuration i are written to merge_sweep/<i>/<country>.csv, and the
+        durations of every event type in each configuration to
+        merge_sweep/configurations.json.
+
+        Args:
+            data_folder (Directory): The folder containing the data files.
+            configurations (list[dict]): The durations overriding
+                EventBuilder.DURATIONS in each configuration, e.g.
+                [{'FLOODS': (3, 4)}, {'FLOODS': (7, 7)}].
+            engine (str): 'default' or 'columnar', see start_merging. The
+                streaming engine does not sort the records in memory, so it
+                cannot share them.
+            jobs (int | None): The number of processes merging the
+                configurations in parallel. 1 merges them one by one, None
+                uses every core.
+            writer (AsyncWriter | None): If given, the events are written in
+                the background by it.
+            report (Report | None): If given, each configuration of each
+                country is measured and added to it as <i>/<country>.
+            countries (list[str] | None): Glob patterns of the countries to
+                merge. Every country is merged if None.
+            prefetcher (Prefetcher | None): If given, the records of the next
+                countries are read by it while a country is merged.
+            cache (RecordCache | None): If given, the records are read from
+                their parsed and sorted copies in it.
+
+        Raises:
+            ValueError: If the engine is unknown or streaming, or a duration
+                is invalid.
+        """
+        if engine not in ENGINES:
+            raise ValueError(f'Unknown merge engine: {engine}')
+        if engine == 'streaming':
+            raise ValueError('The streaming engine cannot be used in a '
+                             'sweep.')
+        durations = [
+            EventBuilder.durations(configuration)
+            for configuration in configurations
+        ]
+        merge_file_getter = MergeFileGetter(data_folder, countries)
+        subtypes = SubtypeFileGetter(data_folder).subtypes
+        type_adapter = EventTypeAdapter(subtypes)
+        data_folder.create_subdirectory(MergeController._SWEEP_FOLDER_NAME)
+        sweep_folder = \
+            data_folder.find_directory(MergeController._SWEEP_FOLDER_NAME)
+        mergers = []
+        for i, configuration in enumerate(durations):
+            sweep_folder.create_subdirectory(str(i))
+            merger = _CountryMerger(f"{sweep_folder.get_path()}/{i}",
+                                    type_adapter, engine, self.__chunk_size,
+                                    None, writer=writer,
+                                    durations=configuration)
+            if report is not None:
+                merger = report.measure(merger, MergeController._SWEEP_STAGE)
+            mergers.append(merger)
+        with open(f"{sweep_folder.get_path()}/"
+                  f"{MergeController._SWEEP_FILE_NAME}", 'w') as file:
+            json.dump({str(i): configuration
+                       for i, configuration in enumerate(durations)},
+                      file, indent=1)
+        reader = _SweepTask(mergers, cache)
+        files = merge_file_getter.countries
+        records = prefetcher.map(reader.read, files) \
+            if prefetcher is not None \
+            else ((file, reader.read(file)) for file in files)
+        pending = deque()
+        with TaskPool(_SweepTask(mergers), jobs, writer) as pool:
+            for file, country_records in records:
+                pending.append((file, [
+                    pool.submit((file, country_records, i))
+                    for i in range(len(mergers))
+                ]))
+                while len(pending) > MergeController._SWEEP_AHEAD:
+                    MergeController.__collect(report, *pending.popleft())
+            while pending:
+                MergeController.__collect(report, *pending.popleft())
+
+    @staticmethod
+    def __collect(report: Report | None, file: File, futures: list):
+        """Waits for the configurations of a country in a sweep and adds
+        their metrics to the report."""
+        for i, future in enumerate(futures):
+            _, metrics = future.result()
+            if report is not None:
+                report.add_country(MergeController._SWEEP_STAGE,
+                                   f"{i}/{file.get_filename()}", metrics)
+
+    def __params(self):
+        """Returns the parameters the merged events depend on."""
+        return {
+            'durations': {
+                event_type: [
+                    EventBuilder.primary_duration(event_type,
+                                                  self.__durations),
+                    EventBuilder.secondary_duration(event_type,
+                                                    self.__durations)
+                ]
+                for event_type in self.__subtypes
+            },
+            'parquet': self.__store is not None,
+            'fused_slice': self.__sliced_folder is not None,
+            'slice': self.__slice,
+            'fractions': self.__fractions,
+            'write_events': self.__write_events,
+        }
+
+
+class _CountryMerger:
+    """Merges the records of one country into events and writes them, and
+    slices them if the slice stage is fused with the merge stage.
+
+    Only holds plain data, so it can be sent to the worker processes when
+    countries are merged in parallel.
+
+    Attributes:
+        __output_path (str): The path of the output folder.
+        __type_adapter (EventTypeAdapter): The subtype lookup.
+        __engine (str): The merge engine, one of ENGINES.
+        __chunk_size (int): The number of records the streaming engine reads
+            at once.
+        __store (ParquetStore | None): The Parquet dataset the events are
+            also written to.
+        __sliced_folder (Directory | None): The folder the events are sliced
+            into, None if they are not sliced.
+        __slice (bool): Whether the first 5% of the events of each type are
+            removed when they are sliced.
+        __write_events (bool): Whether the events are written to a CSV file.
+        __writer (AsyncWriter | None): The writer of the events and sliced
+            files.
+        __cache (RecordCache | None): The cache of the parsed records.
+        __fractions (list[float] | None): The fractions of the variants the
+            events are sliced into, None for one variant.
+        __durations (dict | None): The durations of every event type, the
+            default ones if None.
+    """
+    _DATASET = "events"
 
-    def __merge_for_one_country(self, file: File):
+    def __init__(self, output_path: str, type_adapter: EventTypeAdapter,
+                 engine: str, chunk_size: int, store: ParquetStore | None,
+                 sliced_folder: Directory | None = None, write_events=True,
+                 writer: AsyncWriter | None = None, _slice=True,
+                 cache: RecordCache | None = None,
+                 fractions: list[float] | None = None,
+                 durations: dict | None = None):
+        self.__output_path = output_path
+        self.__type_adapter = type_adapter
+        self.__engine = engine
+        self.__chunk_size = chunk_size
+        self.__store = store
+        self.__sliced_folder = sliced_folder
+        self.__write_events = write_events
+        self.__writer = writer
+        self.__slice = _slice
+        self.__cache = cache
+        self.__fractions = fractions
+        self.__durations = durations
+
+    def read(self, file: File) -> pd.DataFrame | SortedRecords:
+        """Reads the records of one country, from the cache if there is one,
+        so they can be read while another country is merged."""
+        if self.__cache is not None:
+            return self.__cache.read(file)
+        return SCHEMAS['records'].read(file.get_filepath(), 'merge')
+
+    def __call__(self, file: File,
+                 records: pd.DataFrame | SortedRecords | None = None):
+        """Merges one country.
+
+        Args:
+            file (File): The records of the country.
+            records (pd.DataFrame | SortedRecords | None): The records if they
+                are already read, read from the file or the cache if None. Not
+                used by the streaming engine.
+
+        Returns:
+            tuple[list[str], dict]: The paths of the files written, and the
+                counters of the combiner with the number of events.
+        """
         country = file.get_filename()
-        combiner = Combiner(file, self.__subtypes)
-        events = combiner.events
-        self.__write_results(country, events)
+        outputs = []
+        with self.__open_store(country) as store_writer:
+            if self.__engine == 'streaming':
+                df, counters = self.__merge_streaming(file, store_writer)
+            else:
+                if records is None and self.__cache is not None:
+                    records = self.__cache.read(file)
+                if self.__engine == 'columnar':
+                    combiner = ColumnarCombiner(file, self.__type_adapter,
+                                                records, self.__durations)
+                    df = combiner.events
+                else:
+                    combiner = Combiner(file, self.__type_adapter, records,
+                                        self.__durations)
+                    df = EventAggregator().aggregate_events(combiner.events)
+                counters = {**combiner.counters, 'events': len(df)}
+                if store_writer is not None:
+                    store_writer.write(df)
+                if self.__write_events:
+                    self.__write_results(country, df)
+        if self.__write_events:
+            outputs.append(f"{self.__output_path}/{country}")
+        if self.__sliced_folder is not None:
+            slicer = Slicer.from_events(
+                country.split(".")[0], df, self.__sliced_folder,
+                self.__slice, self.__store, self.__writer, self.__fractions
+            )
+            outputs += slicer.outputs
+            counters['rows_sliced'] = slicer.counters['rows_written']
+        return outputs, counters
+
+    def __merge_streaming(self, file: File, store_writer):
+        """Merges one country with StreamingCombiner, which writes the events
+        while they are combined.
+
+        Args:
+            file (File): The records of the country.
+            store_writer: The partition writer of the country, or None.
+
+        Returns:
+            tuple[pd.DataFrame | None, dict]: The events if they are sliced,
+                None otherwise, so they are never all held in memory, and the
+                counters of the combiner with the number of events.
+        """
+        batches = [] if self.__sliced_folder is not None else None
 
-    def __write_results(self, country, events):
-        """Writes the merged results to a CSV file.
+        def on_batch(df):
+            if store_writer is not None:
+                store_writer.write(df)
+            if batches is not None:
+                batches.append(df)
+
+        filepath = f"{self.__output_path}/{file.get_filename()}" \
+            if self.__write_events else os.devnull
+        combiner = StreamingCombiner(file, self.__type_adapter, filepath,
+                                     self.__chunk_size, on_batch=on_batch,
+                                     durations=self.__durations)
+        counters = {**combiner.counters, 'events': combiner.events_count}
+        if batches is None:
+            return None, counters
+        if not batches:
+            # noinspection PyTypeChecker
+            return pd.DataFrame.from_dict([]), counters
+        return pd.concat(batches, ignore_index=True), counters
+
+    def __open_store(self, country):
+        """Opens the partition of a country in the events Parquet dataset, or
+        does nothing if there is no store."""
+        if self.__store is None:
+            return nullcontext()
+        return self.__store.open(_CountryMerger._DATASET,
+                                 country.split(".")[0], 'event')
+
+    def __write_results(self, country, df):
+        """Writes the merged results to a CSV file, or hands them to the
+        writer.
 
         Args:
             country: The name of the country.
-            events: The merged events.
+            df: The merged events.
         """
-        filepath = f"{self.__output_folder.get_path()}/{country}"
-        contents = list(
-            map(
-                lambda event: event.as_dict(),
-                events
-            )
+        filepath = f"{self.__output_path}/{country}"
+        if self.__writer is not None:
+            self.__writer.write_csv(df, filepath)
+        else:
+            df.to_csv(filepath, index=False)
+
+
+class _SweepTask:
+    """Merges the records of a country, read once, with one configuration
+    of a sweep.
+
+    Sent to the worker processes once per worker when configurations are
+    merged in parallel, the records of each country being sent with each of
+    its configurations.
+
+    Attributes:
+        __mergers (list[_CountryMerger]): The merger of each configuration.
+        __cache (RecordCache | None): The cache of the parsed records.
+    """
+    def __init__(self, mergers: list, cache: RecordCache | None = None):
+        self.__mergers = mergers
+        self.__cache = cache
+
+    def read(self, file: File) -> SortedRecords:
+        """Reads the records of a country, filtered and sorted by date."""
+        if self.__cache is not None:
+            return self.__cache.read(file)
+        return SortedRecords.from_records(
+            SCHEMAS['records'].read(file.get_filepath(), 'merge')
         )
-        # noinspection PyTypeChecker
-        df = pd.DataFrame.from_dict(contents)
-        df.to_csv(filepath, index=False)
+
+    def __call__(self, item: tuple[File, SortedRecords, int]):
+        """Merges the records of a country with the configuration at the
+        given index and returns the paths of the files written and the
+        counters."""
+        file, records, configuration = item
+        return self.__mergers[configuration](file, records)
 
 
 merge_controller = MergeController()
@@ -0,0 +1,132 @@
+import os
+
+import pandas as pd
+
+from .._utils import Directory, Manifest, ParquetStore, Report
+from .._apps import ReturnPeriods
+from .._models import SCHEMAS
+from .._file_getters import ReturnPeriodFileGetter
+
+__all__ = ["return_period_controller"]
+
+
+class ReturnPeriodController:
+    """A controller computing the exceedance curves and return periods of the
+    sliced events of every country into one table.
+
+    Attributes:
+        __store (ParquetStore | None): The Parquet dataset the table is also
+            written to.
+        __report (Report | None): The report the counters of the stage are
+            added to.
+        __loss_columns (list[str] | None): The loss columns to compute curves
+            for, ReturnPeriods.LOSS_COLUMNS if None.
+
+    Methods:
+        start_return_periods(data_folder: Directory, _slice=True,
+            manifest=None, store=None, report=None, loss_columns=None):
+            Computes the return periods of the sliced events in the
+            data_folder.
+    """
+    _STAGE = "return_periods"
+
+    def __init__(self):
+        self.__store: ParquetStore | None = None
+        self.__report: Report | None = None
+        self.__loss_columns: list[str] | None = None
+
+    def start_return_periods(self, data_folder: Directory, _slice=True,
+                             manifest: Manifest | None = None,
+                             store: ParquetStore | None = None,
+                             report: Report | None = None,
+                             loss_columns: list[str] | None = None):
+        """Computes the return periods of the sliced events in the
+        data_folder and writes them to return_periods.csv in it.
+
+        Every country is always part of the table, whatever the countries
+        merged and sliced in the run.
+
+        Args:
+            data_folder (Directory): The data folder.
+            _slice (bool): Whether to use the sliced events, or the unsliced
+                ones written when the slice stage keeps every event.
+            manifest (Manifest | None): If given, nothing is done when the
+                sliced events and the parameters are unchanged since the
+                table was last written, and the table is recorded in it.
+            store (ParquetStore | None): If given, the table is also written
+                to the return_periods Parquet dataset, partitioned by country
+                and event type.
+            report (Report | None): If given, the number of countries, curves
+                and points is added to it.
+            loss_columns (list[str] | None): The loss columns to compute
+                curves for, ReturnPeriods.LOSS_COLUMNS if None.
+
+        Raises:
+            FileNotFoundError: If the events have not been sliced.
+        """
+        self.__store = store
+        self.__report = report
+        self.__loss_columns = loss_columns
+        file_getter = ReturnPeriodFileGetter(data_folder, _slice)
+        countries = file_getter.countries
+        output_path = file_getter.output_path
+        if manifest is None:
+            self.__compute(countries, output_path)
+            return
+        key = os.path.basename(output_path)
+        inputs = manifest.fingerprint([
+            file.get_filepath()
+            for country in countries for file in country.get_files()
+        ])
+        params = {
+            'slice': _slice,
+            'loss_columns': loss_columns,
+            'parquet': store is not None,
+        }
+        if manifest.is_up_to_date(ReturnPeriodController._STAGE, key, inputs,
+                                  params):
+            return
+        outputs = self.__compute(countries, output_path)
+        manifest.record(ReturnPeriodController._STAGE, key, inputs, params,
+                        outputs)
+
+    def __compute(self, countries: list[Directory], output_path: str):
+        """Computes the curves of every country and writes the table.
+
+        Returns:
+            list[str]: The paths of the files written.
+        """
+        return_periods = ReturnPeriods(self.__loss_columns)
+        for country in countries:
+            return_periods.add_country(country.get_dirname(), [
+                (file.get_filename().split(".")[0],
+                 ReturnPeriodController.__read(file.get_filepath()))
+                for file in country.get_files()
+            ])
+        table = return_periods.table()
+        table.to_csv(output_path, index=False)
+        if self.__store is not None:
+            for country, df in table.groupby('country', sort=False):
+                with self.__store.open(ReturnPeriodController._STAGE, country,
+                                       'event') as writer:
+                    writer.write(df.drop(columns='country'))
+        if self.__report is not None:
+            self.__report.add_counters(ReturnPeriodController._STAGE, {
+                'countries': len(countries),
+                'curves': return_periods.curves,
+                'points': len(table),
+            })
+        return [output_path]
+
+    @staticmethod
+    def __read(path: str) -> pd.DataFrame:
+        """Reads the sliced events of one type, an empty DataFrame if the
+        file has no columns."""
+        try:
+            return SCHEMAS['events'].read(path)
+        except pd.errors.EmptyDataError:
+            # noinspection PyTypeChecker
+            return pd.DataFrame.from_dict([])
+
+
+return_period_controller = ReturnPeriodController()
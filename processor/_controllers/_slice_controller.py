@@ -1,5 +1,9 @@
-from .._utils import Directory, File
+import pandas as pd
+
+from .._utils import AsyncWriter, Directory, File, Manifest, ParquetStore, \
+    Prefetcher, Report, run_tasks
 from .._apps import Slicer
+from .._models import SCHEMAS
 from .._file_getters import SlicingFileGetter
 
 __all__ = ["slice_controller"]
@@ -13,17 +17,47 @@ class SliceController:
             will be saved.
         __countries (list[File] | None): A list of files to be sliced.
         __slice (bool): A boolean to indicate whether to slice the files or not.
+        __jobs (int | None): The number of processes slicing files.
+        __manifest (Manifest | None): The manifest used to skip files that
+            have not changed.
+        __store (ParquetStore | None): The Parquet dataset the sliced files
+            are also written to.
+        __writer (AsyncWriter | None): The writer of the sliced files.
+        __report (Report | None): The report the metrics of each file are
+            added to.
+        __prefetcher (Prefetcher | None): The reader of the next events while
+            a file is sliced.
+        __fractions (list[float] | None): The fractions of the variants the
+            files are sliced into, None for one variant.
 
     Methods:
-        start_slice(data_folder: Directory, _slice=True): Start the slicing
-            process for the files in the data_folder.
+        start_slice(data_folder: Directory, _slice=True, jobs=1,
+            manifest=None, store=None, writer=None, report=None,
+            countries=None, prefetcher=None, fractions=None): Start the
+            slicing process for the files in the data_folder.
     """
+    _STAGE = "slice"
+
     def __init__(self):
         self.__sliced_folder: Directory | None = None
         self.__countries: list[File] | None = None
         self.__slice: bool = True
+        self.__jobs: int | None = 1
+        self.__manifest: Manifest | None = None
+        self.__store: ParquetStore | None = None
+        self.__writer: AsyncWriter | None = None
+        self.__report: Report | None = None
+        self.__prefetcher: Prefetcher | None = None
+        self.__fractions: list[float] | None = None
 
-    def start_slice(self, data_folder: Directory, _slice=True):
+    def start_slice(self, data_folder: Directory, _slice=True, jobs=1,
+                    manifest: Manifest | None = None,
+                    store: ParquetStore | None = None,
+                    writer: AsyncWriter | None = None,
+                    report: Report | None = None,
+                    countries: list[str] | None = None,
+                    prefetcher: Prefetcher | None = None,
+                    fractions: list[float] | None = None):
         """Starts the slicing process for the files in the data_folder.
 
         Args:
@@ -31,19 +65,140 @@ class SliceController:
                 sliced.
             _slice (bool): A boolean to indicate whether to slice the files or
                 not.
+            jobs (int | None): The number of processes slicing files in
+                parallel. 1 slices them one by one, None uses every core.
+            manifest (Manifest | None): If given, files that are unchanged
+                since they were last sliced are skipped, and the sliced files
+                are recorded in it.
+            store (ParquetStore | None): If given, the sliced files are also
+                written to a Parquet dataset.
+            writer (AsyncWriter | None): If given, the sliced files are
+                written in the background by it. They are all written when
+                this returns either way.
+            report (Report | None): If given, each file sliced is measured and
+                its metrics and counters are added to it.
+            countries (list[str] | None): Glob patterns of the countries to
+                slice, matched against the event file names without
+                extension. Every country is sliced if None.
+            prefetcher (Prefetcher | None): If given and files are sliced one
+                by one, the next files are read by it while a file is sliced.
+            fractions (list[float] | None): If given, each file is read and
+                split once and sliced with each fraction, removing that
+                fraction of the first events of each type, into
+                sliced_sweep/<fraction>. _slice is not used.
+
+        Raises:
+            ValueError: If a fraction is not between 0, included, and 1, or
+                is given twice.
         """
         self.__slice = _slice
-        file_getter = SlicingFileGetter(data_folder, _slice)
+        self.__jobs = jobs
+        self.__manifest = manifest
+        self.__store = store
+        self.__writer = writer
+        self.__report = report
+        self.__prefetcher = prefetcher
+        self.__fractions = fractions
+        file_getter = SlicingFileGetter(data_folder, _slice, countries,
+                                        fractions is not None)
         self.__sliced_folder = file_getter.sliced_folder
         self.__countries = file_getter.countries
         self.__slice_for_all_countries()
 
     def __slice_for_all_countries(self):
-        for country in self.__countries:
-            self.__slice_for_one_country(country)
+        slicer = _CountrySlicer(self.__sliced_folder, self.__slice,
+                                self.__store, self.__writer, self.__fractions)
+        if self.__report is not None:
+            slicer = self.__report.measure(slicer, SliceController._STAGE)
+        if self.__manifest is None:
+            self.__run(slicer, self.__countries)
+            return
+        # sliced and unsliced files are written to different folders
+        stage = self.__sliced_folder.get_dirname()
+        params = {'slice': self.__slice, 'parquet': self.__store is not None,
+                  'fractions': self.__fractions}
+        inputs = {
+            country.get_filename():
+                self.__manifest.fingerprint([country.get_filepath()])
+            for country in self.__countries
+        }
+        countries = [
+            country for country in self.__countries
+            if not self.__manifest.is_up_to_date(
+                stage, country.get_filename(), inputs[country.get_filename()],
+                params
+            )
+        ]
+        outputs = self.__run(slicer, countries)
+        for country, country_outputs in zip(countries, outputs):
+            self.__manifest.record(stage, country.get_filename(),
+                                   inputs[country.get_filename()], params,
+                                   country_outputs)
+
+    def __run(self, slicer, countries):
+        """Slices the given files and adds their metrics to the report.
+
+        Returns:
+            list[list[str]]: The paths of the files written for each file.
+        """
+        results = run_tasks(slicer, countries, self.__jobs, self.__writer,
+                            self.__prefetcher)
+        if self.__report is not None:
+            for country, (_, metrics) in zip(countries, results):
+                self.__report.add_country(SliceController._STAGE,
+                                          country.get_filename(), metrics)
+        return [outputs for outputs, _ in results]
+
+
+class _CountrySlicer:
+    """Slices the events of one country.
+
+    Sent to the worker processes when files are sliced in parallel.
+
+    Attributes:
+        __sliced_folder (Directory): The directory where sliced files will be
+            saved.
+        __slice (bool): A boolean to indicate whether to slice the files or not.
+        __store (ParquetStore | None): The Parquet dataset the sliced files
+            are also written to.
+        __writer (AsyncWriter | None): The writer of the sliced files.
+        __fractions (list[float] | None): The fractions of the variants, None
+            for one variant.
+    """
+    def __init__(self, sliced_folder: Directory, _slice: bool,
+                 store: ParquetStore | None, writer: AsyncWriter | None,
+                 fractions: list[float] | None = None):
+        self.__sliced_folder = sliced_folder
+        self.__slice = _slice
+        self.__store = store
+        self.__writer = writer
+        self.__fractions = fractions
+
+    @staticmethod
+    def read(country: File) -> pd.DataFrame:
+        """Reads the events of one country, so they can be read while another
+        country is sliced. A file without events gives a DataFrame without
+        columns."""
+        try:
+            return SCHEMAS['events'].read(country.get_filepath())
+        except pd.errors.EmptyDataError:
+            # noinspection PyTypeChecker
+            return pd.DataFrame.from_dict([])
 
-    def __slice_for_one_country(self, country: File):
-        Slicer(country, self.__sliced_folder, self.__slice)
+    def __call__(self, country: File, events: pd.DataFrame | None = None):
+        """Slices one country and returns the paths of the files written and
+        the counters of the slicer. The events are read from the file if they
+        are not given."""
+        if events is None:
+            slicer = Slicer(country, self.__sliced_folder, self.__slice,
+                            self.__store, self.__writer, self.__fractions)
+        else:
+            slicer = Slicer.from_events(
+                country.get_filename().split(".")[0], events,
+                self.__sliced_folder, self.__slice, self.__store,
+                self.__writer, self.__fractions
+            )
+        return slicer.outputs, slicer.counters
 
 
 slice_controller = SliceController()
@@ -1,8 +1,10 @@
+import os
+
 import pandas as pd
 
 from ._emdat_file_getter import EMDATFileGetter
 from ._splitter import EMDATSplitter
-from .._utils import Directory
+from .._utils import AsyncWriter, Directory, Manifest, ParquetStore, Report
 
 __all__ = ["emdat_controller"]
 
@@ -19,43 +21,108 @@ class EMDATController:
             types and dataframes.
 
     Methods:
-        start(data_folder: Directory) -> None: Start the splitting and writing
-            processed data for the given data folder.
+        start_emdat(data_folder: Directory, manifest=None, store=None,
+            writer=None, report=None) -> None:
+            Start the splitting and writing processed data for the given data
+            folder.
 
     Note:
         This class depends on the following modules: pandas,
             ._emdat_file_getter, and ._splitter.
     """
+    _STAGE = "emdat"
+
     def __init__(self):
         self.__data: pd.DataFrame | None = None
         self.__output_folder: Directory | None = None
         self.__split_data: dict[str, dict[str, pd.DataFrame]] | None = None
+        self.__store: ParquetStore | None = None
+        self.__writer: AsyncWriter | None = None
+        self.__report: Report | None = None
 
-    def start(self, data_folder: Directory):
+    def start_emdat(self, data_folder: Directory,
+                    manifest: Manifest | None = None,
+                    store: ParquetStore | None = None,
+                    writer: AsyncWriter | None = None,
+                    report: Report | None = None):
         """Start the splitting and writing process for the given data folder.
 
         Args:
             data_folder: The directory where the EM-DAT data is located.
+            manifest: If given, nothing is done when the EM-DAT data is
+                unchanged since it was last split, and the split files are
+                recorded in it.
+            store: If given, the split data is also written to the emdat
+                Parquet dataset.
+            writer: If given, the split files are written in the background
+                by it. They are all written when this returns either way.
+            report: If given, the number of rows read and written is added to
+                it.
         """
+        self.__store = store
+        self.__writer = writer
+        self.__report = report
         file_getter = EMDATFileGetter(data_folder)
-        self.__data = file_getter.data
         self.__output_folder = file_getter.output_folder
+        if manifest is None:
+            self.__split(file_getter.data)
+            return
+        key = os.path.basename(file_getter.data_path)
+        inputs = manifest.fingerprint([file_getter.data_path])
+        params = {'parquet': store is not None}
+        if manifest.is_up_to_date(EMDATController._STAGE, key, inputs, params):
+            return
+        outputs = self.__split(file_getter.data)
+        manifest.record(EMDATController._STAGE, key, inputs, params, outputs)
+
+    def __split(self, data: pd.DataFrame):
+        """Split the EM-DAT data and write the results.
+
+        Args:
+            data: The EM-DAT data.
+
+        Returns:
+            list[str]: The paths of the files written.
+        """
+        self.__data = data
         splitter = EMDATSplitter(self.__data)
         self.__split_data = splitter.data
-        self.__write_results()
+        outputs = self.__write_results()
+        if self.__report is not None:
+            self.__report.add_counters(EMDATController._STAGE, {
+                'rows_read': len(data),
+                'rows_written': sum(
+                    len(df) for events in self.__split_data.values()
+                    for df in events.values()
+                ),
+            })
+        return outputs
 
     def __write_results(self):
-        """Write the split data to separate CSV files."""
+        """Write the split data to separate CSV files.
+
+        Returns:
+            list[str]: The paths of the files written.
+        """
+        outputs = []
         for country, events in self.__split_data.items():
             self.__output_folder.create_subdirectory(country)
             country_folder = self.__output_folder.find_directory(country)
             for event, df in events.items():
-                df.sort_values(by=['Start Year', 'Start Month', 'Start Day'],
-                               na_position='first', inplace=True)
-                df.dropna(subset=['Start Year', 'Start Month', 'Start Day'],
-                          inplace=True)
-                df.to_csv(f"{country_folder.get_path()}/"
-                          f"{event}.csv", index=False)
+                filepath = f"{country_folder.get_path()}/{event}.csv"
+                if self.__writer is not None:
+                    self.__writer.write_csv(df, filepath)
+                else:
+                    df.to_csv(filepath, index=False)
+                outputs.append(filepath)
+            if self.__store is not None:
+                with self.__store.open(EMDATController._STAGE, country,
+                                       'Disaster Type') as writer:
+                    for df in events.values():
+                        writer.write(df)
+        if self.__writer is not None:
+            self.__writer.flush()
+        return outputs
 
 
 emdat_controller = EMDATController()
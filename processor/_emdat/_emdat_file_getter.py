@@ -1,5 +1,6 @@
 import pandas as pd
 
+from .._models import SCHEMAS
 from .._utils import Directory
 
 __all__ = ["EMDATFileGetter"]
@@ -16,8 +17,10 @@ class EMDATFileGetter:
             EM-DAT dataset file.
         __output_folder (Directory): A private attribute representing the
             directory object where _FOLDER_NAME indicated.
-        __data (pd.DataFrame): A private attribute representing the EM-DAT
-            dataset loaded from the disk.
+        __data_path (str): A private attribute representing the path of the
+            EM-DAT dataset file.
+        __data (pd.DataFrame | None): A private attribute representing the
+            EM-DAT dataset loaded from the disk, read on first access.
 
     Args:
         data_folder (Directory): A Directory object representing the directory
@@ -25,6 +28,8 @@ class EMDATFileGetter:
 
     Properties:
         data (pd.DataFrame): A property representing the loaded EM-DAT dataset.
+        data_path (str): A property representing the path of the EM-DAT
+            dataset file.
         output_folder (Directory): A property representing the directory
             where _FOLDER_NAME indicated.
 
@@ -42,20 +47,33 @@ class EMDATFileGetter:
         """
         self.__output_folder = \
             data_folder.find_directory(EMDATFileGetter._FOLDER_NAME)
-        data_path = f"{self.__output_folder.get_path()}/" \
-                    f"{EMDATFileGetter._FILE_NAME}"
-        self.__data = pd.read_csv(data_path)
+        self.__data_path = f"{self.__output_folder.get_path()}/" \
+                           f"{EMDATFileGetter._FILE_NAME}"
+        self.__data: pd.DataFrame | None = None
 
     @property
     def data(self) -> pd.DataFrame:
         """
-        A property representing the loaded EM-DAT dataset.
+        A property representing the loaded EM-DAT dataset. The dataset is read
+        the first time it is accessed.
 
         Returns:
             pd.DataFrame: The EM-DAT dataset loaded from the disk.
         """
+        if self.__data is None:
+            self.__data = SCHEMAS['emdat'].read(self.__data_path)
         return self.__data
 
+    @property
+    def data_path(self) -> str:
+        """
+        A property representing the path of the EM-DAT dataset file.
+
+        Returns:
+            str: The path of the EM-DAT dataset file.
+        """
+        return self.__data_path
+
     @property
     def output_folder(self) -> Directory:
         """
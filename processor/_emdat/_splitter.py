@@ -2,11 +2,18 @@ import pandas as pd
 
 __all__ = ['EMDATSplitter']
 
+REQUIRED_EVENTS = ['Storm', 'Flood', 'Earthquake']
+DATE_COLUMNS = ['Start Year', 'Start Month', 'Start Day']
+
 
 class EMDATSplitter:
     """A class for splitting a pandas DataFrame into a dictionary of DataFrames
     based on the country and the disaster type.
 
+    The disasters without a full start date are dropped and the rest are
+    sorted by start date once, then split by country and disaster type in a
+    single group-by, so each DataFrame is in start date order.
+
     Attributes:
         __data (dict): A dictionary of DataFrames where the keys are country
             names and the values are dictionaries of DataFrames where the keys
@@ -28,22 +35,27 @@ class EMDATSplitter:
         self.__start()
 
     def __start(self):
-        """Splits the DataFrame based on the country name."""
-        countries = self.__df['Country'].unique()
-        for country in countries:
-            self.__data[country] = self.__df[self.__df['Country'] == country]
-
-        self.__split()
-
-    def __split(self):
-        """Splits the DataFrames for each country based on the disaster type."""
-        for country, df in self.__data.items():
-            required_events = ['Storm', 'Flood', 'Earthquake']
-            events = {
-                event: df[df['Disaster Type'] == event]
-                for event in required_events
+        """Splits the DataFrame based on the country and the disaster type."""
+        # every country gets a file per disaster type, even if it has no
+        # disasters of that type with a start date
+        countries = self.__df['Country'].dropna().unique()
+        df = self.__df.dropna(subset=DATE_COLUMNS)
+        df = df[df['Disaster Type'].isin(REQUIRED_EVENTS)]
+        # a stable sort, so disasters starting on the same date keep their
+        # order in the file
+        df = df.sort_values(by=DATE_COLUMNS, kind='stable')
+        groups = dict(tuple(
+            df.groupby(['Country', 'Disaster Type'], sort=False,
+                       observed=True)
+        ))
+        empty = df.iloc[:0]
+        self.__data = {
+            country: {
+                event: groups.get((country, event), empty)
+                for event in REQUIRED_EVENTS
             }
-            self.__data[country] = events
+            for country in countries
+        }
 
     @property
     def data(self):
@@ -1,9 +1,11 @@
 from ._slicing_file_getter import SlicingFileGetter
 from ._merge_file_getter import MergeFileGetter
 from ._subtype_file_getter import SubtypeFileGetter
+from ._return_period_file_getter import ReturnPeriodFileGetter
 
 __all__ = [
     "SlicingFileGetter",
     "MergeFileGetter",
     "SubtypeFileGetter",
+    "ReturnPeriodFileGetter",
 ]
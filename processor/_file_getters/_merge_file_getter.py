@@ -22,6 +22,9 @@ class MergeFileGetter:
     Args:
         data_folder (Directory): A Directory object representing the directory
             where the record files are located.
+        countries (list[str] | None): Glob patterns of the countries to merge,
+            matched against the record file names without extension. Every
+            country is merged if None.
 
     Properties:
         countries (list): A property representing the list of countries where
@@ -33,13 +36,16 @@ class MergeFileGetter:
     _RECORD_FOLDER_NAME = "records"
     _EVENT_FOLDER_NAME = "events"
 
-    def __init__(self, data_folder: Directory):
+    def __init__(self, data_folder: Directory,
+                 countries: list[str] | None = None):
         """
         Constructor of the MergeFileGetter class.
 
         Args:
             data_folder (Directory): A Directory object representing the
                 directory where the record files are located.
+            countries (list[str] | None): Glob patterns of the countries to
+                merge. Every country is merged if None.
         """
         self.__record_folder = \
             data_folder.find_directory(
@@ -52,7 +58,9 @@ class MergeFileGetter:
             data_folder.find_directory(
                 MergeFileGetter._EVENT_FOLDER_NAME
             )
-        self.__countries = self.__record_folder.get_files()
+        self.__countries = self.__record_folder.get_files() \
+            if countries is None \
+            else self.__record_folder.find_files(countries)
 
     @property
     def countries(self):
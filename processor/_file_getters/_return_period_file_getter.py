@@ -0,0 +1,59 @@
+from .._utils import Directory
+
+__all__ = ["ReturnPeriodFileGetter"]
+
+
+class ReturnPeriodFileGetter:
+    """
+    A class that retrieves the sliced or unsliced events of each country and
+    the path of the table of their return periods.
+
+    Attributes:
+        _OUTPUT_FILE_NAME (str): The name of the file the return periods are
+            written to, in the data folder.
+        __countries (list[Directory]): The folders of the sliced events of
+            each country.
+        __output_path (str): The path of the return periods file.
+
+    Args:
+        data_folder (Directory): The data folder.
+        _slice (bool): Whether to read the sliced events, in
+            sliced_data_sheets, or the unsliced ones, in
+            unsliced_data_sheets. Default value is True.
+    """
+    _OUTPUT_FILE_NAME = "return_periods.csv"
+
+    def __init__(self, data_folder: Directory, _slice=True):
+        sliced_folder_name = "sliced_data_sheets" if _slice \
+            else "unsliced_data_sheets"
+        sliced_folder = data_folder.find_directory(sliced_folder_name)
+        if sliced_folder is None:
+            raise FileNotFoundError(
+                f'No {sliced_folder_name} folder in {data_folder.get_path()}, '
+                f'run the slice stage first.'
+            )
+        self.__countries = sliced_folder.get_directories()
+        self.__output_path = \
+            f"{data_folder.get_path()}/" \
+            f"{ReturnPeriodFileGetter._OUTPUT_FILE_NAME}"
+
+    @property
+    def countries(self):
+        """
+        Returns the folders of the sliced events of each country.
+
+        Returns:
+            list[Directory]: One folder per country, holding one file per
+                event type.
+        """
+        return self.__countries
+
+    @property
+    def output_path(self):
+        """
+        Returns the path of the return periods file.
+
+        Returns:
+            str: The path of the file.
+        """
+        return self.__output_path
@@ -24,6 +24,11 @@ class SlicingFileGetter:
             where the event files are located.
         _slice (bool): A private boolean attribute representing whether to
             slice the files or not. Default value is True.
+        countries (list[str] | None): Glob patterns of the countries to slice,
+            matched against the event file names without extension. Every
+            country is sliced if None.
+        sweep (bool): Whether the events are sliced with several fractions,
+            into the sliced_sweep folder. Default value is False.
 
     Properties:
         countries (list): A property representing the list of countries where
@@ -34,7 +39,8 @@ class SlicingFileGetter:
     """
     _EVENT_FOLDER_NAME = "events"
 
-    def __init__(self, data_folder: Directory, _slice=True):
+    def __init__(self, data_folder: Directory, _slice=True,
+                 countries: list[str] | None = None, sweep=False):
         """
         Constructor of the SlicingFileGetter class.
 
@@ -43,13 +49,27 @@ class SlicingFileGetter:
                 directory where the event files are located.
             _slice (bool): A private boolean attribute representing whether to
                 slice the files or not. Default value is True.
+            countries (list[str] | None): Glob patterns of the countries to
+                slice. Every country is sliced if None.
+            sweep (bool): Whether the events are sliced with several
+                fractions, into the sliced_sweep folder.
+
+        Raises:
+            FileNotFoundError: If the events have not been merged.
         """
         sliced_folder_name = "sliced_data_sheets" if _slice \
             else "unsliced_data_sheets"
+        if sweep:
+            sliced_folder_name = "sliced_sweep"
         self.__event_folder = \
             data_folder.find_directory(
                 SlicingFileGetter._EVENT_FOLDER_NAME
             )
+        if self.__event_folder is None:
+            raise FileNotFoundError(
+                f'No {SlicingFileGetter._EVENT_FOLDER_NAME} folder in '
+                f'{data_folder.get_path()}, run the merge stage first.'
+            )
         data_folder.create_subdirectory(
             sliced_folder_name
         )
@@ -57,7 +77,9 @@ class SlicingFileGetter:
             data_folder.find_directory(
                 sliced_folder_name
             )
-        self.__countries = self.__event_folder.get_files()
+        self.__countries = self.__event_folder.get_files() \
+            if countries is None \
+            else self.__event_folder.find_files(countries)
 
     @property
     def countries(self):
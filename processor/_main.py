@@ -1,10 +1,8 @@
-import time
+from contextlib import nullcontext
 
 from ._utils import Directory
-from ._controllers import slice_controller, merge_controller
-from ._emdat import emdat_controller
 
-__all__ = ['set_data_dir', 'process']
+__all__ = ['set_data_dir', 'process', 'query']
 
 _data_dir: Directory | None = None
 
@@ -15,15 +13,250 @@ def set_data_dir(data_dir):
     _data_dir = Directory(data_dir)
 
 
-def process(option):
-    """Process the data in the data directory."""
+def process(option, jobs=1, incremental=False, parquet=False, report=False,
+            trace_memory=False, profile_dir=None, countries=None):
+    """Process the data in the data directory.
+
+    Args:
+        option (dict): The stages to run, see README.md.
+        jobs (int | None): The number of processes merging and slicing
+            countries in parallel. 1 processes them one by one, None uses
+            every core.
+        incremental (bool): Whether to skip the countries and stages whose
+            inputs are unchanged since the last incremental run, according to
+            the manifest in the data directory, and to update it. Other runs
+            do not hash their inputs and remove the manifest, since their
+            outputs are not recorded in it.
+        parquet (bool): Whether to also write the output of each stage to a
+            Parquet dataset partitioned by country and event type, in the
+            parquet folder of the data directory. Requires pyarrow.
+        report (bool | str): Whether to measure the run. If it is a path, the
+            report is also written to it as JSON.
+        trace_memory (bool): Whether to add the peak memory of each stage and
+            country to the report, traced with tracemalloc. Implies report.
+        profile_dir (str | None): If given, each stage is profiled with
+            cProfile and its profile is written to <profile_dir>/<stage>.prof.
+            Implies report.
+        countries (list[str] | None): Glob patterns of the DesInventar
+            countries to merge and slice, matched against the file names
+            without extension, e.g. ['Nepal', 'S*']. Every country is
+            processed if None. EM-DAT data is always split as a whole.
+
+    Returns:
+        dict | None: The report of the run if it is measured, see README.md,
+            None otherwise.
+
+    Raises:
+        ValueError: If no data directory is set, the options conflict, or a
+            folder read by one of the stages is missing from the data
+            directory.
+    """
     if _data_dir is None:
         raise ValueError('No data directory set.')
-    if option['desinventar']['merge']:
-        merge_controller.start_merging(_data_dir)
-        _data_dir.update()
-    if option['desinventar']['slice']:
-        slice_controller.start_slice(_data_dir)
-        _data_dir.update()
+    _check_inputs(option)
+    # the stages import pandas and the profilers, which is slow, so they are
+    # only imported when the data is processed
+    import tracemalloc
+    from ._utils import AsyncWriter, Manifest, ParquetStore, Prefetcher, \
+        Report
+    from ._apps import RecordCache
+    from ._controllers import slice_controller, merge_controller, \
+        return_period_controller
+    from ._emdat import emdat_controller
+    from ._models import EventBuilder
+
+    if incremental:
+        manifest = Manifest(_data_dir)
+    else:
+        manifest = None
+        Manifest.discard(_data_dir)
+    store = ParquetStore(_data_dir) if parquet else None
+    run_report = Report(trace_memory, profile_dir) \
+        if report or trace_memory or profile_dir is not None else None
+    tracing = tracemalloc.is_tracing()
+    desinventar = option['desinventar']
+    # merged events are sliced from memory instead of being read back
+    fused = desinventar['merge'] and desinventar['slice'] and \
+        desinventar.get('fused', False)
+    # the unsliced events are written to the unsliced_data_sheets folder
+    _slice = not desinventar.get('unsliced', False)
+    # the events are sliced with each fraction into the sliced_sweep folder
+    fractions = desinventar.get('slice_fractions')
+    if fractions is not None and desinventar.get('return_periods', False):
+        raise ValueError('Return periods are computed from the sliced data '
+                         'sheets, not from a slice sweep.')
+    # the durations are checked before any stage starts
+    EventBuilder.durations(desinventar.get('durations'))
+    sweep = desinventar.get('sweep')
+    if sweep is not None and not isinstance(sweep, list):
+        raise ValueError(f'Invalid sweep: {sweep!r}, expected a list of '
+                         f'durations')
+    for configuration in sweep or []:
+        EventBuilder.durations(configuration)
+    # the next countries are read while one is processed
+    prefetch = desinventar.get('prefetch', 2)
+    prefetcher = Prefetcher(
+        ahead=prefetch,
+        max_bytes=desinventar.get('prefetch_memory', 256 << 20)
+    ) if prefetch > 0 else None
+    cache_dir = desinventar.get('cache_dir')
+    cache = RecordCache(cache_dir) if cache_dir is not None else None
+
+    def save_manifest():
+        if manifest is not None:
+            manifest.save()
+
+    def stage(name, profile=False):
+        if run_report is None:
+            return nullcontext()
+        return run_report.stage(name, profile)
+
+    # output files are written in the background while the next country is
+    # processed, each stage returns once its files are written
+    try:
+        with AsyncWriter() as writer:
+            if desinventar['merge']:
+                with stage('merge'):
+                    merge_controller.start_merging(
+                        _data_dir,
+                        engine=desinventar.get('engine', 'default'),
+                        jobs=jobs,
+                        manifest=manifest,
+                        chunk_size=desinventar.get('chunk_size', 100_000),
+                        store=store,
+                        fuse_slice=fused,
+                        write_events=desinventar.get('write_events', True),
+                        writer=writer,
+                        report=run_report,
+                        countries=countries,
+                        _slice=_slice,
+                        prefetcher=prefetcher,
+                        cache=cache,
+                        fractions=fractions,
+                        durations=desinventar.get('durations'),
+                    )
+                save_manifest()
+                _data_dir.update()
+            if desinventar.get('sweep'):
+                with stage('merge_sweep'):
+                    merge_controller.start_sweep(
+                        _data_dir, desinventar['sweep'],
+                        engine=desinventar.get('engine', 'default'),
+                        jobs=jobs,
+                        writer=writer,
+                        report=run_report,
+                        countries=countries,
+                        prefetcher=prefetcher,
+                        cache=cache,
+                    )
+                _data_dir.update()
+            if desinventar['slice'] and not fused:
+                with stage('slice'):
+                    slice_controller.start_slice(
+                        _data_dir,
+                        _slice=_slice,
+                        jobs=jobs,
+                        manifest=manifest,
+                        store=store,
+                        writer=writer,
+                        report=run_report,
+                        countries=countries,
+                        prefetcher=prefetcher,
+                        fractions=fractions,
+                    )
+                save_manifest()
+                _data_dir.update()
+            if desinventar.get('return_periods', False):
+                with stage('return_periods', profile=True):
+                    return_period_controller.start_return_periods(
+                        _data_dir,
+                        _slice=_slice,
+                        manifest=manifest,
+                        store=store,
+                        report=run_report,
+                        loss_columns=desinventar.get('loss_columns'),
+                    )
+                save_manifest()
+            if option['emdat']['process']:
+                # EM-DAT is split in this process, so it is profiled here
+                with stage('emdat', profile=True):
+                    emdat_controller.start_emdat(
+                        _data_dir,
+                        manifest=manifest,
+                        store=store,
+                        writer=writer,
+                        report=run_report,
+                    )
+                save_manifest()
+    finally:
+        if not tracing and tracemalloc.is_tracing():
+            tracemalloc.stop()
+    if run_report is None:
+        return None
+    if isinstance(report, str):
+        run_report.write(report)
+    return run_report.as_dict()
+
+
+def _check_inputs(option):
+    """Checks that the data directory has the folders read by the stages to
+    run, before any of them starts.
+
+    Raises:
+        ValueError: If a folder is missing.
+    """
+    desinventar = option['desinventar']
+    sliced_folder = 'unsliced_data_sheets' \
+        if desinventar.get('unsliced', False) else 'sliced_data_sheets'
+    inputs = []
+    if desinventar['merge']:
+        inputs.append(('merge', ['records', 'categorizations']))
+    if desinventar.get('sweep'):
+        inputs.append(('merge_sweep', ['records', 'categorizations']))
+    # the output of a stage run in the same call is there once it has run
+    if desinventar['slice'] and not desinventar['merge']:
+        inputs.append(('slice', ['events']))
+    if desinventar.get('return_periods', False) and not desinventar['slice']:
+        inputs.append(('return_periods', [sliced_folder]))
     if option['emdat']['process']:
-        emdat_controller.start_emdat(_data_dir)
+        inputs.append(('emdat', ['emdat']))
+    for stage, folders in inputs:
+        for folder in folders:
+            if _data_dir.find_directory(folder) is None:
+                raise ValueError(
+                    f'No {folder} folder in {_data_dir.get_path()}, needed '
+                    f'by the {stage} stage.'
+                )
+
+
+def query(country, event_type, start=None, end=None, dataset='events'):
+    """Query the disasters of one type in a country starting between two
+    dates, through the index of the country instead of its whole files.
+
+    The index of the country is built by the first query on it, and built
+    again if its files have changed since.
+
+    Args:
+        country (str): The name of the country, as in the file names of the
+            dataset.
+        event_type (str): The event type, e.g. 'FLOODS' for events or 'Flood'
+            for EM-DAT.
+        start: The first start date, included, as a string such as
+            '2000-01-01' or a date. No lower bound if None.
+        end: The last start date, included. No upper bound if None.
+        dataset (str): 'events' for the merged events, or 'emdat' for the
+            split EM-DAT data.
+
+    Returns:
+        pd.DataFrame: The matching rows, by start date.
+
+    Raises:
+        ValueError: If no data directory is set, the dataset is unknown or
+            the country has no files in it.
+    """
+    if _data_dir is None:
+        raise ValueError('No data directory set.')
+    from ._apps import EventIndex
+
+    return EventIndex(_data_dir.get_path()).query(dataset, country,
+                                                  event_type, start, end)
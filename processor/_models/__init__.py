@@ -1,9 +1,14 @@
 from ._event import Event
-from ._event_builder import EventBuilder
+from ._event_builder import EventBuilder, EXCLUDED_KEYS
 from ._data_card import DataCard
+from ._event_aggregator import EventAggregator
+from ._schemas import SCHEMAS
 
 __all__ = [
     "Event",
     "EventBuilder",
+    "EXCLUDED_KEYS",
     "DataCard",
+    "EventAggregator",
+    "SCHEMAS",
 ]
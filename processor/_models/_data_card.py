@@ -1,29 +1,134 @@
 from datetime import date
 
+import numpy as np
+import pandas as pd
+
 __all__ = ['DataCard']
 
 
 class DataCard:
-    def __init__(self, record: dict):
-        self.date: str | None = None
-        self.event: str | None = None
-        self.__dict__ = record
+    """A single DesInventar record.
 
-    def is_date_valid(self):
-        year, month, day = self.__split_date()
-        try:
-            date(year, month, day)
-            return True
-        except ValueError:
-            return False
+    The date is parsed once into a day ordinal when the card is built. The
+    loss columns of a card are stored as a tuple of values whose column names
+    are given by a layout shared by every card read from the same file.
+
+    Attributes:
+        event (str | None): The event type of the record.
+        date (str | None): The date of the record, as d/m/Y.
+        ordinal (int | None): The proleptic Gregorian ordinal of the date, or
+            None if the date is invalid.
+        EPOCH_ORDINAL (int): The ordinal of 1970-01-01, the day 0 of
+            datetime64[D].
+        layout (tuple[str, ...]): The names of the loss columns.
+        values (tuple): The values of the loss columns.
+    """
+    __slots__ = ('event', 'date', 'ordinal', 'layout', 'values')
+    EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+    def __init__(self, event, date_string: str, layout: tuple, values: tuple,
+                 ordinal: int | None = None):
+        self.event = event
+        self.date = date_string
+        self.ordinal = DataCard.__parse_date(date_string) if ordinal is None \
+            else ordinal
+        self.layout = layout
+        self.values = values
+
+    @staticmethod
+    def from_dataframe(df: pd.DataFrame, excluded: list[str],
+                       ordinals: np.ndarray | None = None):
+        """Builds one DataCard per row of a DataFrame of records.
+
+        Args:
+            df (pd.DataFrame): The records.
+            excluded (list[str]): The columns that are not loss columns.
+            ordinals (np.ndarray | None): The ordinal of the date of each
+                record if the dates are already parsed and all valid. The
+                dates are parsed if None.
+
+        Returns:
+            list[DataCard]: The DataCards, in the order of the rows.
+        """
+        layout = tuple(c for c in df.columns if c not in excluded)
+        columns = [df[c].tolist() for c in layout]
+        values = zip(*columns) if columns else ((),) * len(df)
+        ordinals = [None] * len(df) if ordinals is None else ordinals.tolist()
+        return [
+            DataCard(event, date_string, layout, row, ordinal)
+            for event, date_string, row, ordinal in zip(
+                df['event'].tolist(), df['date'].tolist(), values, ordinals
+            )
+        ]
+
+    @staticmethod
+    def parse_dates(column: pd.Series):
+        """Parses d/m/Y strings into datetime64 and marks the invalid ones,
+        like the dates of DataCards are parsed.
 
-    def __split_date(self):
-        day_month_year = self.date.split('/')
+        Args:
+            column (pd.Series): Column of d/m/Y strings
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Parsed dates and validity mask
+        """
+        parts = column.astype(str).str.split('/', expand=True) \
+            .reindex(columns=range(3))
+        day, month, year = (
+            pd.to_numeric(parts[i], errors='coerce').to_numpy(dtype=float)
+            for i in range(3)
+        )
+        days, valid = DataCard.day_numbers(year, month, day)
+        return days.astype('datetime64[D]'), valid
+
+    @staticmethod
+    def day_numbers(year: np.ndarray, month: np.ndarray, day: np.ndarray):
+        """Converts years, months and days to day numbers, with the days in
+        each month of the proleptic Gregorian calendar, so every date of the
+        years 1 to 9999 is valid.
+
+        Args:
+            year (np.ndarray): The years, as floats, NaN if unknown.
+            month (np.ndarray): The months, like the years.
+            day (np.ndarray): The days of the month, like the years.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The number of days since
+                1970-01-01 of each date, and whether the date exists.
+        """
+        with np.errstate(invalid='ignore'):
+            valid = np.isfinite(day) & np.isfinite(month) & np.isfinite(year)
+            valid &= (day == np.floor(day)) & (month == np.floor(month)) & \
+                (year == np.floor(year))
+            valid &= (year >= 1) & (year <= 9999) & (month >= 1) & \
+                (month <= 12) & (day >= 1)
+        year = np.where(valid, year, 1970).astype(np.int64)
+        month = np.where(valid, month, 1).astype(np.int64)
+        day = np.where(valid, day, 1).astype(np.int64)
+        months = ((year - 1970) * 12 + month - 1).astype('datetime64[M]')
+        first_days = months.astype('datetime64[D]')
+        days_in_month = \
+            ((months + 1).astype('datetime64[D]') - first_days).astype(int)
+        valid &= day <= days_in_month
+        return first_days.astype(np.int64) + day - 1, valid
+
+    @staticmethod
+    def __parse_date(date_string: str):
+        day_month_year = date_string.split('/')
         day = int(day_month_year[0])
         month = int(day_month_year[1])
         year = int(day_month_year[2])
-        return year, month, day
+        try:
+            return date(year, month, day).toordinal()
+        except ValueError:
+            return None
+
+    def is_date_valid(self):
+        return self.ordinal is not None
 
     def get_date(self):
-        year, month, day = self.__split_date()
-        return date(year, month, day)
+        return date.fromordinal(self.ordinal)
+
+    def as_dict(self) -> dict:
+        """Returns the loss columns of the card by name."""
+        return dict(zip(self.layout, self.values))
@@ -0,0 +1,183 @@
+import numpy as np
+import pandas as pd
+
+from ._event import Event
+
+__all__ = ['EventAggregator', 'AGGREGATIONS']
+
+AGGREGATIONS = ['sum', 'max', 'min', 'first', 'count', 'distinct']
+
+
+class EventAggregator:
+    """Combines the records of many events at once, column by column.
+
+    Each loss column is combined with the aggregation declared for it in the
+    schema:
+
+        * 'sum': The sum of the values, added in record order. A missing value
+          makes the sum missing.
+        * 'max', 'min': The largest or smallest value, ignoring missing ones.
+        * 'first': The value of the first record of the event.
+        * 'count': The number of records with a value.
+        * 'distinct': The distinct values, sorted and joined by '; '.
+
+    Columns that are not declared are summed if they are numeric, and
+    combined as distinct values otherwise.
+
+    Attributes:
+        SCHEMA (dict[str, str]): The default aggregation of the DesInventar
+            columns.
+        _SEPARATOR (str): The separator of distinct values.
+        __schema (dict[str, str]): The aggregation of each declared column.
+    """
+    SCHEMA = {
+        'deaths': 'sum',
+        'injured': 'sum',
+        'missing': 'sum',
+        'houses_destroyed': 'sum',
+        'houses_damaged': 'sum',
+        'directly_affected': 'sum',
+        'indirectly_affected': 'sum',
+        'relocated': 'sum',
+        'evacuated': 'sum',
+        'losses_in_dollar': 'sum',
+        'losses_local_currency': 'sum',
+        'education_centers': 'sum',
+        'medical_centers': 'sum',
+        'damages_in_crops_ha': 'sum',
+        'lost_cattle': 'sum',
+        'damages_in_roads_mts': 'sum',
+        'magnitude2': 'sum',
+        'duration': 'sum',
+        'glide': 'distinct',
+        'cause': 'distinct',
+        'description_cause': 'distinct',
+    }
+    _SEPARATOR = '; '
+
+    def __init__(self, schema: dict | None = None):
+        """Constructs an EventAggregator object.
+
+        Args:
+            schema (dict | None): Aggregations overriding or extending SCHEMA,
+                by column name.
+
+        Raises:
+            ValueError: If an aggregation is not one of AGGREGATIONS.
+        """
+        self.__schema = {**EventAggregator.SCHEMA, **(schema or {})}
+        for column, aggregation in self.__schema.items():
+            if aggregation not in AGGREGATIONS:
+                raise ValueError(
+                    f'Unknown aggregation for {column}: {aggregation}'
+                )
+
+    def aggregate(self, records: pd.DataFrame,
+                  event_ids: np.ndarray) -> pd.DataFrame:
+        """Combines the loss columns of the records of each event.
+
+        Args:
+            records (pd.DataFrame): The loss columns of the records of all
+                events.
+            event_ids (np.ndarray): The event of each record, numbered from 0.
+                The records of an event must be next to each other, in order.
+
+        Returns:
+            pd.DataFrame: One row per event, in the order of the event ids.
+        """
+        assert np.all(np.diff(event_ids) >= 0)
+        starts = np.flatnonzero(np.r_[True, np.diff(event_ids) != 0])
+        lengths = np.diff(np.r_[starts, len(event_ids)])
+        data = {}
+        for column in records.columns:
+            values = records[column]
+            match self.__aggregation(column, values):
+                case 'sum':
+                    data[column] = EventAggregator.__sum(values.to_numpy(),
+                                                         starts, lengths)
+                case 'first':
+                    data[column] = values.to_numpy()[starts]
+                case 'distinct':
+                    data[column] = EventAggregator.__distinct(values,
+                                                              event_ids)
+                case aggregation:
+                    data[column] = getattr(values.groupby(event_ids),
+                                           aggregation)().to_numpy()
+        return pd.DataFrame(data, columns=records.columns)
+
+    def aggregate_events(self, events: list[Event]) -> pd.DataFrame:
+        """Combines the records of each event and adds the event type and
+        dates.
+
+        Args:
+            events (list[Event]): The events.
+
+        Returns:
+            pd.DataFrame: One row per event, in the order of the events.
+        """
+        if not events:
+            # noinspection PyTypeChecker
+            return pd.DataFrame.from_dict([])
+        records = pd.DataFrame.from_records(
+            [record.values for event in events for record in event.records],
+            columns=list(events[0].records[0].layout)
+        )
+        event_ids = np.repeat(np.arange(len(events)),
+                              [len(event.records) for event in events])
+        df = self.aggregate(records, event_ids)
+        df['event'] = [event.event_type for event in events]
+        df['start_date'] = [event.start_date for event in events]
+        df['primary_end'] = [event.primary_end for event in events]
+        df['secondary_end'] = [event.secondary_end for event in events]
+        return df
+
+    def __aggregation(self, column, values: pd.Series):
+        if column in self.__schema:
+            return self.__schema[column]
+        return EventAggregator.default_aggregation(values.dtype.kind)
+
+    @staticmethod
+    def default_aggregation(kind: str) -> str:
+        """Returns the aggregation of a column that is not declared.
+
+        Args:
+            kind (str): The NumPy dtype kind of the column.
+
+        Returns:
+            str: 'sum' for numeric columns, 'distinct' otherwise.
+        """
+        return 'sum' if kind in 'biuf' else 'distinct'
+
+    @staticmethod
+    def __sum(values: np.ndarray, starts: np.ndarray, lengths: np.ndarray):
+        """Sums the values of each event, adding them one record at a time in
+        order, for every event at once, so floats round the same way as a
+        plain loop and a missing value makes the sum missing.
+        """
+        if values.dtype.kind not in 'iuf':
+            values = values.astype(object)
+        # events ordered by length so that the events still being summed at
+        # each step are a prefix
+        order = np.argsort(-lengths, kind='stable')
+        sorted_starts = starts[order]
+        sorted_lengths = lengths[order]
+        active = np.searchsorted(-sorted_lengths,
+                                 -np.arange(sorted_lengths[0]), side='left')
+        sums = values[sorted_starts].copy()
+        for step in range(1, len(active)):
+            count = active[step]
+            sums[:count] = sums[:count] + values[sorted_starts[:count] + step]
+        result = np.empty_like(sums)
+        result[order] = sums
+        return result
+
+    @staticmethod
+    def __distinct(values: pd.Series, event_ids: np.ndarray):
+        present = values.notna().to_numpy()
+        pairs = pd.DataFrame({
+            'event': event_ids[present],
+            'value': values[present].astype(str).to_numpy(),
+        }).drop_duplicates().sort_values(['event', 'value'])
+        joined = pairs.groupby('event')['value'] \
+            .agg(EventAggregator._SEPARATOR.join)
+        return joined.reindex(np.unique(event_ids), fill_value='').to_numpy()
@@ -1,57 +1,134 @@
-from datetime import date, timedelta
+from datetime import date
 
 from ._event import Event
 from ._data_card import DataCard
 
-__all__ = ['EventBuilder']
+__all__ = ['EventBuilder', 'EXCLUDED_KEYS']
+
+EXCLUDED_KEYS = ['serial', 'level0', 'level1', 'level2', 'approved',
+                 'latitude', 'longitude', 'uuid', 'name0', 'name1', 'name2',
+                 'event', 'location', 'date']
 
 
 class EventBuilder:
     """A builder class for creating Event objects based on input DataCards.
 
+    The primary and secondary durations of each event type default to
+    DURATIONS and can be overridden, e.g. to calibrate them, by passing
+    durations built with EventBuilder.durations.
+
     Attributes:
+        DURATIONS (dict[str, tuple[int, int]]): The default primary and
+            secondary durations in days of each event type.
+        _OTHER_DURATIONS (tuple[int, int]): The durations of the types that
+            are not in DURATIONS.
         __records (list[DataCard]): A list of DataCard objects.
         __event_type (str): The type of the event.
-        __start_date (date): The start date of the event.
-        __end_date_primary (date): The end date of the primary event interval.
-        __end_date_secondary (date): The end of the secondary event interval.
+        __start_date (int): The ordinal of the start date of the event.
+        __end_date_primary (int): The ordinal of the end date of the primary
+            event interval.
+        __end_date_secondary (int): The ordinal of the end of the secondary
+            event interval.
     """
-    def __init__(self, trigger: DataCard, event_type: str):
+    DURATIONS = {
+        'EARTHQUAKES': (2, 3),
+        'FLOODS': (5, 5),
+        'STORMS': (5, 5),
+    }
+    _OTHER_DURATIONS = (1, 1)
+
+    def __init__(self, trigger: DataCard, event_type: str,
+                 durations: dict | None = None):
         """Constructs an EventBuilder object.
 
         Args:
             trigger (DataCard): The initial DataCard to trigger the event.
             event_type (str): The type of the event.
+            durations (dict | None): The durations of each event type, as
+                returned by EventBuilder.durations, DURATIONS if None.
         """
         self.__records: list[DataCard] = [trigger]
         self.__event_type: str = event_type
-        self.__start_date: date = trigger.get_date()
-        self.__end_date_primary: date = self.__start_date + \
-            timedelta(days=self.__get_primary_duration())
-        self.__end_date_secondary: date = self.__start_date + \
-            timedelta(days=self.__get_secondary_duration())
-
-    def __get_primary_duration(self):
-        match self.__event_type:
-            case 'EARTHQUAKES':
-                return 2
-            case 'FLOODS':
-                return 5
-            case 'STORMS':
-                return 5
-            case _:
-                return 1
-
-    def __get_secondary_duration(self):
-        match self.__event_type:
-            case 'EARTHQUAKES':
-                return 3
-            case 'FLOODS':
-                return 5
-            case 'STORMS':
-                return 5
-            case _:
-                return 1
+        self.__start_date: int = trigger.ordinal
+        primary, secondary = (durations or EventBuilder.DURATIONS).get(
+            event_type, EventBuilder._OTHER_DURATIONS
+        )
+        self.__end_date_primary: int = self.__start_date + primary
+        self.__end_date_secondary: int = self.__start_date + secondary
+
+    @staticmethod
+    def durations(overrides: dict | None = None) -> dict:
+        """Returns the durations of each event type, with some of them
+        overridden.
+
+        Args:
+            overrides (dict | None): The primary and secondary durations in
+                days of some event types, e.g. {'FLOODS': (3, 4)}.
+
+        Returns:
+            dict[str, tuple[int, int]]: DURATIONS with the overrides.
+
+        Raises:
+            ValueError: If the overrides are not a dictionary, the durations
+                of an event type are not a pair, or a duration is not a
+                non-negative integer.
+        """
+        durations = dict(EventBuilder.DURATIONS)
+        if overrides is None:
+            return durations
+        if not isinstance(overrides, dict):
+            raise ValueError(f'Invalid durations: {overrides!r}, expected a '
+                             f'dictionary of event types')
+        for event_type, pair in overrides.items():
+            if not isinstance(pair, (list, tuple)) or len(pair) != 2:
+                raise ValueError(
+                    f'Invalid durations for {event_type}: {pair!r}, expected '
+                    f'a primary and a secondary duration'
+                )
+            for duration in pair:
+                # a bool is an int, but not a number of days
+                if isinstance(duration, bool) or \
+                        not isinstance(duration, int) or duration < 0:
+                    raise ValueError(
+                        f'Invalid duration for {event_type}: {duration!r}, '
+                        f'expected a non-negative integer'
+                    )
+            durations[event_type] = tuple(pair)
+        return durations
+
+    @staticmethod
+    def primary_duration(event_type: str,
+                         durations: dict | None = None) -> int:
+        """Returns the length in days of the primary interval of an event.
+
+        Args:
+            event_type (str): The type of the event.
+            durations (dict | None): The durations of each event type, as
+                returned by EventBuilder.durations, DURATIONS if None.
+
+        Returns:
+            int: The number of days the primary interval lasts.
+        """
+        return (durations or EventBuilder.DURATIONS).get(
+            event_type, EventBuilder._OTHER_DURATIONS
+        )[0]
+
+    @staticmethod
+    def secondary_duration(event_type: str,
+                           durations: dict | None = None) -> int:
+        """Returns the length in days of the secondary interval of an event.
+
+        Args:
+            event_type (str): The type of the event.
+            durations (dict | None): The durations of each event type, as
+                returned by EventBuilder.durations, DURATIONS if None.
+
+        Returns:
+            int: The number of days the secondary interval lasts.
+        """
+        return (durations or EventBuilder.DURATIONS).get(
+            event_type, EventBuilder._OTHER_DURATIONS
+        )[1]
 
     def in_secondary_interval(self, data_card: DataCard) -> bool:
         """Checks if a given DataCard is within the secondary event interval.
@@ -63,7 +140,7 @@ class EventBuilder:
             bool: True if the DataCard is within the secondary interval, False
                 otherwise.
         """
-        return self.__start_date <= data_card.get_date() <= \
+        return self.__start_date <= data_card.ordinal <= \
             self.__end_date_secondary
 
     def in_primary_interval(self, data_card: DataCard) -> bool:
@@ -76,7 +153,7 @@ class EventBuilder:
             bool: True if the DataCard is within the primary interval, False
                 otherwise.
         """
-        return self.__start_date <= data_card.get_date() <= \
+        return self.__start_date <= data_card.ordinal <= \
             self.__end_date_primary
 
     def add(self, data_card: DataCard):
@@ -93,38 +170,15 @@ class EventBuilder:
             self.in_primary_interval(data_card)
         self.__records.append(data_card)
 
-    @staticmethod
-    def __convert_to_dict(data_card):
-        """Converts a DataCard object to a dictionary, excluding certain keys.
-
-        Args:
-            data_card (DataCard): The DataCard object to convert.
-
-        Returns:
-            dict: A dictionary representation of the DataCard object, with
-                certain keys excluded.
-        """
-        return {
-            k: v
-            for k, v in data_card.__dict__.items()
-            if k not in ['serial', 'level0', 'level1', 'level2', 'approved',
-                         'latitude', 'longitude', 'uuid', 'name0', 'name1',
-                         'name2', 'event', 'location', 'date']
-        }
-
     def build(self) -> Event:
         """Builds and returns an Event object based on the DataCards in the
-        event.
+        event. The loss columns of the DataCards are combined later, for all
+        events at once, by EventAggregator.
 
         Returns:
             Event: The built Event object.
         """
-        data = {}
-        for record in self.__records:
-            for k, v in self.__convert_to_dict(record).items():
-                if k in data:
-                    data[k] += v
-                else:
-                    data[k] = v
-        return Event(data, self.__event_type, self.__start_date,
-                     self.__end_date_primary, self.__end_date_secondary)
+        return Event(self.__records, self.__event_type,
+                     date.fromordinal(self.__start_date),
+                     date.fromordinal(self.__end_date_primary),
+                     date.fromordinal(self.__end_date_secondary))
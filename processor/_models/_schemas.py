@@ -0,0 +1,25 @@
+from .._utils import CsvSchema
+from ._event_builder import EXCLUDED_KEYS
+
+__all__ = ['SCHEMAS']
+
+SCHEMAS = {
+    # DesInventar records, merged into events: only the event type, the date
+    # and the loss columns are needed
+    'records': CsvSchema(
+        dtypes={'event': 'category', 'date': 'str'},
+        unused={
+            'merge': [key for key in EXCLUDED_KEYS
+                      if key not in ('event', 'date')],
+        },
+    ),
+    # events written by the merge stage, sliced into one file per event type
+    'events': CsvSchema(
+        dtypes={'event': 'category', 'start_date': 'str',
+                'primary_end': 'str', 'secondary_end': 'str'},
+    ),
+    # emdat_cleaned.csv, split by country and disaster type
+    'emdat': CsvSchema(
+        dtypes={'Country': 'category', 'Disaster Type': 'category'},
+    ),
+}
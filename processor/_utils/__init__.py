@@ -1,4 +1,29 @@
+import importlib
+
 from ._file import File
 from ._directory import Directory
+from ._manifest import Manifest
+
+__all__ = ['File', 'Directory', 'Manifest', 'ParquetStore', 'AsyncWriter',
+           'Prefetcher', 'CsvSchema', 'Report', 'run_tasks', 'TaskPool']
+
+# these import pandas or the profilers, which is slow, so they are only
+# imported when they are first used
+_LAZY_MODULES = {
+    'Report': '._report',
+    'run_tasks': '._pool',
+    'TaskPool': '._pool',
+    'ParquetStore': '._parquet_store',
+    'AsyncWriter': '._writer',
+    'Prefetcher': '._prefetcher',
+    'CsvSchema': '._csv_schema',
+}
+
 
-__all__ = ['File', 'Directory']
+def __getattr__(name):
+    module = _LAZY_MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,168 @@
+import csv
+import io
+
+import pandas as pd
+
+__all__ = ["CsvSchema"]
+
+
+class CsvSchema:
+    """
+    The expected layout of a CSV input: the types of the columns known in
+    advance and the columns each stage reading it does not need.
+
+    Columns whose type is not declared are inferred as pandas does. Reads use
+    pyarrow's multi-threaded parser when pyarrow is installed, and pandas'
+    parser otherwise. Both parse floats exactly and treat missing values,
+    booleans and quoted newlines the same way, so they give the same
+    DataFrame.
+
+    Attributes:
+        _NA_VALUES (list[str]): The strings read as missing values, the
+            defaults of pandas.
+        _TRUE_VALUES (list[str]): The strings read as True.
+        _FALSE_VALUES (list[str]): The strings read as False.
+        __dtypes (dict[str, str]): The type of each declared column, 'str' or
+            'category'.
+        __unused (dict[str, list[str]]): The columns each stage does not
+            need, by stage.
+        __version (int): The version of the schema.
+
+    Args:
+        dtypes (dict[str, str] | None): The type of each declared column, 'str'
+            or 'category'.
+        unused (dict[str, list[str]] | None): The columns each stage does not
+            need, by stage. They are not parsed when the stage reads the file.
+        version (int): The version of the schema, to be increased when the
+            DataFrames read with it change, so copies of them cached on disk
+            are rebuilt.
+    """
+    _NA_VALUES = ['', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN',
+                  '-NaN', '-nan', '1.#IND', '1.#QNAN', '<NA>', 'N/A', 'NA',
+                  'NULL', 'NaN', 'n/a', 'nan', 'null']
+    _TRUE_VALUES = ['True', 'TRUE', 'true']
+    _FALSE_VALUES = ['False', 'FALSE', 'false']
+
+    def __init__(self, dtypes: dict[str, str] | None = None,
+                 unused: dict[str, list[str]] | None = None, version=1):
+        self.__dtypes = dtypes or {}
+        self.__unused = unused or {}
+        self.__version = version
+
+    @property
+    def version(self) -> int:
+        """Returns the version of the schema."""
+        return self.__version
+
+    def read(self, path: str, stage: str | None = None) -> pd.DataFrame:
+        """
+        Reads a whole CSV file.
+
+        Args:
+            path (str): The path of the file.
+            stage (str | None): The stage reading the file. Columns it does not
+                need are skipped.
+
+        Returns:
+            pd.DataFrame: The contents of the file.
+
+        Raises:
+            pd.errors.EmptyDataError: If the file has no header.
+        """
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            return pd.read_csv(path, **self.__pandas_options(stage))
+        return self.__read_pyarrow(path, stage)
+
+    def read_bytes(self, data: bytes, stage: str | None = None) \
+            -> pd.DataFrame:
+        """
+        Reads CSV contents already in memory, e.g. a few rows of a file, with
+        pandas' parser.
+
+        Args:
+            data (bytes): The header and the rows.
+            stage (str | None): The stage reading the rows. Columns it does not
+                need are skipped.
+
+        Returns:
+            pd.DataFrame: The rows.
+        """
+        return pd.read_csv(io.BytesIO(data), **self.__pandas_options(stage))
+
+    def read_chunks(self, path: str, chunk_size: int,
+                    stage: str | None = None):
+        """
+        Reads a CSV file a few rows at a time, with pandas' parser since the
+        types of a chunk are inferred from its own rows.
+
+        Args:
+            path (str): The path of the file.
+            chunk_size (int): The number of rows in each chunk.
+            stage (str | None): The stage reading the file. Columns it does not
+                need are skipped.
+
+        Returns:
+            Iterator[pd.DataFrame]: The chunks, in file order.
+        """
+        return pd.read_csv(path, chunksize=chunk_size,
+                           **self.__pandas_options(stage))
+
+    def __pandas_options(self, stage):
+        unused = set(self.__unused.get(stage, []))
+        return {
+            'usecols': (lambda column: column not in unused)
+            if unused else None,
+            'dtype': self.__dtypes,
+            'float_precision': 'round_trip',
+        }
+
+    def __read_pyarrow(self, path, stage):
+        import pyarrow as pa
+
+        with open(path, newline='') as file:
+            header = next(csv.reader(file), [])
+        if not header:
+            raise pd.errors.EmptyDataError('No columns to parse from file')
+        unused = set(self.__unused.get(stage, []))
+        columns = [column for column in header if column not in unused]
+        types = {
+            column: pa.dictionary(pa.int32(), pa.string())
+            if dtype == 'category' else pa.string()
+            for column, dtype in self.__dtypes.items()
+        }
+        table = CsvSchema.__read_table(path, columns, types)
+        # pandas keeps inferred dates and times as strings
+        temporal = [
+            field.name for field in table.schema
+            if pa.types.is_temporal(field.type) and field.name not in types
+        ]
+        if temporal:
+            types.update((column, pa.string()) for column in temporal)
+            table = CsvSchema.__read_table(path, columns, types)
+        # pandas reads a column without values as floats
+        for i, field in enumerate(table.schema):
+            if pa.types.is_null(field.type):
+                table = table.set_column(
+                    i, field.name, table.column(i).cast(pa.float64())
+                )
+        return table.to_pandas()
+
+    @staticmethod
+    def __read_table(path, columns, types):
+        import pyarrow.csv as pv
+
+        return pv.read_csv(
+            path,
+            read_options=pv.ReadOptions(use_threads=True),
+            parse_options=pv.ParseOptions(newlines_in_values=True),
+            convert_options=pv.ConvertOptions(
+                column_types=types,
+                include_columns=columns,
+                null_values=CsvSchema._NA_VALUES,
+                true_values=CsvSchema._TRUE_VALUES,
+                false_values=CsvSchema._FALSE_VALUES,
+                strings_can_be_null=True,
+            ),
+        )
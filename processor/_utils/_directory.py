@@ -1,3 +1,5 @@
+import bisect
+import fnmatch
 import os
 
 from ._file import File
@@ -9,14 +11,18 @@ class Directory:
     """
     A class that represents a directory on the filesystem.
 
+    The directory is scanned the first time its contents are needed, and its
+    subdirectories are only scanned when their own contents are needed.
+
     Attributes:
         __path (str): The path of the directory.
         __dirname (str): The name of the directory.
-        __files (list[File]): A list of the files in the directory.
-        __directories (list[Directory]): A list of the subdirectories in the
-            directory.
-        __content_names (list[str]): A list of the names of the files and
-            subdirectories in the directory.
+        __files (list[File] | None): A list of the files in the directory, None
+            until the directory is scanned.
+        __directories (list[Directory] | None): A list of the subdirectories in
+            the directory, None until the directory is scanned.
+        __index (dict[str, File | Directory]): The files and subdirectories in
+            the directory, by name.
 
     Methods:
         get_directories(): Returns a list of the subdirectories in the
@@ -28,8 +34,12 @@ class Directory:
             given name, or `None` if not found.
         find_file(file): Returns the `File` object with the given name, or
             `None` if not found.
+        find_files(patterns): Returns the files whose name without extension
+            matches one of the given glob patterns.
         create_subdirectory(directory): Creates a new subdirectory with the
             given name.
+        update(): Forgets the contents of the directory, so it is scanned
+            again when they are next needed.
         get_contents(): Returns a list of the files and subdirectories in the
             directory.
         get_content_names(): Returns a list of the names of the files and
@@ -50,30 +60,40 @@ class Directory:
             raise FileNotFoundError("folder does not exist")
         self.__path = path if path != "" and path[-1] != '/' else path[:-1]
         self.__dirname = os.path.basename(path)
-        self.__files: list[File] = []
-        self.__directories: list[Directory] = []
-        self.__content_names: list[str] = []
-        self.update()
+        self.__files: list[File] | None = None
+        self.__directories: list[Directory] | None = None
+        self.__index: dict[str, File | Directory] = {}
 
     def __scan_directory(self):
+        """Lists the files and subdirectories, without scanning the
+        subdirectories.
+        """
+        files = []
+        directories = []
         with os.scandir(self.__path) as it:
             for entry in it:
                 if entry.is_file():
-                    self.__files.append(File(entry.path))
+                    files.append(File(entry.path))
                 elif entry.is_dir():
-                    self.__directories.append(Directory(entry.path))
+                    directories.append(Directory(entry.path))
+        self.__files = sorted(files, key=lambda f: f.get_filename())
+        self.__directories = sorted(directories,
+                                    key=lambda d: d.get_dirname())
+        self.__index = {f.get_filename(): f for f in self.__files}
+        self.__index.update((d.get_dirname(), d) for d in self.__directories)
+
+    def __ensure_scanned(self):
+        if self.__files is None:
+            self.__scan_directory()
 
     def update(self):
-        self.__files = []
-        self.__directories = []
-        self.__scan_directory()
-        self.__files.sort(key=lambda f: f.get_filename())
-        self.__directories.sort(key=lambda d: d.get_dirname())
-        self.__content_names = list(
-            map(lambda c: c.get_dirname() if isinstance(c, Directory)
-                else c.get_filename(),
-                self.get_contents())
-        )
+        """
+        Forgets the contents of the directory, so it is scanned again when
+        they are next needed.
+        """
+        self.__files = None
+        self.__directories = None
+        self.__index = {}
 
     def get_directories(self):
         """
@@ -83,6 +103,7 @@ class Directory:
             list[Directory]: A list of the subdirectories in the directory.
 
         """
+        self.__ensure_scanned()
         return self.__directories
 
     def get_files(self):
@@ -93,6 +114,7 @@ class Directory:
             list[File]: A list of the files in the directory.
 
         """
+        self.__ensure_scanned()
         return self.__files
 
     def get_all_files(self):
@@ -104,6 +126,7 @@ class Directory:
                 subdirectories.
 
         """
+        self.__ensure_scanned()
         files: list[File] = []
         files.extend(self.__files)
         for d in self.__directories:
@@ -123,10 +146,9 @@ class Directory:
             not found.
 
         """
-        return next(
-            (d for d in self.__directories if d.get_dirname() == directory),
-            None
-        )
+        self.__ensure_scanned()
+        found = self.__index.get(directory)
+        return found if isinstance(found, Directory) else None
 
     def find_file(self, file: str):
         """
@@ -139,24 +161,61 @@ class Directory:
             File: The `File` object with the given name, or `None` if not found.
 
         """
-        return next((f for f in self.__files if f.get_filename() == file), None)
+        self.__ensure_scanned()
+        found = self.__index.get(file)
+        return found if isinstance(found, File) else None
+
+    def find_files(self, patterns: list[str]):
+        """
+        Returns the files whose name without extension matches one of the
+        given glob patterns, e.g. `Nepal` or `S*`.
+
+        Parameters:
+            patterns (list[str]): The glob patterns.
+
+        Returns:
+            list[File]: The matching files, in the order of get_files().
+
+        """
+        self.__ensure_scanned()
+        return [
+            file for file in self.__files
+            if any(fnmatch.fnmatchcase(file.get_filename().split(".")[0],
+                                       pattern)
+                   for pattern in patterns)
+        ]
 
     def create_subdirectory(self, directory):
         """
         Creates a new subdirectory with the given name.
 
+        Only the entry of the new subdirectory is added to the contents, the
+        rest of the directory is not scanned again. A nested path only
+        invalidates the existing subdirectory it is created in.
+
         Parameters:
             directory (str): The name of the subdirectory to create.
 
         """
         path = f"{self.__path}/{directory}"
-        if os.path.exists(path):
+        os.makedirs(path, exist_ok=True)
+        if self.__files is None:
+            # not scanned yet, the new subdirectory is found when it is
+            return
+        name = directory.split('/')[0]
+        existing = self.__index.get(name)
+        if isinstance(existing, Directory):
+            if name != directory:
+                existing.update()
             return
-        os.makedirs(path)
-        self.update()
+        subdirectory = Directory(f"{self.__path}/{name}")
+        bisect.insort(self.__directories, subdirectory,
+                      key=lambda d: d.get_dirname())
+        self.__index[name] = subdirectory
 
     def get_contents(self):
         """Returns a list of the files and subdirectories in the directory."""
+        self.__ensure_scanned()
         contents = []
         contents.extend(self.__files)
         contents.extend(self.__directories)
@@ -166,7 +225,10 @@ class Directory:
         """Returns a list of the names of the files and subdirectories in the
         directory.
         """
-        return self.__content_names
+        return [
+            c.get_dirname() if isinstance(c, Directory) else c.get_filename()
+            for c in self.get_contents()
+        ]
 
     def get_dirname(self):
         """Returns the name of the directory."""
@@ -0,0 +1,180 @@
+import hashlib
+import json
+import os
+
+from ._directory import Directory
+
+__all__ = ["Manifest"]
+
+
+class Manifest:
+    """
+    A record of the inputs, parameters and outputs of every unit of work done
+    in a data directory, used to skip work whose inputs have not changed.
+
+    The manifest is a JSON file in the data directory. Each unit of work is
+    identified by a stage and a key (e.g. the merge stage and a country file)
+    and records the size and content hash of every input file, the stage
+    parameters and the output files. A unit is up to date when all of these
+    match and all of its outputs still exist.
+
+    Attributes:
+        _FILE_NAME (str): The name of the manifest file.
+        _VERSION (int): The version of the manifest format and of the outputs.
+            Manifests with another version are ignored.
+        _CHUNK_SIZE (int): The size of the chunks read when hashing files.
+        __root (str): The path of the data directory.
+        __path (str): The path of the manifest file.
+        __incremental (bool): Whether up-to-date work can be skipped.
+        __files (dict): The size, modification time and hash of every file
+            hashed, so unchanged files are not hashed again.
+        __stages (dict): The inputs, parameters and outputs of each unit of
+            work, by stage and key.
+
+    Args:
+        data_folder (Directory): The data directory.
+        incremental (bool): Whether up-to-date work can be skipped. The
+            manifest is still updated when False.
+    """
+    _FILE_NAME = "manifest.json"
+    _VERSION = 1
+    _CHUNK_SIZE = 1 << 20
+
+    def __init__(self, data_folder: Directory, incremental=True):
+        self.__root = data_folder.get_path()
+        self.__path = f"{self.__root}/{Manifest._FILE_NAME}"
+        self.__incremental = incremental
+        self.__files: dict[str, dict] = {}
+        self.__stages: dict[str, dict[str, dict]] = {}
+        self.__load()
+
+    def __load(self):
+        if not os.path.exists(self.__path):
+            return
+        with open(self.__path) as file:
+            try:
+                contents = json.load(file)
+            except json.JSONDecodeError:
+                return
+        if contents.get('version') != Manifest._VERSION:
+            return
+        self.__files = contents.get('files', {})
+        self.__stages = contents.get('stages', {})
+
+    def save(self):
+        """Writes the manifest to the data directory."""
+        contents = {
+            'version': Manifest._VERSION,
+            'files': self.__files,
+            'stages': self.__stages,
+        }
+        temporary_path = f"{self.__path}.tmp"
+        with open(temporary_path, 'w') as file:
+            json.dump(contents, file, indent=1, sort_keys=True)
+        os.replace(temporary_path, self.__path)
+
+    @staticmethod
+    def discard(data_folder: Directory):
+        """Removes the manifest of a data directory, if any, so outputs
+        written without it are not taken as up to date by a later run."""
+        path = f"{data_folder.get_path()}/{Manifest._FILE_NAME}"
+        if os.path.exists(path):
+            os.remove(path)
+
+    def fingerprint(self, paths: list[str]) -> dict:
+        """
+        Returns the size and content hash of the given files.
+
+        Files whose size and modification time are unchanged since they were
+        last hashed are not read again.
+
+        Args:
+            paths (list[str]): The paths of the files.
+
+        Returns:
+            dict: The size and hash of each file, by path relative to the data
+                directory.
+        """
+        return {
+            self.__relative(path): self.__fingerprint_one(path)
+            for path in paths
+        }
+
+    def __fingerprint_one(self, path):
+        stat = os.stat(path)
+        relative_path = self.__relative(path)
+        known = self.__files.get(relative_path)
+        if known is None or known['size'] != stat.st_size or \
+                known['mtime_ns'] != stat.st_mtime_ns:
+            known = {
+                'size': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns,
+                'sha256': Manifest.hash_file(path),
+            }
+            self.__files[relative_path] = known
+        return {'size': known['size'], 'sha256': known['sha256']}
+
+    @staticmethod
+    def hash_file(path: str) -> str:
+        """Returns the SHA-256 of the contents of a file, in hexadecimal."""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as file:
+            for chunk in iter(lambda: file.read(Manifest._CHUNK_SIZE), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def __relative(self, path):
+        return os.path.relpath(path, self.__root)
+
+    def is_up_to_date(self, stage: str, key: str, inputs: dict,
+                      params: dict) -> bool:
+        """
+        Checks whether a unit of work can be skipped.
+
+        Args:
+            stage (str): The name of the stage.
+            key (str): The unit of work in the stage, e.g. a country.
+            inputs (dict): The fingerprint of the inputs of the unit.
+            params (dict): The stage parameters the outputs depend on.
+
+        Returns:
+            bool: True if the manifest is incremental and the unit was done
+                with the same inputs and parameters and its outputs still
+                exist, False otherwise.
+        """
+        if not self.__incremental:
+            return False
+        entry = self.__stages.get(stage, {}).get(key)
+        if entry is None:
+            return False
+        return (
+            entry['inputs'] == inputs
+            and entry['params'] == Manifest.__normalise(params)
+            and all(
+                os.path.exists(f"{self.__root}/{output}")
+                for output in entry['outputs']
+            )
+        )
+
+    def record(self, stage: str, key: str, inputs: dict, params: dict,
+               outputs: list[str]):
+        """
+        Records a unit of work that has been done.
+
+        Args:
+            stage (str): The name of the stage.
+            key (str): The unit of work in the stage, e.g. a country.
+            inputs (dict): The fingerprint of the inputs of the unit.
+            params (dict): The stage parameters the outputs depend on.
+            outputs (list[str]): The paths of the files written.
+        """
+        self.__stages.setdefault(stage, {})[key] = {
+            'inputs': inputs,
+            'params': Manifest.__normalise(params),
+            'outputs': [self.__relative(output) for output in outputs],
+        }
+
+    @staticmethod
+    def __normalise(params):
+        """Returns params as they are after being saved and loaded."""
+        return json.loads(json.dumps(params, sort_keys=True))
@@ -0,0 +1,159 @@
+import os
+import shutil
+from urllib.parse import quote
+
+import pandas as pd
+
+from ._directory import Directory
+
+__all__ = ["ParquetStore"]
+
+
+class ParquetStore:
+    """
+    An output backend writing one Parquet dataset per stage, partitioned by
+    country and event type.
+
+    The datasets are written under the parquet folder of the data directory,
+    with hive-style partitions, e.g.
+    ``parquet/events/country=Nepal/event=FLOODS/part-0.parquet``. Partition
+    values are URI-encoded, as pyarrow expects by default. Date columns are
+    stored as dates and every column, including the dates, has row-group
+    statistics so readers can skip row groups outside a date range.
+
+    Writing Parquet requires pyarrow, which is an optional dependency.
+
+    Attributes:
+        _FOLDER_NAME (str): The name of the folder of the datasets.
+        _ROW_GROUP_SIZE (int): The maximum number of rows in a row group.
+        __path (str): The path of the folder of the datasets.
+
+    Args:
+        data_folder (Directory): The data directory.
+
+    Raises:
+        ImportError: If pyarrow is not installed.
+    """
+    _FOLDER_NAME = "parquet"
+    _ROW_GROUP_SIZE = 64 * 1024
+
+    def __init__(self, data_folder: Directory):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as error:
+            raise ImportError(
+                'Writing Parquet output requires pyarrow, install it with '
+                '`pip install pyarrow`.'
+            ) from error
+        self.__path = f"{data_folder.get_path()}/{ParquetStore._FOLDER_NAME}"
+
+    def open(self, stage: str, country: str, type_column: str):
+        """
+        Opens the partition of a country in the dataset of a stage. The
+        previous contents of the partition are removed.
+
+        Args:
+            stage (str): The name of the stage, used as the dataset name.
+            country (str): The name of the country.
+            type_column (str): The column holding the event type, used as the
+                second partition level.
+
+        Returns:
+            _PartitionWriter: A writer to be used as a context manager.
+        """
+        path = f"{self.__path}/{stage}/" \
+               f"{ParquetStore.partition('country', country)}"
+        return _PartitionWriter(path, type_column,
+                                ParquetStore._ROW_GROUP_SIZE)
+
+    @staticmethod
+    def partition(key: str, value) -> str:
+        """
+        Returns the name of the folder of a hive-style partition.
+
+        Args:
+            key (str): The partition key.
+            value: The partition value.
+
+        Returns:
+            str: The folder name, as key=value with both URI-encoded.
+        """
+        return f"{quote(str(key), safe='')}={quote(str(value), safe='')}"
+
+
+class _PartitionWriter:
+    """
+    Appends DataFrames to the partitions of one country, one Parquet file per
+    event type.
+
+    Attributes:
+        _DATE_COLUMNS (list[str]): The columns stored as dates.
+        __path (str): The path of the partition of the country.
+        __type_column (str): The column holding the event type.
+        __row_group_size (int): The maximum number of rows in a row group.
+        __writers (dict): The open Parquet writer of each event type.
+    """
+    _DATE_COLUMNS = ['start_date', 'primary_end', 'secondary_end']
+
+    def __init__(self, path: str, type_column: str, row_group_size: int):
+        self.__path = path
+        self.__type_column = type_column
+        self.__row_group_size = row_group_size
+        self.__writers = {}
+
+    def __enter__(self):
+        if os.path.exists(self.__path):
+            shutil.rmtree(self.__path)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write(self, df: pd.DataFrame):
+        """
+        Appends rows to the partitions of their event types.
+
+        Args:
+            df (pd.DataFrame): The rows, in date order.
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        for event, group in df.groupby(self.__type_column, sort=False,
+                                       observed=True):
+            group = group.drop(columns=self.__type_column)
+            table = pa.Table.from_pandas(_PartitionWriter.__typed(group),
+                                         preserve_index=False)
+            if event not in self.__writers:
+                folder = f"{self.__path}/" \
+                         f"{ParquetStore.partition(self.__type_column, event)}"
+                os.makedirs(folder, exist_ok=True)
+                self.__writers[event] = pq.ParquetWriter(
+                    f"{folder}/part-0.parquet", table.schema,
+                    write_statistics=True
+                )
+            writer = self.__writers[event]
+            if not table.schema.equals(writer.schema):
+                table = table.cast(writer.schema)
+            writer.write_table(table, row_group_size=self.__row_group_size)
+
+    def close(self):
+        """Closes the Parquet files."""
+        for writer in self.__writers.values():
+            writer.close()
+        self.__writers = {}
+
+    @staticmethod
+    def __typed(df: pd.DataFrame) -> pd.DataFrame:
+        """Converts the date columns read back from CSV to dates."""
+        columns = [
+            column for column in _PartitionWriter._DATE_COLUMNS
+            if column in df.columns and df[column].dtype == object and
+            isinstance(df[column].iloc[0], str)
+        ]
+        if not columns:
+            return df
+        df = df.copy()
+        for column in columns:
+            df[column] = pd.to_datetime(df[column]).dt.date
+        return df
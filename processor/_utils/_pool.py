@@ -0,0 +1,157 @@
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from ._prefetcher import Prefetcher
+from ._writer import AsyncWriter
+
+__all__ = ["run_tasks", "TaskPool"]
+
+_task = None
+_writer: AsyncWriter | None = None
+
+
+def _init_worker(task, writer):
+    """Keeps the task in the worker process so it is pickled once per worker
+    instead of once per item. The writer is sent along with it, so the task
+    in the worker still refers to it."""
+    global _task, _writer
+    _task = task
+    _writer = writer
+
+
+def _run_task(item):
+    result = _task(item)
+    # the files of the item are written before its result is returned
+    if _writer is not None:
+        _writer.flush()
+    return result
+
+
+def run_tasks(task, items, jobs: int | None = 1,
+              writer: AsyncWriter | None = None,
+              prefetcher: Prefetcher | None = None):
+    """
+    Calls task on each item, in a pool of processes when jobs is not 1.
+
+    When the items are processed in the current process, a prefetcher can
+    read the next items while the current one is processed. The task then
+    needs a read method taking an item, and is called with the item and what
+    read returned. Worker processes read their own items, which already
+    overlaps with the processing of the other items.
+
+    Args:
+        task (Callable): A picklable callable taking one item, e.g. a module
+            level function or a functools.partial of one.
+        items (list): The items to process.
+        jobs (int | None): The number of processes to use. 1 runs every item
+            in the current process and None uses every core.
+        writer (AsyncWriter | None): The writer the task hands its files to,
+            if any. run_tasks returns once they are all written.
+        prefetcher (Prefetcher | None): If given, reads the items ahead with
+            task.read when they are processed in the current process.
+
+    Returns:
+        list: The result of task for each item, in the order of items.
+
+    Raises:
+        ValueError: If jobs is less than 1.
+        Exception: The first error raised by task, in the order of items. The
+            items not started yet are cancelled.
+    """
+    if jobs is None:
+        jobs = os.cpu_count()
+    if jobs < 1:
+        raise ValueError('jobs must be at least 1.')
+    if jobs == 1 or len(items) <= 1:
+        if prefetcher is None:
+            results = [task(item) for item in items]
+        else:
+            results = [
+                task(item, contents)
+                for item, contents in prefetcher.map(task.read, items)
+            ]
+        if writer is not None:
+            writer.flush()
+        return results
+    executor = ProcessPoolExecutor(max_workers=min(jobs, len(items)),
+                                   initializer=_init_worker,
+                                   initargs=(task, writer))
+    futures = [executor.submit(_run_task, item) for item in items]
+    try:
+        return [future.result() for future in futures]
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+class TaskPool:
+    """
+    Calls a task on items submitted one at a time, in one pool of processes
+    kept for all of them when jobs is not 1.
+
+    Unlike run_tasks, the items do not have to be known in advance, so the
+    items of the next batch can be submitted while the previous one is still
+    processed and every process stays busy. The task is pickled once per
+    worker, each item with its submission.
+
+    Attributes:
+        __task (Callable): The task, called in the current process when jobs
+            is 1.
+        __writer (AsyncWriter | None): The writer the task hands its files
+            to, if any.
+        __executor (ProcessPoolExecutor | None): The pool of processes, None
+            when the items are processed in the current process.
+
+    Args:
+        task (Callable): A picklable callable taking one item.
+        jobs (int | None): The number of processes to use. 1 runs every item
+            in the current process, when it is submitted, and None uses
+            every core.
+        writer (AsyncWriter | None): The writer the task hands its files to,
+            if any. Leaving the pool returns once they are all written.
+
+    Raises:
+        ValueError: If jobs is less than 1.
+    """
+    def __init__(self, task, jobs: int | None = 1,
+                 writer: AsyncWriter | None = None):
+        if jobs is None:
+            jobs = os.cpu_count()
+        if jobs < 1:
+            raise ValueError('jobs must be at least 1.')
+        self.__task = task
+        self.__writer = writer
+        self.__executor = ProcessPoolExecutor(
+            max_workers=jobs, initializer=_init_worker,
+            initargs=(task, writer)
+        ) if jobs > 1 else None
+
+    def submit(self, item) -> Future:
+        """
+        Calls the task on an item.
+
+        Args:
+            item: The item.
+
+        Returns:
+            Future: The result of the task for the item, already set when
+                the items are processed in the current process.
+        """
+        if self.__executor is not None:
+            return self.__executor.submit(_run_task, item)
+        future = Future()
+        try:
+            future.set_result(self.__task(item))
+        except Exception as error:
+            future.set_exception(error)
+        return future
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Waits for the items submitted, or cancels the ones not started
+        yet if an error was raised, and for the files written."""
+        if self.__executor is not None:
+            self.__executor.shutdown(cancel_futures=exc_type is not None)
+        elif self.__writer is not None and exc_type is None:
+            self.__writer.flush()
@@ -0,0 +1,108 @@
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from ._file import File
+
+__all__ = ["Prefetcher"]
+
+
+class Prefetcher:
+    """
+    Reads the next files on background threads while the current one is
+    processed, so the time spent reading and parsing them overlaps with the
+    processing instead of adding to it.
+
+    At most ahead files are read in advance, and a file is only read in
+    advance if the DataFrames already read in advance and not handed over yet
+    and the file fit in max_bytes. The memory of a file being read is
+    estimated by its size on disk, and replaced by the memory of its
+    DataFrame once it is read. The next file is always read, even if it is
+    larger than max_bytes on its own.
+
+    Attributes:
+        __threads (int): The number of threads reading files.
+        __ahead (int): The maximum number of files read in advance.
+        __max_bytes (int): The maximum memory of the DataFrames read in
+            advance, in bytes.
+
+    Args:
+        threads (int): The number of threads reading files.
+        ahead (int): The maximum number of files read in advance.
+        max_bytes (int): The maximum memory of the DataFrames read in
+            advance, in bytes.
+
+    Raises:
+        ValueError: If threads or ahead is less than 1.
+    """
+    def __init__(self, threads=2, ahead=2, max_bytes=256 << 20):
+        if threads < 1 or ahead < 1:
+            raise ValueError('threads and ahead must be at least 1.')
+        self.__threads = threads
+        self.__ahead = ahead
+        self.__max_bytes = max_bytes
+
+    def map(self, read, files: list[File]):
+        """
+        Reads files in order, reading the next ones in advance.
+
+        Args:
+            read (Callable): A callable taking a File and returning its
+                contents, called on the background threads.
+            files (list[File]): The files to read.
+
+        Yields:
+            tuple[File, Any]: Each file and what read returned for it, in the
+                order of files.
+
+        Raises:
+            Exception: The error raised by read for a file, when the file is
+                reached. The files not read yet are not read.
+        """
+        pending = deque()
+        remaining = deque(files)
+
+        def read_ahead():
+            while remaining and len(pending) < self.__ahead:
+                estimate = Prefetcher.__estimate(remaining[0])
+                held = sum(
+                    future.result()[1]
+                    if future.done() and future.exception() is None
+                    else size
+                    for _, future, size in pending
+                )
+                if pending and held + estimate > self.__max_bytes:
+                    return
+                file = remaining.popleft()
+                pending.append(
+                    (file, executor.submit(Prefetcher.__read, read, file),
+                     estimate)
+                )
+
+        executor = ThreadPoolExecutor(max_workers=self.__threads,
+                                      thread_name_prefix='prefetch')
+        try:
+            read_ahead()
+            while pending:
+                file, future, _ = pending.popleft()
+                contents, _ = future.result()
+                read_ahead()
+                yield file, contents
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+    @staticmethod
+    def __read(read, file):
+        """Reads a file and returns its contents and their memory."""
+        contents = read(file)
+        if isinstance(contents, pd.DataFrame):
+            return contents, int(contents.memory_usage(deep=True).sum())
+        return contents, Prefetcher.__estimate(file)
+
+    @staticmethod
+    def __estimate(file: File):
+        """Returns the size of a file on disk, as an estimate of its memory
+        once read."""
+        return os.path.getsize(file.get_filepath())
@@ -0,0 +1,238 @@
+import cProfile
+import glob
+import json
+import os
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:
+    # not available on Windows, where worker processes are not timed
+    resource = None
+
+__all__ = ["Report"]
+
+
+class Report:
+    """
+    Metrics of a run: the wall and CPU time of each stage and of each country
+    in it, the counters returned by the stages, and optionally the peak
+    memory traced by tracemalloc and cProfile dumps.
+
+    Countries are measured where they are processed, so their metrics are
+    also collected from worker processes. The CPU time of a stage includes
+    the time of its worker processes, on systems where it can be measured.
+
+    Attributes:
+        __trace_memory (bool): Whether to trace the peak memory.
+        __profile_dir (str | None): The folder of the cProfile dumps.
+        __stages (dict[str, dict]): The metrics of each stage, by name.
+
+    Args:
+        trace_memory (bool): Whether to trace the peak memory of each stage and
+            country with tracemalloc, which slows the run down.
+        profile_dir (str | None): If given, every stage is profiled and its
+            profile is written to <profile_dir>/<stage>.prof.
+    """
+    def __init__(self, trace_memory=False, profile_dir: str | None = None):
+        self.__trace_memory = trace_memory
+        self.__profile_dir = profile_dir
+        self.__stages: dict[str, dict] = {}
+        if profile_dir is not None:
+            os.makedirs(profile_dir, exist_ok=True)
+
+    @contextmanager
+    def stage(self, name: str, profile=False):
+        """
+        Measures a stage.
+
+        Args:
+            name (str): The name of the stage.
+            profile (bool): Whether to profile the current process during the
+                stage. Stages processing countries with measure() are
+                profiled country by country instead.
+
+        Returns:
+            ContextManager: A context measuring the stage.
+        """
+        metrics = self.__stage_metrics(name)
+        profiler = None
+        if profile and self.__profile_dir is not None:
+            profiler = cProfile.Profile()
+        if self.__trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+        wall, cpu, children = \
+            time.perf_counter(), time.process_time(), Report.__children_cpu()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            metrics['wall'] = time.perf_counter() - wall
+            metrics['cpu'] = time.process_time() - cpu + \
+                Report.__children_cpu() - children
+            if self.__trace_memory:
+                metrics['peak_memory'] = max(
+                    [tracemalloc.get_traced_memory()[1]] +
+                    [country['peak_memory']
+                     for country in metrics['countries'].values()]
+                )
+            self.__dump_profile(name, profiler)
+
+    def measure(self, task, stage: str):
+        """
+        Wraps a task processing countries so each country is measured.
+
+        Args:
+            task (Callable): A picklable task taking a File and returning its
+                outputs and a dict of counters. If it has a read method, the
+                measured task has one too, for prefetching.
+            stage (str): The name of the stage.
+
+        Returns:
+            _MeasuredTask: A picklable task returning the outputs and the
+                counters with the metrics of the country added.
+        """
+        profile_dir = None
+        if self.__profile_dir is not None:
+            profile_dir = f"{self.__profile_dir}/{stage}"
+            os.makedirs(profile_dir, exist_ok=True)
+            for dump in glob.glob(f"{profile_dir}/*.prof"):
+                os.remove(dump)
+        return _MeasuredTask(task, self.__trace_memory, profile_dir)
+
+    def add_country(self, stage: str, country: str, metrics: dict):
+        """
+        Records the metrics of a country.
+
+        Args:
+            stage (str): The name of the stage.
+            country (str): The input file of the country.
+            metrics (dict): The metrics returned by a measured task.
+        """
+        self.__stage_metrics(stage)['countries'][country] = metrics
+
+    def add_counters(self, stage: str, counters: dict):
+        """
+        Records counters of a whole stage.
+
+        Args:
+            stage (str): The name of the stage.
+            counters (dict): The counters, by name.
+        """
+        self.__stage_metrics(stage).update(counters)
+
+    def __stage_metrics(self, stage):
+        return self.__stages.setdefault(stage, {'countries': {}})
+
+    def as_dict(self) -> dict:
+        """
+        Returns the metrics of the run.
+
+        Returns:
+            dict: The metrics of each stage, by name, with the metrics of each
+                country processed in it. Countries skipped because they are up
+                to date are not included.
+        """
+        return {
+            'stages': self.__stages,
+            'wall': sum(stage.get('wall', 0)
+                        for stage in self.__stages.values()),
+            'cpu': sum(stage.get('cpu', 0)
+                       for stage in self.__stages.values()),
+        }
+
+    def write(self, path: str):
+        """
+        Writes the metrics of the run to a JSON file.
+
+        Args:
+            path (str): The path of the file.
+        """
+        with open(path, 'w') as file:
+            json.dump(self.as_dict(), file, indent=1)
+
+    def __dump_profile(self, name, profiler):
+        if self.__profile_dir is None:
+            return
+        dumps = sorted(glob.glob(f"{self.__profile_dir}/{name}/*.prof"))
+        if profiler is None and not dumps:
+            return
+        stats = pstats.Stats(profiler) if profiler is not None \
+            else pstats.Stats(dumps.pop(0))
+        for dump in dumps:
+            stats.add(dump)
+        stats.dump_stats(f"{self.__profile_dir}/{name}.prof")
+
+    @staticmethod
+    def __children_cpu():
+        """Returns the CPU time of the child processes that have ended."""
+        if resource is None:
+            return 0.0
+        usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+        return usage.ru_utime + usage.ru_stime
+
+
+class _MeasuredTask:
+    """
+    A task measuring each country it processes, in the process it runs in.
+
+    Attributes:
+        __task (Callable): The task returning the outputs and counters.
+        __trace_memory (bool): Whether to trace the peak memory.
+        __profile_dir (str | None): The folder of the cProfile dumps of each
+            country.
+    """
+    def __init__(self, task, trace_memory: bool, profile_dir: str | None):
+        self.__task = task
+        self.__trace_memory = trace_memory
+        self.__profile_dir = profile_dir
+
+    def read(self, file):
+        """Reads the input file of a country with the read method of the
+        task. The time to read it is not part of the metrics of the
+        country."""
+        return self.__task.read(file)
+
+    def __call__(self, file, *contents):
+        """
+        Processes one country.
+
+        Args:
+            file (File): The input file of the country.
+            *contents: What the read method returned for the file, if it was
+                read in advance.
+
+        Returns:
+            tuple[list[str], dict]: The outputs of the task, and its counters
+                with the wall and CPU time and the peak memory of the country.
+        """
+        if self.__trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+        profiler = cProfile.Profile() if self.__profile_dir else None
+        wall, cpu = time.perf_counter(), time.process_time()
+        if profiler is not None:
+            profiler.enable()
+        outputs, counters = self.__task(file, *contents)
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(
+                f"{self.__profile_dir}/{file.get_filename()}.prof"
+            )
+        metrics = {
+            'wall': time.perf_counter() - wall,
+            'cpu': time.process_time() - cpu,
+            **counters,
+        }
+        if self.__trace_memory:
+            metrics['peak_memory'] = tracemalloc.get_traced_memory()[1]
+        return outputs, metrics
@@ -0,0 +1,112 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import pandas as pd
+
+__all__ = ["AsyncWriter"]
+
+
+class AsyncWriter:
+    """
+    Writes DataFrames to CSV files on a bounded pool of background threads, so
+    the next country can be computed while the files of the previous one are
+    written.
+
+    At most max_pending files are queued or being written at once: handing
+    over another one blocks until a slot is free, which bounds the memory held
+    by DataFrames waiting to be written. A DataFrame must not be changed after
+    it is handed over.
+
+    The writer can be sent to worker processes: each process gets its own
+    threads, created when it first writes.
+
+    Attributes:
+        __threads (int): The number of threads writing files.
+        __max_pending (int): The maximum number of files queued or being
+            written.
+        __pid (int | None): The process the threads were created in.
+        __executor (ThreadPoolExecutor | None): The threads writing files.
+        __slots (threading.BoundedSemaphore | None): The free slots for files.
+        __futures (list[Future]): The writes since the last flush.
+
+    Args:
+        threads (int): The number of threads writing files.
+        max_pending (int): The maximum number of files queued or being
+            written.
+
+    Raises:
+        ValueError: If threads or max_pending is less than 1.
+    """
+    def __init__(self, threads=2, max_pending=8):
+        if threads < 1 or max_pending < 1:
+            raise ValueError('threads and max_pending must be at least 1.')
+        self.__threads = threads
+        self.__max_pending = max_pending
+        self.__reset()
+
+    def __reset(self):
+        self.__pid: int | None = None
+        self.__executor: ThreadPoolExecutor | None = None
+        self.__slots: threading.BoundedSemaphore | None = None
+        self.__futures = []
+
+    def __getstate__(self):
+        return {'threads': self.__threads, 'max_pending': self.__max_pending}
+
+    def __setstate__(self, state):
+        self.__threads = state['threads']
+        self.__max_pending = state['max_pending']
+        self.__reset()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write_csv(self, df: pd.DataFrame, path: str):
+        """
+        Queues a DataFrame to be written to a CSV file without its index,
+        waiting for a free slot if max_pending files are already queued.
+
+        Args:
+            df (pd.DataFrame): The data to write.
+            path (str): The path of the CSV file.
+        """
+        if self.__pid != os.getpid():
+            # threads are not inherited by forked worker processes
+            self.__reset()
+            self.__pid = os.getpid()
+            self.__executor = ThreadPoolExecutor(
+                max_workers=self.__threads, thread_name_prefix='writer'
+            )
+            self.__slots = threading.BoundedSemaphore(self.__max_pending)
+        self.__slots.acquire()
+        future = self.__executor.submit(df.to_csv, path, index=False)
+        future.add_done_callback(lambda _: self.__slots.release())
+        self.__futures.append(future)
+
+    def flush(self):
+        """
+        Waits until every file queued is written.
+
+        Raises:
+            Exception: The first error raised while writing a file, in the
+                order the files were queued.
+        """
+        if self.__pid != os.getpid():
+            return
+        futures, self.__futures = self.__futures, []
+        wait(futures)
+        for future in futures:
+            future.result()
+
+    def close(self):
+        """Waits until every file queued is written and stops the threads."""
+        try:
+            self.flush()
+        finally:
+            if self.__pid == os.getpid():
+                self.__executor.shutdown()
+            self.__reset()
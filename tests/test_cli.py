@@ -0,0 +1,50 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from processor.__main__ import main
+
+
+class MissingInputTest(unittest.TestCase):
+    """The command line fails before any stage runs when a folder read by one
+    of the stages is missing, with an error naming it."""
+
+    def setUp(self):
+        self.__folder = tempfile.TemporaryDirectory()
+        self.__path = self.__folder.name
+
+    def tearDown(self):
+        self.__folder.cleanup()
+
+    def __run(self, *args):
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr), \
+                contextlib.redirect_stdout(io.StringIO()):
+            status = main([self.__path, *args])
+        return status, stderr.getvalue()
+
+    def test_slice_without_events(self):
+        status, error = self.__run('--stages', 'slice')
+        self.assertEqual(status, 1)
+        self.assertIn('No events folder', error)
+        self.assertIn('slice stage', error)
+
+    def test_return_periods_without_sliced_events(self):
+        status, error = self.__run('--stages', 'return_periods')
+        self.assertEqual(status, 1)
+        self.assertIn('No sliced_data_sheets folder', error)
+
+    def test_default_stages_without_emdat(self):
+        for folder in ('records', 'categorizations'):
+            os.makedirs(f"{self.__path}/{folder}")
+        status, error = self.__run()
+        self.assertEqual(status, 1)
+        self.assertIn('No emdat folder', error)
+        # nothing was written
+        self.assertFalse(os.path.exists(f"{self.__path}/events"))
+
+
+if __name__ == '__main__':
+    unittest.main()
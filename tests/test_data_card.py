@@ -0,0 +1,41 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from processor._models import DataCard
+
+
+class ParseDatesTest(unittest.TestCase):
+    """Dates parsed in bulk agree with the dates of DataCards."""
+
+    DATES = ['1/1/1970', '29/2/2000', '29/2/1900', '31/4/2001', '0/1/2000',
+             '5/13/2000', '1/1/1', '31/12/9999', '1/1/10000', '1.5/1/2000',
+             'x/1/2000', '1/1']
+
+    def test_same_as_data_cards(self):
+        days, valid = DataCard.parse_dates(pd.Series(ParseDatesTest.DATES))
+        for i, date_string in enumerate(ParseDatesTest.DATES):
+            with self.subTest(date=date_string):
+                try:
+                    card = DataCard('FLOOD', date_string, (), ())
+                    ordinal = card.ordinal
+                except (ValueError, IndexError):
+                    ordinal = None
+                self.assertEqual(bool(valid[i]), ordinal is not None)
+                if ordinal is not None:
+                    self.assertEqual(
+                        int(days[i].astype(np.int64)),
+                        ordinal - DataCard.EPOCH_ORDINAL
+                    )
+
+    def test_day_numbers(self):
+        days, valid = DataCard.day_numbers(np.array([1970., 2024., np.nan]),
+                                           np.array([1., 3., 1.]),
+                                           np.array([2., 1., 1.]))
+        self.assertEqual(valid.tolist(), [True, True, False])
+        self.assertEqual(days[:2].tolist(), [1, 19783])
+
+
+if __name__ == '__main__':
+    unittest.main()
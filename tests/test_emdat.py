@@ -0,0 +1,69 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from processor._emdat._splitter import DATE_COLUMNS, REQUIRED_EVENTS, \
+    EMDATSplitter
+
+
+class EMDATSplitterTest(unittest.TestCase):
+    """The split of EM-DAT data by country and disaster type."""
+
+    def setUp(self):
+        self.__df = pd.DataFrame({
+            'Country': ['A', 'B', np.nan, 'A', 'A', 'B', 'A', 'A'],
+            'Disaster Type': ['Flood', 'Storm', 'Flood', 'Flood', 'Drought',
+                              'Storm', 'Flood', 'Flood'],
+            'Start Year': [2001, 2000, 2000, 2000, 2000, 2000, 2000, 1999],
+            'Start Month': [1, 5, 1, 3, 1, 5, 3, 12],
+            'Start Day': [1, 2, 1, 4, 1, 2, 4, np.nan],
+            'Total Deaths': [1, 2, 3, 4, 5, 6, 7, 8],
+        })
+
+    def __deaths(self, df):
+        return {
+            country: {event: split['Total Deaths'].tolist()
+                      for event, split in events.items()}
+            for country, events in EMDATSplitter(df).data.items()
+        }
+
+    def test_split(self):
+        self.assertEqual(self.__deaths(self.__df), {
+            # by start date, the disasters starting on the same day in the
+            # order of the data
+            'A': {'Storm': [], 'Flood': [4, 7, 1], 'Earthquake': []},
+            'B': {'Storm': [2, 6], 'Flood': [], 'Earthquake': []},
+        })
+
+    def test_categorical_columns(self):
+        df = self.__df.astype({'Country': 'category',
+                               'Disaster Type': 'category'})
+        self.assertEqual(self.__deaths(df), self.__deaths(self.__df))
+
+    def test_same_as_filtering_each_group(self):
+        rng = np.random.default_rng(4)
+        size = 500
+        df = pd.DataFrame({
+            'Country': rng.choice(['A', 'B', 'C', None], size),
+            'Disaster Type': rng.choice(REQUIRED_EVENTS + ['Drought'], size),
+            'Start Year': rng.integers(1990, 1995, size).astype(float),
+            'Start Month': rng.choice([1, 6, np.nan], size),
+            'Start Day': rng.choice([1, 15, 15, np.nan], size),
+            'Total Deaths': np.arange(size),
+        })
+        data = EMDATSplitter(df).data
+        self.assertEqual(sorted(data), ['A', 'B', 'C'])
+        for country, events in data.items():
+            self.assertEqual(list(events), REQUIRED_EVENTS)
+            for event, split in events.items():
+                expected = df[(df['Country'] == country) &
+                              (df['Disaster Type'] == event)] \
+                    .dropna(subset=DATE_COLUMNS) \
+                    .sort_values(by=DATE_COLUMNS, kind='stable')
+                pd.testing.assert_frame_equal(split, expected,
+                                              check_index_type=False)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+import unittest
+
+from processor._models import EventBuilder
+
+
+class DurationsTest(unittest.TestCase):
+    """Validation of the durations overriding EventBuilder.DURATIONS."""
+
+    def test_overrides(self):
+        durations = EventBuilder.durations({'FLOODS': [3, 4]})
+        self.assertEqual(durations['FLOODS'], (3, 4))
+        self.assertEqual(durations['STORMS'], EventBuilder.DURATIONS['STORMS'])
+
+    def test_default(self):
+        self.assertEqual(EventBuilder.durations(None), EventBuilder.DURATIONS)
+
+    def test_invalid_overrides(self):
+        for overrides in ([1, 2], {'FLOODS': [3]}, {'FLOODS': 3},
+                          {'FLOODS': [3, 4, 5]}, {'FLOODS': [True, 2]},
+                          {'FLOODS': [-1, 2]}, {'FLOODS': [1.5, 2]},
+                          {'FLOODS': ['1', 2]}):
+            with self.subTest(overrides=overrides):
+                with self.assertRaises(ValueError):
+                    EventBuilder.durations(overrides)
+
+    def test_message_names_event_type(self):
+        with self.assertRaisesRegex(ValueError, 'FLOODS'):
+            EventBuilder.durations({'FLOODS': [3]})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import os
+import tempfile
+import unittest
+from datetime import date
+
+import pandas as pd
+
+import processor
+from benchmarks import DataGenerator
+from processor._apps import EventIndex
+
+
+class EventIndexTest(unittest.TestCase):
+    """Queries of the sidecar indexes, with start dates outside the range of
+    pandas timestamps."""
+
+    def setUp(self):
+        self.__folder = tempfile.TemporaryDirectory()
+        self.__path = self.__folder.name
+        os.makedirs(f"{self.__path}/events")
+        pd.DataFrame({
+            'event': ['FLOODS', 'FLOODS', 'FLOODS', 'FLOODS', 'STORMS'],
+            'start_date': ['2300-01-01', '1500-06-01', '2000-01-05',
+                           'not a date', '2000-01-05'],
+            'deaths': [1, 2, 3, 4, 5],
+        }).to_csv(f"{self.__path}/events/X.csv", index=False)
+        os.makedirs(f"{self.__path}/emdat/X")
+        pd.DataFrame({
+            'Disaster Type': ['Flood', 'Flood', 'Flood'],
+            'Start Year': [2300, 1500, 2000],
+            'Start Month': [2, None, 13],
+            'Start Day': [30, None, 5],
+        }).to_csv(f"{self.__path}/emdat/X/Flood.csv", index=False)
+        self.__index = EventIndex(self.__path)
+
+    def tearDown(self):
+        self.__folder.cleanup()
+
+    def __deaths(self, start=None, end=None):
+        return self.__index.query('events', 'X', 'FLOODS', start,
+                                  end)['deaths'].tolist()
+
+    def test_unbounded_query_sorts_by_date(self):
+        # rows without a start date come first
+        self.assertEqual(self.__deaths(), [4, 2, 3, 1])
+
+    def test_date_after_timestamp_range(self):
+        self.assertEqual(self.__deaths('2000-01-01', None), [3, 1])
+        # without a lower bound, rows without a start date are included
+        self.assertEqual(self.__deaths(None, '1980-01-01'), [4, 2])
+        self.assertEqual(self.__deaths('2299-12-31', '2300-01-01'), [1])
+
+    def test_date_before_timestamp_range(self):
+        self.assertEqual(self.__deaths('1500-01-01', '1600-01-01'), [2])
+        self.assertEqual(self.__deaths(date(1, 1, 1), date(1499, 12, 31)),
+                         [])
+
+    def test_emdat_dates_fall_back_to_known_period(self):
+        def years(start, end):
+            return self.__index.query('emdat', 'X', 'Flood', start,
+                                      end)['Start Year'].tolist()
+
+        # 2300-02-30 does not exist, it is read as 2300-02-01
+        self.assertEqual(years('2300-02-01', '2300-02-01'), [2300])
+        self.assertEqual(years('1500-01-01', '1500-01-01'), [1500])
+        self.assertEqual(years('2000-01-01', '2000-01-01'), [2000])
+
+    def test_invalid_bound(self):
+        with self.assertRaises(ValueError):
+            self.__deaths('yesterday')
+
+
+class LazyIndexTest(unittest.TestCase):
+    """The stages write no index, the first query builds it."""
+
+    def setUp(self):
+        self.__folder = tempfile.TemporaryDirectory()
+        self.__path = self.__folder.name
+        DataGenerator(countries=1, rows=200, seed=1).generate(self.__path)
+        processor.set_data_dir(self.__path)
+        processor.process({'desinventar': {'merge': True, 'slice': False},
+                           'emdat': {'process': True}})
+
+    def tearDown(self):
+        self.__folder.cleanup()
+
+    def test_index_built_by_first_query(self):
+        self.assertFalse(os.path.exists(f"{self.__path}/index"))
+        country = os.listdir(f"{self.__path}/events")[0].split(".")[0]
+        events = pd.read_csv(f"{self.__path}/events/{country}.csv")
+        event_type = events['event'].iloc[0]
+        found = processor.query(country, event_type)
+        self.assertTrue(os.path.exists(
+            EventIndex(self.__path).path('events', country)))
+        self.assertEqual(len(found), (events['event'] == event_type).sum())
+        # the event column is read like a plain read of the file reads it
+        self.assertEqual(found['event'].dtype, events['event'].dtype)
+        self.assertFalse(os.path.exists(f"{self.__path}/index/emdat"))
+
+
+if __name__ == '__main__':
+    unittest.main()
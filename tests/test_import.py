@@ -0,0 +1,45 @@
+import os
+import subprocess
+import sys
+import unittest
+
+from benchmarks import BenchmarkSuite
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class ImportTest(unittest.TestCase):
+    """Importing the processor is cheap: it does not import pandas or the
+    stages, and stays under BenchmarkSuite.IMPORT_BUDGET."""
+    _RUNS = 3
+
+    @staticmethod
+    def __import():
+        """Imports the processor in a new interpreter.
+
+        Returns:
+            tuple[float, bool]: The time of the import in seconds and whether
+                pandas was imported.
+        """
+        code = ('import sys, time; start = time.perf_counter(); '
+                'import processor; '
+                'print(time.perf_counter() - start, "pandas" in sys.modules)')
+        seconds, pandas = subprocess.run(
+            [sys.executable, '-c', code], cwd=ROOT, check=True,
+            capture_output=True, text=True
+        ).stdout.split()
+        return float(seconds), pandas == 'True'
+
+    def test_does_not_import_pandas(self):
+        _, pandas = ImportTest.__import()
+        self.assertFalse(pandas)
+
+    def test_import_under_budget(self):
+        # the fastest of a few runs, the least noisy estimate
+        seconds = min(ImportTest.__import()[0]
+                      for _ in range(ImportTest._RUNS))
+        self.assertLess(seconds, BenchmarkSuite.IMPORT_BUDGET)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+import processor
+from benchmarks import DataGenerator
+
+OPTION = {
+    'desinventar': {'merge': True, 'slice': True},
+    'emdat': {'process': False},
+}
+
+
+class IncrementalTest(unittest.TestCase):
+    """Incremental runs skip the countries whose inputs are unchanged."""
+
+    def setUp(self):
+        self.__folder = tempfile.TemporaryDirectory()
+        self.__path = self.__folder.name
+        DataGenerator(countries=2, rows=200, seed=1).generate(self.__path)
+        processor.set_data_dir(self.__path)
+
+    def tearDown(self):
+        self.__folder.cleanup()
+
+    def __run(self, incremental=True):
+        report = processor.process(OPTION, incremental=incremental,
+                                   report=True)
+        return {stage: sorted(metrics['countries'])
+                for stage, metrics in report['stages'].items()}
+
+    def test_unchanged_inputs_skipped(self):
+        first = self.__run()
+        self.assertEqual(len(first['merge']), 2)
+        self.assertEqual(len(first['slice']), 2)
+        second = self.__run()
+        self.assertEqual(second['merge'], [])
+        self.assertEqual(second['slice'], [])
+
+    def test_changed_input_merged_again(self):
+        first = self.__run()
+        changed = first['merge'][0]
+        path = f"{self.__path}/records/{changed}"
+        records = pd.read_csv(path)
+        records.iloc[1:].to_csv(path, index=False)
+        second = self.__run()
+        self.assertEqual(second['merge'], [changed])
+        # only the events of the country merged again are sliced again
+        self.assertEqual(len(second['slice']), 1)
+
+    def test_removed_output_written_again(self):
+        first = self.__run()
+        country = first['merge'][0]
+        os.remove(f"{self.__path}/events/{country}")
+        second = self.__run()
+        self.assertEqual(second['merge'], [country])
+
+    def test_other_runs_not_recorded(self):
+        manifest_path = f"{self.__path}/manifest.json"
+        self.__run(incremental=False)
+        self.assertFalse(os.path.exists(manifest_path))
+        self.__run()
+        self.assertTrue(os.path.exists(manifest_path))
+        # the outputs of a run without the manifest are not trusted
+        self.__run(incremental=False)
+        self.assertFalse(os.path.exists(manifest_path))
+        self.assertEqual(len(self.__run()['merge']), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,210 @@
+import io
+import os
+import tempfile
+import unittest
+from datetime import date
+
+import pandas as pd
+
+import processor
+from processor._apps import EventTypeAdapter
+from processor._apps._combiner import EventSplitter
+from processor._models import DataCard
+
+SUBTYPES = {
+    'EARTHQUAKES': ['earthquake'],
+    'FLOODS': ['flood', 'flash flood'],
+    'LANDSLIDES': ['landslide'],
+    'STORMS': ['storm'],
+}
+
+# records covering the edge cases of the split, by date
+RECORDS = [
+    # before any event, datacards that are not triggers are skipped without
+    # being counted as unused
+    ('DROUGHT', '1/12/1999', 0),
+    ('landslide', '1/12/1999', 0),
+    # an event with a same-day record, a run of unused types, a required
+    # type that is not a trigger and another run of unused types
+    ('FLOOD', '1/1/2000', 1),
+    ('flood', '1/1/2000', 2),
+    ('FIRE', '2/1/2000', 0),
+    ('DROUGHT', '2/1/2000', 0),
+    ('landslide', '3/1/2000', 4),
+    ('FIRE', '4/1/2000', 0),
+    # after both intervals, closes the event and starts the next one
+    ('Flash Flood', '8/1/2000', 8),
+    ('flood', '9/1/2000', 16),
+    # a trigger of another type closes the event, and a trigger of another
+    # type within its primary interval is a fatal failure
+    ('STORM', '20/1/2000', 0),
+    ('FLOOD', '22/1/2000', 0),
+    ('FIRE', '23/1/2000', 0),
+    ('Flash Flood', '23/1/2000', 0),
+    # during a fatal failure, the intervals restart typed with the event type
+    # as written in the file, so 'STORM' and 'storm' are different types
+    # with the durations of unknown types
+    ('STORM', '24/1/2000', 0),
+    ('storm', '25/1/2000', 0),
+    # after the intervals of 'storm', a new event
+    ('FLOOD', '27/1/2000', 256),
+    ('flood', '29/1/2000', 512),
+    # an invalid date, ignored
+    ('FLOOD', '31/2/2000', 0),
+    # a fatal failure on the day of the trigger
+    ('EARTHQUAKE', '10/3/2000', 0),
+    ('STORM', '10/3/2000', 0),
+    ('EARTHQUAKE', '20/3/2000', 4096),
+    ('earthquake', '21/3/2000', 8192),
+    # an event still open at the end of the records is dropped
+    ('FLOOD', '25/3/2000', 0),
+    ('flood', '26/3/2000', 0),
+]
+
+# type, start date and sum of the deaths of each event
+EVENTS = [
+    ('FLOODS', '2000-01-01', 7),
+    ('FLOODS', '2000-01-08', 24),
+    ('FLOODS', '2000-01-27', 768),
+    ('EARTHQUAKES', '2000-03-20', 12288),
+]
+FATAL_FAILURES = 2
+UNUSED_EVENTS = 3
+
+
+def _type_adapter():
+    return EventTypeAdapter({
+        event_type: io.StringIO(''.join(f"{subtype}.csv\n"
+                                        for subtype in subtypes))
+        for event_type, subtypes in SUBTYPES.items()
+    })
+
+
+def _datacards(records):
+    datacards = [DataCard(event, date_string, ('deaths',), (deaths,))
+                 for event, date_string, deaths in records]
+    return sorted((datacard for datacard in datacards
+                   if datacard.is_date_valid()),
+                  key=lambda datacard: datacard.ordinal)
+
+
+class EventSplitterTest(unittest.TestCase):
+    """The split of sorted datacards into events."""
+
+    def __split(self, records, durations=None):
+        splitter = EventSplitter(_type_adapter(), durations)
+        events = list(splitter.split(_datacards(records)))
+        return splitter, [
+            (event.event_type, str(event.start_date),
+             sum(record.values[0] for record in event.records))
+            for event in events
+        ]
+
+    def test_edge_cases(self):
+        splitter, events = self.__split(RECORDS)
+        self.assertEqual(events, EVENTS)
+        self.assertEqual(splitter.fatal_failures, FATAL_FAILURES)
+        self.assertEqual(splitter.unused_events, UNUSED_EVENTS)
+
+    def test_same_day_records(self):
+        _, events = self.__split([
+            ('FLOOD', '1/1/2000', 1),
+            ('flood', '1/1/2000', 2),
+            ('Flash Flood', '1/1/2000', 4),
+            ('FLOOD', '1/2/2000', 0),
+        ])
+        self.assertEqual(events, [('FLOODS', '2000-01-01', 7)])
+
+    def test_open_event_dropped(self):
+        splitter, events = self.__split([('FLOOD', '1/1/2000', 1),
+                                         ('flood', '2/1/2000', 2)])
+        self.assertEqual(events, [])
+        self.assertEqual(splitter.fatal_failures, 0)
+
+    def test_fatal_failure_drops_event(self):
+        splitter, events = self.__split([
+            ('FLOOD', '1/1/2000', 1),
+            ('STORM', '3/1/2000', 2),
+            ('FLOOD', '1/2/2000', 4),
+            ('EARTHQUAKE', '1/3/2000', 0),
+        ])
+        self.assertEqual(events, [('FLOODS', '2000-02-01', 4)])
+        self.assertEqual(splitter.fatal_failures, 1)
+
+    def test_durations(self):
+        # with a primary interval of 10 days, the storm is a fatal failure
+        splitter, events = self.__split([
+            ('FLOOD', '1/1/2000', 1),
+            ('STORM', '8/1/2000', 2),
+            ('EARTHQUAKE', '1/3/2000', 0),
+        ], {'FLOODS': (10, 10)})
+        self.assertEqual(events, [])
+        self.assertEqual(splitter.fatal_failures, 1)
+
+    def test_datacards_read_once(self):
+        # the datacards can be a stream
+        splitter = EventSplitter(_type_adapter())
+        events = list(splitter.split(iter(_datacards(RECORDS))))
+        self.assertEqual(len(events), len(EVENTS))
+
+
+class EngineTest(unittest.TestCase):
+    """Every merge engine gives the same events from the same records."""
+    _COUNTRY = "Country"
+
+    def setUp(self):
+        self.__folder = tempfile.TemporaryDirectory()
+        path = self.__folder.name
+        os.makedirs(f"{path}/categorizations")
+        for event_type, subtypes in SUBTYPES.items():
+            with open(f"{path}/categorizations/{event_type}.txt", 'w') as file:
+                file.writelines(f"{subtype}.csv\n" for subtype in subtypes)
+        os.makedirs(f"{path}/records")
+        pd.DataFrame([
+            {'serial': i, 'level0': 'L0', 'name0': 'N0', 'event': event,
+             'location': 'L', 'date': date_string, 'deaths': deaths}
+            for i, (event, date_string, deaths) in enumerate(RECORDS)
+        ]).to_csv(f"{path}/records/{EngineTest._COUNTRY}.csv", index=False)
+        processor.set_data_dir(path)
+
+    def tearDown(self):
+        self.__folder.cleanup()
+
+    def __merge(self, engine):
+        report = processor.process({
+            'desinventar': {'merge': True, 'slice': False, 'engine': engine,
+                            'prefetch': 0},
+            'emdat': {'process': False},
+        }, report=True)
+        events = pd.read_csv(
+            f"{self.__folder.name}/events/{EngineTest._COUNTRY}.csv"
+        )
+        counters = report['stages']['merge']['countries'][
+            f"{EngineTest._COUNTRY}.csv"
+        ]
+        return events, counters
+
+    def test_engines(self):
+        expected = pd.DataFrame(EVENTS,
+                                columns=['event', 'start_date', 'deaths'])
+        for engine in ['default', 'columnar', 'streaming']:
+            with self.subTest(engine=engine):
+                events, counters = self.__merge(engine)
+                pd.testing.assert_frame_equal(
+                    events[['event', 'start_date', 'deaths']], expected
+                )
+                self.assertEqual(counters['fatal_failures'], FATAL_FAILURES)
+                if counters['unused_events'] is not None:
+                    self.assertEqual(counters['unused_events'],
+                                     UNUSED_EVENTS)
+
+    def test_engines_write_same_events(self):
+        default, _ = self.__merge('default')
+        for engine in ['columnar', 'streaming']:
+            with self.subTest(engine=engine):
+                events, _ = self.__merge(engine)
+                pd.testing.assert_frame_equal(events, default)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import glob
+import importlib.util
+import os
+import tempfile
+import unittest
+from datetime import date
+
+import pandas as pd
+
+import processor
+from benchmarks import DataGenerator
+from processor._utils import Directory, ParquetStore
+
+HAS_PYARROW = importlib.util.find_spec('pyarrow') is not None
+
+
+@unittest.skipUnless(HAS_PYARROW, 'pyarrow is not installed')
+class ParquetStoreTest(unittest.TestCase):
+    """Partitions written by the store, read back with pyarrow."""
+
+    def setUp(self):
+        self.__folder = tempfile.TemporaryDirectory()
+        self.__path = self.__folder.name
+        self.__store = ParquetStore(Directory(self.__path))
+
+    def tearDown(self):
+        self.__folder.cleanup()
+
+    @staticmethod
+    def __events(event, dates):
+        return pd.DataFrame({'event': event, 'start_date': dates,
+                             'deaths': range(len(dates))})
+
+    def __read(self, *partitions):
+        import pyarrow.parquet as pq
+
+        folder = "/".join([f"{self.__path}/parquet/events", *partitions])
+        return pq.read_table(f"{folder}/part-0.parquet")
+
+    def test_batches_appended_by_type(self):
+        with self.__store.open('events', 'X', 'event') as writer:
+            writer.write(pd.concat([
+                self.__events('FLOODS', ['2000-01-01', '2000-02-01']),
+                self.__events('STORMS', ['2001-01-01']),
+            ]))
+            writer.write(self.__events('FLOODS', ['2002-03-04']))
+        floods = self.__read('country=X', 'event=FLOODS').to_pandas()
+        self.assertEqual(floods.columns.tolist(), ['start_date', 'deaths'])
+        self.assertEqual(floods['start_date'].tolist(),
+                         [date(2000, 1, 1), date(2000, 2, 1),
+                          date(2002, 3, 4)])
+        self.assertEqual(floods['deaths'].tolist(), [0, 1, 0])
+        storms = self.__read('country=X', 'event=STORMS').to_pandas()
+        self.assertEqual(len(storms), 1)
+
+    def test_row_group_statistics(self):
+        import pyarrow.parquet as pq
+
+        with self.__store.open('events', 'X', 'event') as writer:
+            writer.write(self.__events('FLOODS', ['2000-01-01',
+                                                  '2003-05-06']))
+        path = f"{self.__path}/parquet/events/country=X/event=FLOODS/" \
+               f"part-0.parquet"
+        statistics = pq.ParquetFile(path).metadata.row_group(0).column(0) \
+            .statistics
+        self.assertEqual((statistics.min, statistics.max),
+                         (date(2000, 1, 1), date(2003, 5, 6)))
+
+    def test_partition_replaced(self):
+        for event in ('FLOODS', 'STORMS'):
+            with self.__store.open('events', 'X', 'event') as writer:
+                writer.write(self.__events(event, ['2000-01-01']))
+        self.assertEqual(os.listdir(f"{self.__path}/parquet/events/country=X"),
+                         ['event=STORMS'])
+
+    def test_partition_names_encoded(self):
+        with self.__store.open('events', "Côte d'Ivoire", 'event') as writer:
+            writer.write(self.__events('WIND/STORM', ['2000-01-01']))
+        table = self.__read("country=C%C3%B4te%20d%27Ivoire",
+                            'event=WIND%2FSTORM')
+        self.assertEqual(table.num_rows, 1)
+
+
+@unittest.skipUnless(HAS_PYARROW, 'pyarrow is not installed')
+class ParquetOutputTest(unittest.TestCase):
+    """A run with parquet=True writes the rows of the CSV files."""
+
+    def setUp(self):
+        self.__folder = tempfile.TemporaryDirectory()
+        self.__path = self.__folder.name
+        DataGenerator(countries=2, rows=300, seed=3).generate(self.__path)
+        processor.set_data_dir(self.__path)
+
+    def tearDown(self):
+        self.__folder.cleanup()
+
+    def test_events_dataset(self):
+        import pyarrow.dataset as ds
+
+        processor.process({'desinventar': {'merge': True, 'slice': True},
+                           'emdat': {'process': True}}, parquet=True)
+        for stage, pattern in (('events', 'events/*.csv'),
+                               ('sliced_data_sheets',
+                                'sliced_data_sheets/*/*.csv'),
+                               ('emdat', 'emdat/*/*.csv')):
+            with self.subTest(stage=stage):
+                rows = sum(len(pd.read_csv(path)) for path in
+                           glob.glob(f"{self.__path}/{pattern}"))
+                dataset = ds.dataset(f"{self.__path}/parquet/{stage}",
+                                     partitioning='hive')
+                self.assertGreater(rows, 0)
+                self.assertEqual(dataset.count_rows(), rows)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import filecmp
+import tempfile
+import unittest
+
+import processor
+from benchmarks import DataGenerator
+from processor._utils import TaskPool, run_tasks
+
+
+def _square(item):
+    if item < 0:
+        raise ValueError(f'negative item {item}')
+    return item * item
+
+
+class RunTasksTest(unittest.TestCase):
+    """Items processed in a pool of processes or in the current one."""
+
+    def test_same_results_in_order(self):
+        items = list(range(10))
+        self.assertEqual(run_tasks(_square, items, jobs=2),
+                         run_tasks(_square, items, jobs=1))
+
+    def test_first_error_raised(self):
+        for jobs in (1, 2):
+            with self.subTest(jobs=jobs):
+                with self.assertRaisesRegex(ValueError, 'negative item -1'):
+                    run_tasks(_square, [1, -1, 2, -2], jobs=jobs)
+
+    def test_invalid_jobs(self):
+        with self.assertRaises(ValueError):
+            run_tasks(_square, [1], jobs=0)
+
+    def test_task_pool(self):
+        for jobs in (1, 2):
+            with self.subTest(jobs=jobs):
+                with TaskPool(_square, jobs=jobs) as pool:
+                    futures = [pool.submit(item) for item in (3, -3)]
+                self.assertEqual(futures[0].result(), 9)
+                with self.assertRaises(ValueError):
+                    futures[1].result()
+
+
+class ParallelProcessTest(unittest.TestCase):
+    """Merging and slicing in several processes writes the same files."""
+
+    OPTION = {
+        'desinventar': {'merge': True, 'slice': True},
+        'emdat': {'process': False},
+    }
+
+    def setUp(self):
+        self.__folders = [tempfile.TemporaryDirectory() for _ in range(2)]
+        for folder in self.__folders:
+            DataGenerator(countries=3, rows=300, seed=2).generate(folder.name)
+
+    def tearDown(self):
+        for folder in self.__folders:
+            folder.cleanup()
+
+    def test_same_outputs(self):
+        for folder, jobs in zip(self.__folders, (1, 2)):
+            processor.set_data_dir(folder.name)
+            processor.process(ParallelProcessTest.OPTION, jobs=jobs)
+        serial, parallel = (folder.name for folder in self.__folders)
+        for subfolder in ('events', 'sliced_data_sheets'):
+            comparison = filecmp.dircmp(f"{serial}/{subfolder}",
+                                        f"{parallel}/{subfolder}")
+            self.__assert_same(comparison)
+
+    def __assert_same(self, comparison):
+        self.assertEqual(comparison.left_only + comparison.right_only, [])
+        for name in comparison.common_files:
+            self.assertTrue(filecmp.cmp(f"{comparison.left}/{name}",
+                                        f"{comparison.right}/{name}",
+                                        shallow=False), name)
+        self.assertNotEqual(comparison.common, [])
+        for sub in comparison.subdirs.values():
+            self.__assert_same(sub)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import tempfile
+import threading
+import unittest
+
+import pandas as pd
+
+from processor._utils import File, Prefetcher
+
+
+class PrefetcherTest(unittest.TestCase):
+    """Files read ahead in order, and the errors reading them."""
+
+    def setUp(self):
+        self.__folder = tempfile.TemporaryDirectory()
+        self.__files = []
+        for i in range(6):
+            path = f"{self.__folder.name}/{i}.csv"
+            pd.DataFrame({'value': [i] * 10}).to_csv(path, index=False)
+            self.__files.append(File(path))
+
+    def tearDown(self):
+        self.__folder.cleanup()
+
+    @staticmethod
+    def __read(file):
+        return pd.read_csv(file.get_filepath())
+
+    def test_files_in_order(self):
+        read = [(file, df['value'][0]) for file, df in
+                Prefetcher(threads=3, ahead=2).map(PrefetcherTest.__read,
+                                                   self.__files)]
+        self.assertEqual([file for file, _ in read], self.__files)
+        self.assertEqual([value for _, value in read], list(range(6)))
+
+    def test_error_raised_when_file_reached(self):
+        failing = self.__files[2]
+
+        def read(file):
+            if file is failing:
+                raise ValueError('unreadable')
+            return PrefetcherTest.__read(file)
+
+        files = Prefetcher().map(read, self.__files)
+        self.assertEqual([next(files)[0], next(files)[0]],
+                         self.__files[:2])
+        with self.assertRaisesRegex(ValueError, 'unreadable'):
+            next(files)
+
+    def test_read_ahead_bounded(self):
+        started = []
+        release = threading.Event()
+
+        def read(file):
+            started.append(file)
+            release.wait(5)
+            return PrefetcherTest.__read(file)
+
+        files = Prefetcher(threads=4, ahead=2).map(read, self.__files)
+        release.set()
+        next(files)
+        # the first file and at most two more are read
+        self.assertLessEqual(len(started), 3)
+        files.close()
+
+    def test_memory_bound_still_reads_next_file(self):
+        values = [df['value'][0] for _, df in
+                  Prefetcher(max_bytes=0).map(PrefetcherTest.__read,
+                                              self.__files)]
+        self.assertEqual(values, list(range(6)))
+
+    def test_invalid_sizes(self):
+        for threads, ahead in ((0, 1), (1, 0)):
+            with self.assertRaises(ValueError):
+                Prefetcher(threads, ahead)
+
+
+if __name__ == '__main__':
+    unittest.main()
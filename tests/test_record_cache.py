@@ -0,0 +1,129 @@
+import filecmp
+import importlib.util
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+import processor
+from benchmarks import DataGenerator
+from processor._apps import RecordCache, SortedRecords
+from processor._models import SCHEMAS
+from processor._utils import File
+
+HAS_PYARROW = importlib.util.find_spec('pyarrow') is not None
+
+
+@unittest.skipUnless(HAS_PYARROW, 'pyarrow is not installed')
+class RecordCacheTest(unittest.TestCase):
+    """Records read back from the cache are the records parsed from CSV."""
+
+    def setUp(self):
+        self.__folder = tempfile.TemporaryDirectory()
+        self.__path = f"{self.__folder.name}/X.csv"
+        self.__write(['3/1/2000', '1/1/2000', '31/2/2000', '1/1/2000'])
+        self.__cache = RecordCache(f"{self.__folder.name}/cache")
+        self.__entry = f"{self.__folder.name}/cache/X.csv.arrow"
+
+    def tearDown(self):
+        self.__folder.cleanup()
+
+    def __write(self, dates):
+        pd.DataFrame({
+            'event': ['FLOOD', 'STORM', 'FLOOD', 'FLOOD'][:len(dates)],
+            'date': dates,
+            'deaths': np.arange(len(dates)),
+        }).to_csv(self.__path, index=False)
+
+    def __assert_parsed(self, records: SortedRecords):
+        expected = SortedRecords.from_records(
+            SCHEMAS['records'].read(self.__path, 'merge')
+        )
+        pd.testing.assert_frame_equal(records.records, expected.records)
+        np.testing.assert_array_equal(records.ordinals, expected.ordinals)
+        self.assertEqual((records.rows_read, records.invalid_dates),
+                         (expected.rows_read, expected.invalid_dates))
+
+    def test_round_trip(self):
+        first = self.__cache.read(File(self.__path))
+        self.assertTrue(os.path.exists(self.__entry))
+        second = self.__cache.read(File(self.__path))
+        self.__assert_parsed(first)
+        self.__assert_parsed(second)
+        # the invalid date is removed, the rest sorted in file order
+        self.assertEqual(second.records['deaths'].tolist(), [1, 3, 0])
+        self.assertEqual(second.invalid_dates, 1)
+
+    def test_touched_file_not_parsed_again(self):
+        self.__cache.read(File(self.__path))
+        written = os.stat(self.__entry).st_mtime_ns
+        stat = os.stat(self.__path)
+        os.utime(self.__path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self.__assert_parsed(self.__cache.read(File(self.__path)))
+        self.assertEqual(os.stat(self.__entry).st_mtime_ns, written)
+
+    def test_changed_file_parsed_again(self):
+        self.__cache.read(File(self.__path))
+        # same size, different contents
+        self.__write(['3/1/2000', '1/1/2000', '31/2/2000', '2/1/2000'])
+        records = self.__cache.read(File(self.__path))
+        self.__assert_parsed(records)
+        self.assertEqual(records.records['deaths'].tolist(), [1, 3, 0])
+        self.assertEqual(records.records['date'].tolist(),
+                         ['1/1/2000', '2/1/2000', '3/1/2000'])
+
+    def test_corrupt_copy_replaced(self):
+        self.__cache.read(File(self.__path))
+        with open(self.__entry, 'wb') as file:
+            file.write(b'not arrow')
+        self.__assert_parsed(self.__cache.read(File(self.__path)))
+
+
+@unittest.skipUnless(HAS_PYARROW, 'pyarrow is not installed')
+class CachedMergeTest(unittest.TestCase):
+    """Merging from the cache writes the events merged from the CSV files."""
+
+    def setUp(self):
+        self.__folder = tempfile.TemporaryDirectory()
+        self.__path = self.__folder.name
+        DataGenerator(countries=2, rows=300, seed=5).generate(self.__path)
+        processor.set_data_dir(self.__path)
+
+    def tearDown(self):
+        self.__folder.cleanup()
+
+    def __merge(self, engine, cache_dir=None):
+        processor.process({
+            'desinventar': {'merge': True, 'slice': False, 'engine': engine,
+                            'cache_dir': cache_dir},
+            'emdat': {'process': False},
+        })
+        output = f"{self.__path}/events_{engine}_{cache_dir is not None}"
+        shutil.rmtree(output, ignore_errors=True)
+        shutil.copytree(f"{self.__path}/events", output)
+        return output
+
+    def test_same_events(self):
+        cache_dir = f"{self.__path}/cache"
+        for engine in ('default', 'columnar'):
+            with self.subTest(engine=engine):
+                expected = self.__merge(engine)
+                # the first run writes the copies, the second reads them
+                for _ in range(2):
+                    cached = self.__merge(engine, cache_dir)
+                    comparison = filecmp.dircmp(expected, cached)
+                    self.assertEqual(comparison.left_only, [])
+                    self.assertEqual(comparison.right_only, [])
+                    _, mismatch, errors = filecmp.cmpfiles(
+                        expected, cached, comparison.common_files,
+                        shallow=False
+                    )
+                    self.assertEqual(mismatch + errors, [])
+        self.assertEqual(len(os.listdir(cache_dir)), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import os
+import tempfile
+import unittest
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+import processor
+from processor._apps import ReturnPeriods
+
+
+def _events(dates, deaths):
+    return pd.DataFrame({'start_date': dates, 'deaths': deaths})
+
+
+class ReturnPeriodsTest(unittest.TestCase):
+    """Exceedance curves computed from the sliced events of a country."""
+
+    def __table(self, events):
+        return_periods = ReturnPeriods(['deaths'])
+        return_periods.add_country('X', events)
+        return return_periods.table()
+
+    def test_ties_share_last_rank(self):
+        table = self.__table([('FLOODS', _events(
+            ['2000-01-01', '2001-01-01', '2002-01-01', '2003-01-01'],
+            [3, 5, 3, 1]
+        ))])
+        self.assertEqual(table['value'].tolist(), [5, 3, 1])
+        # both events losing 3 exceed or equal 3
+        self.assertEqual(table['exceedances'].tolist(), [1, 3, 4])
+        self.assertEqual(table['probability'].tolist(), [1 / 5, 3 / 5, 4 / 5])
+
+    def test_missing_losses_dropped(self):
+        table = self.__table([('FLOODS', _events(
+            ['2000-01-01', '2001-01-01', '2002-01-01'], [2, np.nan, 1]
+        ))])
+        self.assertEqual(table['value'].tolist(), [2, 1])
+        self.assertEqual(table['events'].tolist(), [2, 2])
+
+    def test_years_span_every_type(self):
+        table = self.__table([
+            ('FLOODS', _events(['2000-01-01'], [1])),
+            ('STORMS', _events(['2009-12-31'], [1])),
+        ])
+        days = (date(2009, 12, 31) - date(2000, 1, 1)).days + 1
+        years = days / 365.2425
+        self.assertEqual(table['years'].tolist(), [years, years])
+        self.assertEqual(table['return_period'].tolist(), [years, years])
+
+    def test_single_start_date_counts_one_year(self):
+        table = self.__table([('FLOODS', _events(
+            ['2000-01-01', '2000-01-01', '2000-01-01'], [1, 2, 3]
+        ))])
+        self.assertEqual(table['years'].unique().tolist(), [1.0])
+        self.assertEqual(table['frequency'].tolist(), [1.0, 2.0, 3.0])
+
+    def test_no_curves(self):
+        table = self.__table([('FLOODS', _events([], []))])
+        self.assertEqual(table.columns.tolist(), ReturnPeriods.COLUMNS)
+        self.assertTrue(table.empty)
+
+
+class ReturnPeriodStageTest(unittest.TestCase):
+    """The return_periods stage run from the sliced data sheets."""
+
+    def setUp(self):
+        self.__folder = tempfile.TemporaryDirectory()
+        self.__path = self.__folder.name
+        os.makedirs(f"{self.__path}/sliced_data_sheets/X")
+        _events(['2000-01-01', '2001-01-01'], [4, 2]).to_csv(
+            f"{self.__path}/sliced_data_sheets/X/FLOODS.csv", index=False
+        )
+        processor.set_data_dir(self.__path)
+
+    def tearDown(self):
+        self.__folder.cleanup()
+
+    def test_table_written(self):
+        processor.process({
+            'desinventar': {'merge': False, 'slice': False,
+                            'return_periods': True},
+            'emdat': {'process': False},
+        })
+        table = pd.read_csv(f"{self.__path}/return_periods.csv")
+        self.assertEqual(table[['country', 'event', 'loss']].drop_duplicates()
+                         .values.tolist(), [['X', 'FLOODS', 'deaths']])
+        self.assertEqual(table['value'].tolist(), [4, 2])
+
+    def test_slice_sweep_rejected(self):
+        os.makedirs(f"{self.__path}/events")
+        with self.assertRaisesRegex(ValueError, 'slice sweep'):
+            processor.process({
+                'desinventar': {'merge': False, 'slice': True,
+                                'slice_fractions': [0.05, 0.1],
+                                'return_periods': True},
+                'emdat': {'process': False},
+            })
+        self.assertFalse(
+            os.path.exists(f"{self.__path}/return_periods.csv"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,19 @@
+import unittest
+
+from processor._apps import Slicer
+
+
+class FractionNameTest(unittest.TestCase):
+    """The subdirectories of the variants of a slice sweep."""
+
+    def test_shortest_form(self):
+        self.assertEqual(Slicer.fraction_name(0.05), '0.05')
+        self.assertEqual(Slicer.fraction_name(0), '0.0')
+
+    def test_close_fractions_have_distinct_names(self):
+        self.assertNotEqual(Slicer.fraction_name(0.1234561),
+                            Slicer.fraction_name(0.1234564))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import os
+import pickle
+import tempfile
+import unittest
+
+import pandas as pd
+
+from processor._utils import AsyncWriter
+
+
+class AsyncWriterTest(unittest.TestCase):
+    """Files written in the background, and the errors writing them."""
+
+    def setUp(self):
+        self.__folder = tempfile.TemporaryDirectory()
+        self.__path = self.__folder.name
+        self.__df = pd.DataFrame({'event': ['FLOODS', 'STORMS'],
+                                  'deaths': [1, 2]})
+
+    def tearDown(self):
+        self.__folder.cleanup()
+
+    def test_files_written_by_flush(self):
+        with AsyncWriter(threads=2, max_pending=1) as writer:
+            for i in range(5):
+                writer.write_csv(self.__df.assign(deaths=i),
+                                 f"{self.__path}/{i}.csv")
+            writer.flush()
+            for i in range(5):
+                pd.testing.assert_frame_equal(
+                    pd.read_csv(f"{self.__path}/{i}.csv"),
+                    self.__df.assign(deaths=i)
+                )
+
+    def test_first_error_raised_by_flush(self):
+        writer = AsyncWriter()
+        writer.write_csv(self.__df, f"{self.__path}/a.csv")
+        writer.write_csv(self.__df, f"{self.__path}/missing/b.csv")
+        writer.write_csv(self.__df, f"{self.__path}/other/c.csv")
+        writer.write_csv(self.__df, f"{self.__path}/d.csv")
+        with self.assertRaisesRegex(OSError, 'missing'):
+            writer.flush()
+        # the other files are still written, and the error is raised once
+        self.assertTrue(os.path.exists(f"{self.__path}/a.csv"))
+        self.assertTrue(os.path.exists(f"{self.__path}/d.csv"))
+        writer.flush()
+        writer.close()
+
+    def test_error_raised_by_close(self):
+        writer = AsyncWriter()
+        writer.write_csv(self.__df, f"{self.__path}/missing/a.csv")
+        with self.assertRaises(OSError):
+            with writer:
+                pass
+        # the threads are stopped all the same, the writer can be used again
+        writer.write_csv(self.__df, f"{self.__path}/a.csv")
+        writer.close()
+        self.assertTrue(os.path.exists(f"{self.__path}/a.csv"))
+
+    def test_pickled_without_threads(self):
+        with AsyncWriter(threads=3, max_pending=4) as writer:
+            writer.write_csv(self.__df, f"{self.__path}/a.csv")
+            copy = pickle.loads(pickle.dumps(writer))
+            copy.write_csv(self.__df, f"{self.__path}/b.csv")
+            copy.close()
+        self.assertTrue(os.path.exists(f"{self.__path}/b.csv"))
+
+    def test_invalid_sizes(self):
+        for threads, max_pending in ((0, 1), (1, 0)):
+            with self.assertRaises(ValueError):
+                AsyncWriter(threads, max_pending)
+
+
+if __name__ == '__main__':
+    unittest.main()